@@ -0,0 +1,336 @@
+# benchmarks/bench_collectors.py
+#
+# Offline latency/throughput benchmark of the collectors and list routes
+# against simulated clouds (see fake_clouds.py):
+#   python -m benchmarks.bench_collectors [--regions 8] [--resources 200] [--requests 20] [--concurrency 4]
+#   python -m benchmarks.bench_collectors --throttle-rate 0.05 --slow-regions 1 --only route:
+#   python -m benchmarks.bench_collectors --save-baseline default
+#   python -m benchmarks.bench_collectors --compare default
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import concurrent.futures
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import azure.functions as func
+
+from benchmarks.fake_clouds import SimConfig, Simulator, reset_process_state, simulated_clouds
+
+# Peak RSS is reported where the platform has getrusage
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+# Relative change beyond which --compare reports a regression
+DEFAULT_THRESHOLD = 0.15
+# Envelope fields in which collectors and routes report scopes that failed inside a 200 response
+FAILED_SCOPE_FIELDS = ("failed_regions", "timed_out_regions", "failed_subscriptions", "timed_out_subscriptions")
+
+
+class Scenario(NamedTuple):
+    name: str
+    run: Callable[[], Any]       # one request; a coroutine function when is_async
+    is_async: bool = False
+
+
+def _request(**params) -> func.HttpRequest:
+    return func.HttpRequest(method="GET", url="/", headers={}, params=params, body=b"")
+
+
+def _check_response(response: func.HttpResponse) -> func.HttpResponse:
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    return response
+
+
+def _failed_scopes(result: Any) -> int:
+    """Failed and timed-out regions/subscriptions reported by a collector envelope or route body."""
+    if isinstance(result, func.HttpResponse):
+        result = json.loads(result.get_body())
+    if not isinstance(result, dict):
+        return 0
+    return sum(len(result.get(field) or []) for field in FAILED_SCOPE_FIELDS)
+
+
+def build_scenarios(sim: Simulator, cached_routes: bool) -> List[Scenario]:
+    from methods.aws.ec2 import list_all_ec2_instances, list_all_ec2_instances_async
+    from methods.aws.eks import list_all_eks_clusters, list_all_eks_clusters_async
+    from methods.aws.rds import list_all_rds_instances, list_all_rds_instances_async
+    from methods.aws.s3 import get_s3_buckets_with_metadata
+    from methods.azure.functions import get_azure_functions_with_metadata, get_azure_functions_with_metadata_async
+    from methods.azure.storage import (
+        get_azure_storage_accounts_with_metadata, get_azure_storage_accounts_with_metadata_async,
+    )
+    from routes import aws_routes, aws_async_routes, azure_routes, azure_async_routes
+
+    subscription = sim.subscriptions[0]
+    # The EKS scenarios describe every cluster, like the list view with include=
+    EKS_INCLUDE = frozenset({"status", "version"})
+    # Several subscriptions go through the multi-subscription fan-out on the routes
+    route_subscription = subscription if len(sim.subscriptions) == 1 else "*"
+    # refresh=1 makes every request reach the collectors instead of the inventory cache
+    route_params = {} if cached_routes else {"refresh": "1"}
+
+    def sync_route(handler, **params):
+        return lambda: _check_response(handler(_request(**route_params, **params)))
+
+    def async_route(handler, **params):
+        async def call():
+            return _check_response(await handler(_request(**route_params, **params)))
+        return call
+
+    return [
+        Scenario("collector:ec2", lambda: list_all_ec2_instances()),
+        Scenario("collector:ec2-async", lambda: list_all_ec2_instances_async(), True),
+        Scenario("collector:rds", lambda: list_all_rds_instances()),
+        Scenario("collector:rds-async", lambda: list_all_rds_instances_async(), True),
+        Scenario("collector:eks", lambda: list_all_eks_clusters(include=EKS_INCLUDE)),
+        Scenario("collector:eks-async", lambda: list_all_eks_clusters_async(include=EKS_INCLUDE), True),
+        Scenario("collector:s3", lambda: get_s3_buckets_with_metadata()),
+        Scenario("collector:azure-functions", lambda: get_azure_functions_with_metadata(subscription)),
+        Scenario("collector:azure-functions-async", lambda: get_azure_functions_with_metadata_async(subscription), True),
+        Scenario("collector:azure-storage", lambda: get_azure_storage_accounts_with_metadata(subscription)),
+        Scenario("collector:azure-storage-async",
+                 lambda: get_azure_storage_accounts_with_metadata_async(subscription), True),
+        Scenario("route:aws/ec2/list", sync_route(aws_routes.list_ec2)),
+        Scenario("route:aws/ec2/list-async", async_route(aws_async_routes.list_ec2), True),
+        Scenario("route:aws/rds/list", sync_route(aws_routes.list_rds)),
+        Scenario("route:aws/rds/list-async", async_route(aws_async_routes.list_rds), True),
+        Scenario("route:aws/eks/list", sync_route(aws_routes.list_eks, include=",".join(sorted(EKS_INCLUDE)))),
+        Scenario("route:aws/eks/list-async",
+                 async_route(aws_async_routes.list_eks, include=",".join(sorted(EKS_INCLUDE))), True),
+        Scenario("route:aws/s3/list", sync_route(aws_routes.list_s3)),
+        Scenario("route:aws/s3/list-async", async_route(aws_async_routes.list_s3), True),
+        Scenario("route:azure/functions/list",
+                 sync_route(azure_routes.list_azure_functions, subscription_id=route_subscription)),
+        Scenario("route:azure/functions/list-async",
+                 async_route(azure_async_routes.list_azure_functions, subscription_id=route_subscription), True),
+        Scenario("route:azure/storage/list",
+                 sync_route(azure_routes.list_azure_storage_accounts, subscription_id=route_subscription)),
+        Scenario("route:azure/storage/list-async",
+                 async_route(azure_async_routes.list_azure_storage_accounts, subscription_id=route_subscription), True),
+    ]
+
+
+# (seconds, failed scopes) for one call; None when it raised or returned an error status
+Outcome = Optional[Tuple[float, int]]
+
+
+def _timed_sync(fn: Callable[[], Any]) -> Outcome:
+    started = time.perf_counter()
+    try:
+        result = fn()
+    except Exception:
+        return None
+    return time.perf_counter() - started, _failed_scopes(result)
+
+
+async def _timed_async(fn: Callable[[], Any], gate: asyncio.Semaphore) -> Outcome:
+    async with gate:
+        started = time.perf_counter()
+        try:
+            result = await fn()
+        except Exception:
+            return None
+        return time.perf_counter() - started, _failed_scopes(result)
+
+
+def _drive(scenario: Scenario, requests: int, concurrency: int) -> List[Outcome]:
+    """Issue `requests` calls with at most `concurrency` in flight; one outcome per call."""
+    if scenario.is_async:
+        async def run_all():
+            gate = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*[_timed_async(scenario.run, gate) for _ in range(requests)])
+        return asyncio.run(run_all())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: _timed_sync(scenario.run), range(requests)))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(scenario: Scenario, sim: Simulator, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    reset_process_state()
+    # Warm-up requests fill the region/subscription caches the way a running app has them
+    _drive(scenario, warmup, 1)
+    calls_before = sim.stats()
+    started = time.perf_counter()
+    timings = _drive(scenario, requests, concurrency)
+    wall = time.perf_counter() - started
+    calls_after = sim.stats()
+
+    outcomes = [o for o in timings if o is not None]
+    ok = sorted(seconds for seconds, _ in outcomes)
+    result = {
+        "requests": requests,
+        "errors": len(timings) - len(ok),
+        # Collectors and routes report per-region failures inside a 200, so count them separately
+        "failed_scopes": sum(failed for _, failed in outcomes),
+        "throughput_rps": round(requests / wall, 2),
+        "api_calls_per_request": round((calls_after["calls"] - calls_before["calls"]) / requests, 1),
+        "throttles": calls_after["throttles"] - calls_before["throttles"],
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    for label, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+        result[label] = round(_percentile(ok, fraction) * 1000, 1) if ok else None
+    result["mean_ms"] = round(statistics.fmean(ok) * 1000, 1) if ok else None
+    return result
+
+
+def _print_result(name: str, result: Dict[str, Any]):
+    def ms(value):
+        return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+    print(
+        f"  {name:<34}{ms(result['p50_ms'])}{ms(result['p95_ms'])}{ms(result['p99_ms'])}"
+        f"{result['throughput_rps']:>9.2f}{result['api_calls_per_request']:>8.1f}"
+        f"{result['throttles']:>6}{result['errors']:>7}{result['failed_scopes']:>7}{result['peak_rss_mb'] or 0:>9.1f}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+
+# metric -> +1 if higher is worse, -1 if lower is worse
+REGRESSION_DIRECTION = {
+    "p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "api_calls_per_request": 1, "errors": 1, "failed_scopes": 1,
+    "throughput_rps": -1,
+}
+
+
+def _baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, report: Dict[str, Any]):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(_baseline_path(name), "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"💾 Baseline saved to {_baseline_path(name)}")
+
+
+def compare_baseline(name: str, report: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-metric changes against a stored baseline; return the regressions."""
+    with open(_baseline_path(name)) as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != report["settings"]:
+        print(f"⚠️ Baseline '{name}' was recorded with different settings: {baseline.get('settings')}")
+
+    regressions = []
+    print(f"🔍 Compared with baseline '{name}' (threshold {threshold:.0%})")
+    for scenario, result in report["results"].items():
+        before = baseline.get("results", {}).get(scenario)
+        if before is None:
+            print(f"  {scenario:<34} (new scenario)")
+            continue
+        changes = []
+        for metric, direction in REGRESSION_DIRECTION.items():
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if old == 0:
+                worse = direction * new > 0
+                change = "new" if new else "="
+            else:
+                ratio = (new - old) / old
+                worse = direction * ratio > threshold
+                change = f"{ratio:+.0%}"
+            if worse:
+                regressions.append(f"{scenario} {metric}: {old} -> {new}")
+            changes.append(f"{metric}={change}{' ❌' if worse else ''}")
+        print(f"  {scenario:<34} {'  '.join(changes)}")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+
+def run(config: SimConfig, requests: int, concurrency: int, warmup: int,
+        only: Optional[str], cached_routes: bool) -> Dict[str, Any]:
+    print(
+        f"📊 {config.regions} regions x {config.resources} resources, {config.subscriptions} subscription(s), "
+        f"{config.latency_ms:.0f}+{config.jitter_ms:.0f}ms per call, throttle={config.throttle_rate:.0%}, "
+        f"failure={config.failure_rate:.0%}, slow regions={config.slow_regions}"
+    )
+    print(f"   {requests} requests per scenario, concurrency {concurrency}, routes {'cached' if cached_routes else 'refresh=1'}")
+    print(f"  {'scenario':<34}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'req/s':>9}{'calls':>8}{'thr':>6}{'errors':>7}{'failed':>7}{'RSS MB':>9}")
+
+    results = {}
+    with simulated_clouds(config) as sim:
+        for scenario in build_scenarios(sim, cached_routes):
+            if only and not any(scenario.name.startswith(p.strip()) for p in only.split(",")):
+                continue
+            results[scenario.name] = measure(scenario, sim, requests, concurrency, warmup)
+            _print_result(scenario.name, results[scenario.name])
+
+    return {
+        "settings": {
+            "sim": config._asdict(), "requests": requests, "concurrency": concurrency,
+            "warmup": warmup, "cached_routes": cached_routes,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    defaults = SimConfig()
+    parser = argparse.ArgumentParser(description="Benchmark collectors and routes against simulated clouds")
+    parser.add_argument("--regions", type=int, default=defaults.regions)
+    parser.add_argument("--resources", type=int, default=defaults.resources,
+                        help="resources per region (AWS) / per subscription (Azure)")
+    parser.add_argument("--subscriptions", type=int, default=defaults.subscriptions)
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate)
+    parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate)
+    parser.add_argument("--slow-regions", type=int, default=defaults.slow_regions)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", help="comma-separated scenario name prefixes, e.g. collector:,route:aws")
+    parser.add_argument("--cached-routes", action="store_true",
+                        help="let route requests hit the inventory cache instead of sending refresh=1")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--verbose", action="store_true", help="keep the app's log output")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    config = SimConfig(
+        regions=args.regions, resources=args.resources, subscriptions=args.subscriptions,
+        page_size=args.page_size, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate, failure_rate=args.failure_rate,
+        slow_regions=args.slow_regions, seed=args.seed,
+    )
+    report = run(config, args.requests, args.concurrency, args.warmup, args.only, args.cached_routes)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, report)
+    if args.compare:
+        regressions = compare_baseline(args.compare, report, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ No regressions")
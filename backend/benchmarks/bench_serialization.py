@@ -0,0 +1,66 @@
+# benchmarks/bench_serialization.py
+#
+# Compare JSON backends on a synthetic EC2 list payload:
+#   python -m benchmarks.bench_serialization [--instances 50000] [--repeat 5]
+
+import argparse
+import enum
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from methods import serialization
+
+REGIONS = ["us-east-1", "us-east-2", "us-west-2", "eu-west-1", "eu-central-1", "ap-south-1"]
+INSTANCE_TYPES = ["t3.micro", "t3.medium", "m5.large", "m6i.xlarge", "c6g.2xlarge", "r5.4xlarge"]
+
+
+class InstanceState(str, enum.Enum):
+    RUNNING = "running"
+    STOPPED = "stopped"
+    PENDING = "pending"
+
+
+def build_ec2_payload(count: int, seed: int = 7) -> dict:
+    """A list-endpoint envelope shaped like list_all_ec2_instances output."""
+    rng = random.Random(seed)
+    launched = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        items.append({
+            "instance_id": f"i-{i:017x}",
+            "instance_type": rng.choice(INSTANCE_TYPES),
+            "state": rng.choice(list(InstanceState)),
+            "name": f"node-{i}",
+            "public_ip": f"54.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+            "private_ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+            "region": rng.choice(REGIONS),
+            "launch_time": launched + timedelta(minutes=i),
+        })
+    return {"items": items, "generated_at": datetime.now(timezone.utc), "age_seconds": 0.0}
+
+
+def run(instances: int, repeat: int):
+    payload = build_ec2_payload(instances)
+    print(f"📊 Encoding {instances} EC2 instances, best/median of {repeat} runs")
+    for name, dumps in serialization.BACKENDS.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = dumps(payload)
+            timings.append(time.perf_counter() - started)
+        print(
+            f"  {name:<8} best={min(timings) * 1000:8.1f} ms  "
+            f"median={statistics.median(timings) * 1000:8.1f} ms  size={len(body) / 1e6:.2f} MB"
+        )
+    if "orjson" not in serialization.BACKENDS:
+        print("  (orjson not installed - only the stdlib backend was measured)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON serializer backends")
+    parser.add_argument("--instances", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.instances, args.repeat)
@@ -0,0 +1,71 @@
+# benchmarks/bench_wire_formats.py
+#
+# Payload size and decode time of the list wire formats on a synthetic EC2 list:
+#   python -m benchmarks.bench_wire_formats [--instances 30000] [--repeat 5]
+
+import argparse
+import gzip
+import statistics
+import time
+
+from methods import serialization
+from methods.columnar import columnar_envelope, from_columnar
+from benchmarks.bench_serialization import build_ec2_payload
+
+
+def _best_and_median(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, statistics.median(timings) * 1000
+
+
+def _formats():
+    """name -> (encode(envelope) -> bytes, decode(bytes) -> envelope, rows(decoded) -> list)."""
+    formats = {
+        "json rows": (serialization.dumps, serialization.loads, lambda d: d["items"]),
+        "json columnar": (
+            lambda env: serialization.dumps(columnar_envelope(env)), serialization.loads, from_columnar
+        ),
+    }
+    if serialization.msgpack is not None:
+        formats["msgpack rows"] = (serialization.msgpack_dumps, serialization.msgpack_loads, lambda d: d["items"])
+        formats["msgpack columnar"] = (
+            lambda env: serialization.msgpack_dumps(columnar_envelope(env)), serialization.msgpack_loads, from_columnar
+        )
+    return formats
+
+
+def run(instances: int, repeat: int):
+    payload = build_ec2_payload(instances)
+    # Compare what is on the wire: datetimes/enums already rendered as the API sends them
+    payload = serialization.loads(serialization.dumps(payload))
+    print(f"📊 {instances} EC2 instances, best/median of {repeat} runs ({serialization.BACKEND} JSON backend)")
+    print(f"  {'format':<17}{'size':>9}{'gzip':>9}{'encode':>11}{'decode':>11}{'decode+rows':>13}")
+
+    baseline = None
+    for name, (encode, decode, rows) in _formats().items():
+        body = encode(payload)
+        compressed = len(gzip.compress(body, compresslevel=6))
+        encode_ms, _ = _best_and_median(lambda: encode(payload), repeat)
+        decode_ms, _ = _best_and_median(lambda: decode(body), repeat)
+        rows_ms, _ = _best_and_median(lambda: rows(decode(body)), repeat)
+        assert len(rows(decode(body))) == instances
+        baseline = baseline or (len(body), decode_ms)
+        print(
+            f"  {name:<17}{len(body) / 1e6:>7.2f}MB{compressed / 1e6:>7.2f}MB"
+            f"{encode_ms:>9.1f}ms{decode_ms:>9.1f}ms{rows_ms:>11.1f}ms"
+            f"   ({len(body) / baseline[0]:.0%} size, {decode_ms / baseline[1]:.0%} decode)"
+        )
+    if serialization.msgpack is None:
+        print("  (msgpack not installed - only the JSON formats were measured)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare list wire formats")
+    parser.add_argument("--instances", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.instances, args.repeat)
@@ -0,0 +1,507 @@
+# benchmarks/fake_clouds.py
+#
+# In-process stand-ins for the boto3 and Azure management clients the
+# collectors call. They serve N regions x M synthetic resources with
+# configurable latency, jitter, throttling and failures, so collectors and
+# route handlers can be benchmarked without a cloud account.
+#
+#   with simulated_clouds(SimConfig(regions=17, resources=500)) as sim:
+#       list_all_ec2_instances()
+#       print(sim.stats())
+
+import os
+import time
+import random
+import asyncio
+import threading
+import contextlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from unittest import mock
+
+from botocore.exceptions import ClientError
+from azure.core.exceptions import HttpResponseError
+
+from methods.aws.client_pool import MAX_ATTEMPTS
+
+AWS_REGIONS = [
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2", "ca-central-1", "eu-west-1", "eu-west-2",
+    "eu-west-3", "eu-central-1", "eu-north-1", "ap-south-1", "ap-northeast-1", "ap-northeast-2",
+    "ap-northeast-3", "ap-southeast-1", "ap-southeast-2", "sa-east-1",
+]
+INSTANCE_TYPES = ["t3.micro", "t3.medium", "m5.large", "m6i.xlarge", "c6g.2xlarge", "r5.4xlarge"]
+STATES = ["running", "running", "running", "stopped", "pending"]
+DB_INSTANCE_CLASSES = ["db.t3.micro", "db.t3.medium", "db.m5.large", "db.r6g.xlarge"]
+DB_ENGINES = ["postgres", "mysql", "aurora-postgresql", "mariadb"]
+DB_STATUSES = ["available", "available", "available", "stopped", "backing-up"]
+EKS_VERSIONS = ["1.28", "1.29", "1.30"]
+# Accounts run far fewer clusters than instances: one per this many resources
+EKS_CLUSTER_RATIO = 10
+AZURE_LOCATIONS = ["eastus", "westeurope", "northeurope", "southeastasia", "westus2"]
+
+# Slow regions answer this many times slower than the configured latency
+SLOW_REGION_FACTOR = 5.0
+# First retry waits up to this long after a throttle, doubling per attempt (SDK backoff stand-in)
+THROTTLE_BACKOFF_SECONDS = 0.1
+
+
+class SimConfig(NamedTuple):
+    regions: int = 8
+    resources: int = 200          # per region for AWS, per subscription for Azure
+    subscriptions: int = 1
+    page_size: int = 100
+    latency_ms: float = 40.0
+    jitter_ms: float = 20.0
+    throttle_rate: float = 0.0    # chance that an attempt is throttled (retried like the SDK)
+    failure_rate: float = 0.0     # chance that a call fails outright
+    slow_regions: int = 0
+    seed: int = 7
+
+
+def region_names(count: int) -> List[str]:
+    return AWS_REGIONS[:count] + [f"sim-region-{i}" for i in range(len(AWS_REGIONS), count)]
+
+
+def subscription_ids(count: int) -> List[str]:
+    return [f"00000000-0000-0000-0000-{i:012d}" for i in range(count)]
+
+
+class Simulator:
+    """Latency/throttle/failure model plus call accounting shared by all fake clients."""
+
+    def __init__(self, config: SimConfig):
+        self.config = config
+        self.regions = region_names(config.regions)
+        self.subscriptions = subscription_ids(config.subscriptions)
+        self._slow = set(self.regions[:config.slow_regions])
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._calls: Counter = Counter()
+        self._throttles: Counter = Counter()
+        self._failures: Counter = Counter()
+        self._data: Dict[Tuple[str, str], List[Any]] = {}
+
+    def plan(self, operation: str, region: str) -> Tuple[float, Optional[str]]:
+        """(seconds to wait, error kind or None) for one SDK call, including its retries."""
+        config = self.config
+        scale = SLOW_REGION_FACTOR if region in self._slow else 1.0
+        delay, error = 0.0, None
+        with self._lock:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                self._calls[operation] += 1
+                delay += scale * (config.latency_ms + self._rng.uniform(0, config.jitter_ms)) / 1000
+                if self._rng.random() < config.throttle_rate:
+                    self._throttles[operation] += 1
+                    if attempt == MAX_ATTEMPTS:
+                        error = "throttled"
+                        break
+                    delay += THROTTLE_BACKOFF_SECONDS * 2 ** (attempt - 1) * self._rng.random()
+                    continue
+                if self._rng.random() < config.failure_rate:
+                    self._failures[operation] += 1
+                    error = "failed"
+                break
+        return delay, error
+
+    def dataset(self, kind: str, scope: str, build: Callable[[random.Random], List[Any]]) -> List[Any]:
+        key = (kind, scope)
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = build(random.Random(f"{self.config.seed}-{kind}-{scope}"))
+            return self._data[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": sum(self._calls.values()),
+                "throttles": sum(self._throttles.values()),
+                "failures": sum(self._failures.values()),
+                "by_operation": dict(self._calls),
+            }
+
+
+# ---------------------------------------------------------------------------
+# AWS
+
+def _aws_call(sim: Simulator, service: str, operation: str, region: str):
+    delay, error = sim.plan(f"aws.{service}.{operation}", region)
+    time.sleep(delay)
+    if error == "throttled":
+        raise ClientError({"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, operation)
+    if error:
+        raise ClientError({"Error": {"Code": "InternalError", "Message": "Simulated failure"}}, operation)
+
+
+class _FakePaginator:
+    def __init__(self, sim: Simulator, service: str, operation: str, region: str,
+                 records: Callable[[Dict[str, Any]], List[Any]], page: Callable[[List[Any], Optional[str]], Dict[str, Any]]):
+        self._sim, self._service, self._operation, self._region = sim, service, operation, region
+        self._records, self._page = records, page
+
+    def paginate(self, PaginationConfig: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        if (PaginationConfig or {}).get("StartingToken"):
+            raise NotImplementedError("fake paginators only serve full listings")
+        records = self._records(kwargs)
+        size = self._sim.config.page_size
+        for start in range(0, max(len(records), 1), size):
+            _aws_call(self._sim, self._service, self._operation, self._region)
+            token = str(start + size) if start + size < len(records) else None
+            yield self._page(records[start:start + size], token)
+
+
+def _ec2_instances(sim: Simulator, region: str) -> List[Dict[str, Any]]:
+    def build(rng: random.Random) -> List[Dict[str, Any]]:
+        launched = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return [
+            {
+                "InstanceId": f"i-{rng.getrandbits(68):017x}",
+                "InstanceType": rng.choice(INSTANCE_TYPES),
+                "State": {"Name": rng.choice(STATES)},
+                "PrivateIpAddress": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "PublicIpAddress": f"54.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "LaunchTime": launched + timedelta(minutes=i),
+                "Tags": [
+                    {"Key": "Name", "Value": f"{region}-node-{i}"},
+                    {"Key": "env", "Value": rng.choice(["prod", "staging", "dev"])},
+                ],
+            }
+            for i in range(sim.config.resources)
+        ]
+    return sim.dataset("ec2", region, build)
+
+
+def _rds_instances(sim: Simulator, region: str) -> List[Dict[str, Any]]:
+    def build(rng: random.Random) -> List[Dict[str, Any]]:
+        instances = []
+        for i in range(sim.config.resources):
+            identifier = f"{region}-db-{i}"
+            instances.append({
+                "DBInstanceIdentifier": identifier,
+                "DBInstanceClass": rng.choice(DB_INSTANCE_CLASSES),
+                "Engine": rng.choice(DB_ENGINES),
+                "DBInstanceStatus": rng.choice(DB_STATUSES),
+                "Endpoint": {"Address": f"{identifier}.{rng.getrandbits(48):012x}.{region}.rds.amazonaws.com",
+                             "Port": rng.choice([3306, 5432])},
+                "TagList": [{"Key": "env", "Value": rng.choice(["prod", "staging", "dev"])}],
+            })
+        return instances
+    return sim.dataset("rds", region, build)
+
+
+def _eks_clusters(sim: Simulator, region: str) -> List[Dict[str, Any]]:
+    def build(rng: random.Random) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": f"{region}-cluster-{i}",
+                "arn": f"arn:aws:eks:{region}:000000000000:cluster/{region}-cluster-{i}",
+                "status": rng.choice(["ACTIVE", "ACTIVE", "ACTIVE", "UPDATING"]),
+                "version": rng.choice(EKS_VERSIONS),
+                "platformVersion": f"eks.{rng.randint(1, 12)}",
+                "tags": {"env": rng.choice(["prod", "staging", "dev"])},
+            }
+            for i in range(max(1, sim.config.resources // EKS_CLUSTER_RATIO))
+        ]
+    return sim.dataset("eks", region, build)
+
+
+def _s3_buckets(sim: Simulator) -> List[Dict[str, Any]]:
+    def build(rng: random.Random) -> List[Dict[str, Any]]:
+        created = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        buckets = []
+        for region in sim.regions:
+            for i in range(sim.config.resources):
+                bucket = {"Name": f"{region}-bucket-{i}", "CreationDate": created + timedelta(hours=i)}
+                # ListBuckets only reports BucketRegion for some buckets; the rest need GetBucketLocation
+                if rng.random() < 0.5:
+                    bucket["BucketRegion"] = region
+                buckets.append(bucket)
+        return buckets
+    return sim.dataset("s3", "global", build)
+
+
+class FakeEC2Client:
+    def __init__(self, sim: Simulator, region: str):
+        self._sim, self._region = sim, region
+
+    def describe_regions(self, **kwargs) -> Dict[str, Any]:
+        _aws_call(self._sim, "ec2", "DescribeRegions", self._region)
+        return {"Regions": [{"RegionName": r, "OptInStatus": "opt-in-not-required"} for r in self._sim.regions]}
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        if operation != "describe_instances":
+            raise NotImplementedError(f"ec2.{operation} is not simulated")
+        return _FakePaginator(
+            self._sim, "ec2", "DescribeInstances", self._region,
+            lambda kwargs: _ec2_instances(self._sim, self._region),
+            lambda chunk, token: {"Reservations": [{"Instances": chunk}], "NextToken": token},
+        )
+
+
+class FakeS3Client:
+    def __init__(self, sim: Simulator, region: str):
+        self._sim, self._region = sim, region
+
+    def get_bucket_location(self, Bucket: str) -> Dict[str, Any]:
+        _aws_call(self._sim, "s3", "GetBucketLocation", self._region)
+        region = Bucket.split("-bucket-")[0]
+        return {"LocationConstraint": None if region == "us-east-1" else region}
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        if operation != "list_buckets":
+            raise NotImplementedError(f"s3.{operation} is not simulated")
+
+        def records(kwargs):
+            buckets = _s3_buckets(self._sim)
+            if kwargs.get("Prefix"):
+                buckets = [b for b in buckets if b["Name"].startswith(kwargs["Prefix"])]
+            if kwargs.get("BucketRegion"):
+                buckets = [b for b in buckets if b["Name"].startswith(kwargs["BucketRegion"] + "-bucket-")]
+            return buckets
+
+        return _FakePaginator(
+            self._sim, "s3", "ListBuckets", self._region, records,
+            lambda chunk, token: {"Buckets": chunk, "ContinuationToken": token},
+        )
+
+
+class FakeRDSClient:
+    def __init__(self, sim: Simulator, region: str):
+        self._sim, self._region = sim, region
+
+    def _instances(self, ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        instances = _rds_instances(self._sim, self._region)
+        return instances if ids is None else [db for db in instances if db["DBInstanceIdentifier"] in ids]
+
+    def describe_db_instances(self, DBInstanceIdentifier: str) -> Dict[str, Any]:
+        _aws_call(self._sim, "rds", "DescribeDBInstances", self._region)
+        found = self._instances([DBInstanceIdentifier])
+        if not found:
+            raise ClientError({"Error": {"Code": "DBInstanceNotFound", "Message": DBInstanceIdentifier}},
+                              "DescribeDBInstances")
+        return {"DBInstances": found}
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        if operation != "describe_db_instances":
+            raise NotImplementedError(f"rds.{operation} is not simulated")
+
+        def records(kwargs):
+            ids = None
+            for f in kwargs.get("Filters") or []:
+                if f["Name"] == "db-instance-id":
+                    ids = set(f["Values"])
+            return self._instances(ids)
+
+        return _FakePaginator(
+            self._sim, "rds", "DescribeDBInstances", self._region, records,
+            lambda chunk, token: {"DBInstances": chunk, "Marker": token},
+        )
+
+
+class FakeEKSClient:
+    def __init__(self, sim: Simulator, region: str):
+        self._sim, self._region = sim, region
+
+    def describe_cluster(self, name: str) -> Dict[str, Any]:
+        _aws_call(self._sim, "eks", "DescribeCluster", self._region)
+        for cluster in _eks_clusters(self._sim, self._region):
+            if cluster["name"] == name:
+                return {"cluster": cluster}
+        raise ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": name}}, "DescribeCluster")
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        if operation != "list_clusters":
+            raise NotImplementedError(f"eks.{operation} is not simulated")
+        return _FakePaginator(
+            self._sim, "eks", "ListClusters", self._region,
+            lambda kwargs: [c["name"] for c in _eks_clusters(self._sim, self._region)],
+            lambda chunk, token: {"clusters": chunk, "nextToken": token},
+        )
+
+
+class FakeBotoClientPool:
+    """Drop-in for BotoClientPool that hands out fake clients."""
+
+    CLIENTS = {"ec2": FakeEC2Client, "s3": FakeS3Client, "rds": FakeRDSClient, "eks": FakeEKSClient}
+
+    def __init__(self, sim: Simulator):
+        self._sim = sim
+
+    def get(self, service: str, region: str):
+        if service not in self.CLIENTS:
+            raise NotImplementedError(f"AWS service {service} is not simulated")
+        return self.CLIENTS[service](self._sim, region)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+
+
+# ---------------------------------------------------------------------------
+# Azure
+
+def _azure_error(error: str) -> HttpResponseError:
+    if error == "throttled":
+        return HttpResponseError(message="(TooManyRequests) Simulated throttling")
+    return HttpResponseError(message="(InternalServerError) Simulated failure")
+
+
+def _function_sites(sim: Simulator, subscription_id: str) -> List[Any]:
+    def build(rng: random.Random) -> List[Any]:
+        sites = []
+        for i in range(sim.config.resources):
+            name = f"site-{i}"
+            group = f"rg-{i % 10}"
+            sites.append(SimpleNamespace(
+                name=name,
+                id=f"/subscriptions/{subscription_id}/resourceGroups/{group}/providers/Microsoft.Web/sites/{name}",
+                kind=rng.choice(["functionapp,linux", "functionapp", "app"]),
+                location=rng.choice(AZURE_LOCATIONS),
+                state=rng.choice(["Running", "Running", "Stopped"]),
+                tags={"env": rng.choice(["prod", "staging", "dev"])},
+                site_config=None,
+            ))
+        return sites
+    return sim.dataset("sites", subscription_id, build)
+
+
+def _storage_accounts(sim: Simulator, subscription_id: str) -> List[Any]:
+    def build(rng: random.Random) -> List[Any]:
+        accounts = []
+        for i in range(sim.config.resources):
+            name = f"store{i:06d}"
+            accounts.append(SimpleNamespace(
+                name=name,
+                id=(f"/subscriptions/{subscription_id}/resourceGroups/rg-{i % 10}"
+                    f"/providers/Microsoft.Storage/storageAccounts/{name}"),
+                location=rng.choice(AZURE_LOCATIONS),
+                sku=SimpleNamespace(name=rng.choice(["Standard_LRS", "Standard_GRS", "Premium_LRS"])),
+                kind="StorageV2",
+                tags={"env": rng.choice(["prod", "staging", "dev"])},
+            ))
+        return accounts
+    return sim.dataset("storage", subscription_id, build)
+
+
+class _FakePager:
+    """ItemPaged / AsyncItemPaged stand-in: one simulated ARM call per page."""
+
+    def __init__(self, sim: Simulator, operation: str, records: Callable[[], List[Any]]):
+        self._sim, self._operation, self._records = sim, operation, records
+
+    def _pages(self):
+        records = self._records()
+        size = self._sim.config.page_size
+        for start in range(0, max(len(records), 1), size):
+            yield self._sim.plan(f"azure.{self._operation}", "global"), records[start:start + size]
+
+    def __iter__(self):
+        for (delay, error), page in self._pages():
+            time.sleep(delay)
+            if error:
+                raise _azure_error(error)
+            yield from page
+
+    async def _aiter(self):
+        for (delay, error), page in self._pages():
+            await asyncio.sleep(delay)
+            if error:
+                raise _azure_error(error)
+            for record in page:
+                yield record
+
+    def __aiter__(self):
+        return self._aiter()
+
+
+class FakeWebClient:
+    def __init__(self, sim: Simulator, subscription_id: str):
+        self.web_apps = SimpleNamespace(
+            list=lambda: _FakePager(sim, "web.sites.list", lambda: _function_sites(sim, subscription_id))
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class FakeStorageClient:
+    def __init__(self, sim: Simulator, subscription_id: str):
+        self.storage_accounts = SimpleNamespace(
+            list=lambda: _FakePager(sim, "storage.accounts.list", lambda: _storage_accounts(sim, subscription_id))
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class FakeSubscriptionClient:
+    def __init__(self, sim: Simulator):
+        self.subscriptions = SimpleNamespace(list=lambda: _FakePager(sim, "subscriptions.list", lambda: [
+            SimpleNamespace(subscription_id=s, state="Enabled") for s in sim.subscriptions
+        ]))
+
+
+def _fake_azure_client(sim: Simulator, kind: str, subscription_id: str):
+    if kind == "web":
+        return FakeWebClient(sim, subscription_id)
+    if kind == "storage":
+        return FakeStorageClient(sim, subscription_id)
+    if kind == "subscriptions":
+        return FakeSubscriptionClient(sim)
+    raise NotImplementedError(f"Azure client {kind} is not simulated")
+
+
+# ---------------------------------------------------------------------------
+
+def reset_process_state():
+    """Drop every process-wide cache the collectors keep, so each scenario starts cold."""
+    from methods import fanout
+    from methods.aws import eks, regions, s3
+    from methods.azure import clients, subscriptions
+    from methods.cache import inventory_cache
+
+    inventory_cache.invalidate()
+    regions._cached_regions, regions._cached_at = [], 0.0
+    subscriptions._cached_subscriptions, subscriptions._cached_at = [], 0.0
+    s3._bucket_region_cache.clear()
+    eks._describe_cache.clear()
+    fanout._controllers.clear()
+    clients._async_clients.clear()
+
+
+@contextlib.contextmanager
+def simulated_clouds(config: SimConfig) -> Iterator[Simulator]:
+    """Route every AWS/Azure client the collectors create to the simulator."""
+    from methods.aws import auth
+    from methods.azure import clients
+
+    sim = Simulator(config)
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, {"RUN_ENV": "local"}))
+        stack.enter_context(mock.patch.object(auth, "_client_pool", FakeBotoClientPool(sim)))
+        stack.enter_context(mock.patch.object(
+            clients, "_get_client", lambda kind, subscription_id, factory: _fake_azure_client(sim, kind, subscription_id)
+        ))
+        # The async paths build (and cache per event loop) their own .aio clients
+        stack.enter_context(mock.patch.object(
+            clients.azure.mgmt.web.aio, "WebSiteManagementClient",
+            lambda credential, subscription_id, **kwargs: FakeWebClient(sim, subscription_id),
+        ))
+        stack.enter_context(mock.patch.object(
+            clients.azure.mgmt.storage.aio, "StorageManagementClient",
+            lambda credential, subscription_id, **kwargs: FakeStorageClient(sim, subscription_id),
+        ))
+        stack.enter_context(mock.patch.object(clients, "get_async_credential", lambda: None))
+        stack.enter_context(mock.patch.object(clients, "get_async_transport", lambda: None))
+
+        reset_process_state()
+        try:
+            yield sim
+        finally:
+            reset_process_state()
@@ -1,8 +1,6 @@
 import azure.functions as func
 import os
-import json
 import logging
-from datetime import datetime
 
 # Configure logging once at startup
 logging.basicConfig(
@@ -15,46 +13,74 @@ logger = logging.getLogger(__name__)
 
 app = func.FunctionApp()
 
-def http_json_response(data, status_code=200, error_message=None):
-    if error_message:
-        body = {
-            "error": error_message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    else:
-        body = data
-    return func.HttpResponse(
-        json.dumps(body, default=str),
-        mimetype="application/json",
-        status_code=status_code
+from routes.http_helpers import with_server_timing
+
+# HTTP_HANDLER_MODE=async registers the asyncio handlers (same routes, same responses)
+if os.environ.get("HTTP_HANDLER_MODE", "sync").lower() == "async":
+    from routes.aws_async_routes import (
+        list_s3, list_eks, eks_details, s3_details,
+        list_rds, rds_details, list_ec2, ec2_details
+    )
+    from routes.azure_async_routes import (
+        list_azure_functions, azure_function_details,
+        list_azure_storage_accounts, azure_storage_details
+    )
+    from routes.inventory_routes import inventory_async as inventory
+    from routes.search_routes import search_async as search
+else:
+    # Import all AWS routes
+    from routes.aws_routes import (
+        list_s3, list_eks, eks_details, s3_details, 
+        list_rds, rds_details, list_ec2, ec2_details
     )
 
-# Import all AWS routes
-from routes.aws_routes import (
-    list_s3, list_eks, eks_details, s3_details, 
-    list_rds, rds_details, list_ec2, ec2_details
-)
+    # Import all Azure routes
+    from routes.azure_routes import (
+        list_azure_functions, azure_function_details, 
+        list_azure_storage_accounts, azure_storage_details
+    )
 
-# Import all Azure routes
-from routes.azure_routes import (
-    list_azure_functions, azure_function_details, 
-    list_azure_storage_accounts, azure_storage_details
-)
+    # Cross-cloud inventory
+    from routes.inventory_routes import inventory
+    from routes.search_routes import search
 
 # REGISTER ALL AWS ROUTES (AFTER app is created)
-app.route(route="aws/s3/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_s3)
-app.route(route="aws/eks/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_eks)
-app.route(route="aws/eks/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(eks_details)
-app.route(route="aws/s3/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(s3_details)
-app.route(route="aws/rds/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_rds)
-app.route(route="aws/rds/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(rds_details)
-app.route(route="aws/ec2/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_ec2)
-app.route(route="aws/ec2/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(ec2_details)
+app.route(route="aws/s3/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_s3))
+app.route(route="aws/eks/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_eks))
+app.route(route="aws/eks/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(eks_details))
+app.route(route="aws/s3/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(s3_details))
+app.route(route="aws/rds/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_rds))
+app.route(route="aws/rds/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(rds_details))
+app.route(route="aws/ec2/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_ec2))
+app.route(route="aws/ec2/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(ec2_details))
 
 # REGISTER ALL AZURE ROUTES
-app.route(route="azure/functions/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_azure_functions)
-app.route(route="azure/functions/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(azure_function_details)
-app.route(route="azure/storage/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(list_azure_storage_accounts)
-app.route(route="azure/storage/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(azure_storage_details)
+app.route(route="azure/functions/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_azure_functions))
+app.route(route="azure/functions/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(azure_function_details))
+app.route(route="azure/storage/list", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(list_azure_storage_accounts))
+app.route(route="azure/storage/details", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(azure_storage_details))
+
+# REGISTER CROSS-CLOUD ROUTES
+app.route(route="inventory", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(inventory))
+app.route(route="search", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(with_server_timing(search))
+
+# REGISTER METRICS (Prometheus text; cloud SDK latency/errors/throttles)
+from routes.metrics_routes import metrics
+app.route(route="metrics", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(metrics)
+
+# REGISTER NDJSON STREAMING ROUTES (requires the HTTP streams extension)
+if os.environ.get("HTTP_STREAMING_ENABLED", "false").lower() == "true":
+    from routes.stream_routes import stream_eks, stream_rds, stream_ec2
+    app.route(route="aws/eks/stream", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(stream_eks)
+    app.route(route="aws/rds/stream", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(stream_rds)
+    app.route(route="aws/ec2/stream", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)(stream_ec2)
+    logger.info("🌊 NDJSON streaming routes registered")
+
+# REGISTER BACKGROUND TRIGGERS (snapshots served by ?source=snapshot)
+from routes.timer_routes import refresh_inventory
+app.timer_trigger(
+    schedule=os.environ.get("INVENTORY_REFRESH_SCHEDULE", "0 */5 * * * *"),
+    arg_name="timer", run_on_startup=False, use_monitor=True
+)(refresh_inventory)
 
-logger.info("✅ Functions loaded successfully - 12 routes registered!")
+logger.info("✅ Functions loaded successfully - 15 routes + 1 timer registered!")
@@ -0,0 +1,24 @@
+# methods/async_support.py
+
+import os
+import asyncio
+import functools
+import contextvars
+import concurrent.futures
+from typing import Any, Callable
+
+
+BLOCKING_WORKERS = int(os.environ.get("ASYNC_BLOCKING_WORKERS", "64"))
+
+# One bounded pool for all blocking SDK calls made from async handlers
+BLOCKING_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=BLOCKING_WORKERS, thread_name_prefix="async-offload"
+)
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call (e.g. boto3) on the shared pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # Carry the request's context over so cloud calls made there count towards its Server-Timing
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(BLOCKING_EXECUTOR, call)
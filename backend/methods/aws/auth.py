@@ -1,13 +1,34 @@
 # methods/aws/credentials.py (or auth.py)
 
 import os
+import threading
 import boto3
+import botocore.session
 import azure.identity
-from datetime import datetime
+from botocore.credentials import CredentialProvider, CredentialResolver, RefreshableCredentials
+from datetime import datetime, timezone
+from methods.aws.client_pool import BotoClientPool
+from methods.metrics import instrument_botocore_session
 import logging
 
 logger = logging.getLogger(__name__)
 
+OIDC_SCOPES = [
+    "api://sts.amazonaws.com",
+    "https://sts.amazonaws.com",
+    "sts.amazonaws.com",
+]
+
+# Start the background refresh this many seconds before STS `Expiration`.
+# Must fall inside botocore's advisory window (15 min) and before its
+# mandatory window (10 min) so request threads never block on a refresh.
+CREDENTIAL_REFRESH_AHEAD_SECONDS = int(
+    os.environ.get("AWS_CREDENTIAL_REFRESH_AHEAD_SECONDS", "840")
+)
+# A failed background refresh is retried after this delay, doubling up to the max
+CREDENTIAL_REFRESH_RETRY_SECONDS = int(os.environ.get("AWS_CREDENTIAL_REFRESH_RETRY_SECONDS", "15"))
+CREDENTIAL_REFRESH_RETRY_MAX_SECONDS = int(os.environ.get("AWS_CREDENTIAL_REFRESH_RETRY_MAX_SECONDS", "120"))
+
 
 def is_running_in_azure():
     if os.environ.get("RUN_ENV") == "local":
@@ -20,59 +41,171 @@ def is_running_in_azure():
     )
 
 
-def _get_aws_credentials_via_oidc():
-    """Return a dict of AWS creds (AccessKeyId, SecretAccessKey, SessionToken)."""
-    client_id = os.environ.get("AZURE_CLIENT_ID")
-    role_arn = os.environ.get("AWS_ROLE_ARN")
-    if not client_id or not role_arn:
-        raise ValueError("Missing AZURE_CLIENT_ID / AWS_ROLE_ARN")
+class OidcCredentialProvider:
+    """Process-wide AWS credentials assumed via Azure Managed Identity (OIDC).
+
+    Wraps botocore RefreshableCredentials so every client shares one set of
+    assumed-role credentials. botocore's refresh lock gives single-flight
+    refresh across region threads; a daemon timer refreshes ahead of expiry
+    and retries with backoff until a refresh succeeds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scope = None
+        self._managed_identity = None
+        self._sts = None
+        self._credentials = None
+        self._timer = None
+        self._assumed = 0
 
-    cred = azure.identity.ManagedIdentityCredential(client_id=client_id)
+    def _get_web_identity_token(self, client_id: str) -> str:
+        if self._managed_identity is None:
+            self._managed_identity = azure.identity.ManagedIdentityCredential(client_id=client_id)
+
+        # Try the scope that worked last time first, then the rest
+        scopes_to_try = [self._scope] if self._scope else []
+        scopes_to_try += [s for s in OIDC_SCOPES if s != self._scope]
+
+        for scope in scopes_to_try:
+            try:
+                logger.info(f"🔑 OIDC token request for scope: {scope}")
+                token = self._managed_identity.get_token(scope)
+                logger.info(f"✅ Token obtained for {scope}")
+                self._scope = scope
+                return token.token
+            except Exception as e:
+                logger.error(f"❌ OIDC token failed for {scope}: {str(e)}", exc_info=True)
+
+        raise ValueError("No OIDC token acquired")
 
-    scopes_to_try = [
-        "api://sts.amazonaws.com",
-        "https://sts.amazonaws.com",
-        "sts.amazonaws.com",
-    ]
+    def _assume_role(self) -> dict:
+        """Return credentials in botocore's refresh metadata format."""
+        client_id = os.environ.get("AZURE_CLIENT_ID")
+        role_arn = os.environ.get("AWS_ROLE_ARN")
+        if not client_id or not role_arn:
+            raise ValueError("Missing AZURE_CLIENT_ID / AWS_ROLE_ARN")
 
-    token = None
-    for scope in scopes_to_try:
+        web_identity_token = self._get_web_identity_token(client_id)
+
+        if self._sts is None:
+            sts_session = boto3.Session(botocore_session=instrument_botocore_session(botocore.session.get_session()))
+            self._sts = sts_session.client("sts", region_name="us-east-1")
+        assumed = self._sts.assume_role_with_web_identity(
+            RoleArn=role_arn,
+            RoleSessionName=f"azfunc-{datetime.utcnow().strftime('%H%M%S')}",
+            WebIdentityToken=web_identity_token,
+        )
+
+        creds = assumed["Credentials"]
+        expiration = creds["Expiration"]
+        logger.info(f"🔐 Assumed {role_arn} until {expiration.isoformat()}")
+        self._assumed += 1
+        self._schedule_refresh(expiration)
+        return {
+            "access_key": creds["AccessKeyId"],
+            "secret_key": creds["SecretAccessKey"],
+            "token": creds["SessionToken"],
+            "expiry_time": expiration.isoformat(),
+        }
+
+    def _schedule_refresh(self, expiration: datetime):
+        remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+        self._start_timer(max(remaining - CREDENTIAL_REFRESH_AHEAD_SECONDS, 1), attempt=0)
+
+    def _start_timer(self, delay: float, attempt: int):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._background_refresh, args=(attempt,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self, attempt: int = 0):
+        assumed = self._assumed
+        error = "credentials were not refreshed"
         try:
-            logger.info(f"🔑 OIDC token request for scope: {scope}")
-            token = cred.get_token(scope)
-            logger.info(f"✅ Token obtained for {scope}")
-            break
+            # Inside the advisory window this triggers botocore's locked refresh
+            self._credentials.get_frozen_credentials()
         except Exception as e:
-            logger.error(f"❌ OIDC token failed for {scope}: {str(e)}", exc_info=True)
+            error = str(e)
+        if self._assumed != assumed:
+            # _assume_role scheduled the next refresh
+            return
+        # botocore logs advisory-refresh failures and keeps the old credentials,
+        # so keep retrying until a refresh lands instead of waiting for the mandatory window
+        delay = min(CREDENTIAL_REFRESH_RETRY_SECONDS * 2 ** attempt, CREDENTIAL_REFRESH_RETRY_MAX_SECONDS)
+        logger.warning(f"⚠️ Background AWS credential refresh failed ({error}); retrying in {delay}s")
+        self._start_timer(delay, attempt + 1)
 
-    if token is None:
-        raise ValueError("No OIDC token acquired")
+    def get_credentials(self) -> RefreshableCredentials:
+        if self._credentials is None:
+            with self._lock:
+                if self._credentials is None:
+                    self._credentials = RefreshableCredentials.create_from_metadata(
+                        metadata=self._assume_role(),
+                        refresh_using=self._assume_role,
+                        method="azure-oidc-web-identity",
+                    )
+        return self._credentials
 
-    sts = boto3.client("sts", region_name="us-east-1")
-    assumed = sts.assume_role_with_web_identity(
-        RoleArn=role_arn,
-        RoleSessionName=f"azfunc-{datetime.utcnow().strftime('%H%M%S')}",
-        WebIdentityToken=token.token,
-    )
 
-    creds = assumed["Credentials"]
-    return {
-        "aws_access_key_id": creds["AccessKeyId"],
-        "aws_secret_access_key": creds["SecretAccessKey"],
-        "aws_session_token": creds["SessionToken"],
-    }
+_oidc_provider = OidcCredentialProvider()
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_aws_credentials_via_oidc() -> RefreshableCredentials:
+    """Return the shared, auto-refreshing AWS credentials for this process."""
+    return _oidc_provider.get_credentials()
+
+
+class _OidcCredentialSource(CredentialProvider):
+    """botocore credential provider that serves the shared OIDC credentials."""
+
+    METHOD = "azure-oidc-web-identity"
+    CANONICAL_NAME = "AzureOidcWebIdentity"
+
+    def load(self) -> RefreshableCredentials:
+        return _get_aws_credentials_via_oidc()
+
+
+def get_aws_session() -> boto3.Session:
+    """Process-wide boto3 session (OIDC credentials in Azure, default chain locally)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Every pooled client inherits the per-call metrics hooks from this session
+                core_session = instrument_botocore_session(botocore.session.get_session())
+                if is_running_in_azure():
+                    logger.info("🚀 Running in Azure: using OIDC credentials")
+                    # Replace the default chain through botocore's public component registry
+                    core_session.register_component(
+                        "credential_provider", CredentialResolver(providers=[_OidcCredentialSource()])
+                    )
+                else:
+                    logger.info("💻 Local: default AWS credentials")
+                _session = boto3.Session(botocore_session=core_session)
+    return _session
+
+
+_client_pool = BotoClientPool(get_aws_session)
 
 
 def get_aws_boto_client(service: str, region: str = "us-east-1"):
     """Central factory for any AWS boto client (s3, eks, rds, ec2, ...)."""
-    if is_running_in_azure():
-        logger.info(f"🚀 Running in Azure: using OIDC for {service}")
-        creds = _get_aws_credentials_via_oidc()
-        return boto3.client(
-            service,
-            region_name=region,
-            **creds,
-        )
-    else:
-        logger.info(f"💻 Local: default AWS credentials for {service} ({region})")
-        return boto3.client(service, region_name=region)
+    return _client_pool.get(service, region)
+
+
+def get_aws_client_pool_stats() -> dict:
+    """Hit/miss/eviction counters of the shared boto client pool."""
+    return _client_pool.stats()
+
+
+def get_aws_account_key() -> str:
+    """Stable label for the AWS account in use, for cache keys (no API call)."""
+    role_arn = os.environ.get("AWS_ROLE_ARN")
+    if is_running_in_azure() and role_arn:
+        parts = role_arn.split(":")
+        return parts[4] if len(parts) > 4 else role_arn
+    return os.environ.get("AWS_PROFILE", "default")
@@ -0,0 +1,99 @@
+# methods/aws/batch.py
+
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from methods.aws.fanout import scatter_gather
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+BATCH_MAX_IDS = int(os.environ.get("AWS_BATCH_MAX_IDS", "500"))
+
+# (region, resource id)
+BatchId = Tuple[str, str]
+
+
+def batch_key(region: str, resource_id: str) -> str:
+    return f"{region}:{resource_id}"
+
+
+def parse_batch_ids(value: str, regions: Optional[Iterable[str]] = None) -> List[BatchId]:
+    """Parse `ids=r1:i-a,r1:i-b,r2:i-c` into (region, id) pairs, de-duplicated in order.
+
+    With `regions` (the account's enabled regions), ids in any other region
+    are rejected rather than creating a pooled client for an arbitrary name.
+    """
+    pairs: "OrderedDict[BatchId, None]" = OrderedDict()
+    for raw in value.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        region, sep, resource_id = raw.partition(":")
+        if not sep or not region or not resource_id:
+            raise ValueError(f"ids entries must be region:id (got '{raw}')")
+        pairs[(region, resource_id)] = None
+    if not pairs:
+        raise ValueError("ids must list at least one region:id")
+    if len(pairs) > BATCH_MAX_IDS:
+        raise ValueError(f"At most {BATCH_MAX_IDS} ids per request")
+    if regions is not None:
+        known = set(regions)
+        unknown = sorted({region for region, _ in pairs if region not in known})
+        if unknown:
+            raise ValueError(f"ids reference regions that are not enabled: {', '.join(unknown)}")
+    return list(pairs)
+
+
+def chunked(values: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def fetch_batch_details(
+    label: str,
+    ids: List[BatchId],
+    fetch_region: Callable[[str, List[str]], Dict[str, Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Group ids by region, run `fetch_region(region, ids)` per region, return per-ID results.
+
+    `fetch_region` returns {resource id: details} for the ids it found; ids
+    it leaves out are reported as not found. A region that fails or times
+    out reports its error against every id it was asked for.
+    """
+    by_region: Dict[str, List[str]] = {}
+    for region, resource_id in ids:
+        by_region.setdefault(region, []).append(resource_id)
+    logger.info(f"📦 {label} batch: {len(ids)} ids across {len(by_region)} regions")
+
+    def fetch(region: str) -> List[Dict[str, Any]]:
+        return [{"region": region, "found": fetch_region(region, by_region[region])}]
+
+    fan = scatter_gather(f"{label}-batch", list(by_region), fetch)
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for chunk in fan["items"]:
+        region = chunk["region"]
+        for resource_id in by_region[region]:
+            details = chunk["found"].get(resource_id)
+            if details is None:
+                errors[batch_key(region, resource_id)] = "not found"
+            else:
+                results[batch_key(region, resource_id)] = details
+    for failure in fan["failed_regions"]:
+        for resource_id in by_region[failure["region"]]:
+            errors[batch_key(failure["region"], resource_id)] = failure["error"]
+    for region in fan["timed_out_regions"]:
+        for resource_id in by_region[region]:
+            errors[batch_key(region, resource_id)] = "timed out"
+
+    return {
+        "results": results,
+        "errors": errors,
+        "requested": len(ids),
+        "duration_seconds": fan["duration_seconds"],
+    }
@@ -0,0 +1,92 @@
+# methods/aws/client_pool.py
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "25"))
+CLIENT_IDLE_SECONDS = int(os.environ.get("AWS_CLIENT_IDLE_SECONDS", "900"))
+CONNECT_TIMEOUT_SECONDS = float(os.environ.get("AWS_CONNECT_TIMEOUT_SECONDS", "5"))
+READ_TIMEOUT_SECONDS = float(os.environ.get("AWS_READ_TIMEOUT_SECONDS", "15"))
+MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+
+
+class BotoClientPool:
+    """Thread-safe cache of boto3 clients keyed by (service, region, credentials).
+
+    All clients come from one shared session, so service models are loaded
+    once per process and each client keeps its own urllib3 connection pool.
+    When the session's credentials rotate, the credential part of the key
+    changes and a fresh client is built; the stale one ages out via idle
+    eviction.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], boto3.Session],
+        max_pool_connections: int = MAX_POOL_CONNECTIONS,
+        idle_seconds: int = CLIENT_IDLE_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._config = Config(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=CONNECT_TIMEOUT_SECONDS,
+            read_timeout=READ_TIMEOUT_SECONDS,
+            retries={"mode": "standard", "max_attempts": MAX_ATTEMPTS},
+        )
+        self._idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str, Optional[str]], Dict[str, Any]] = {}
+        self._last_sweep = time.monotonic()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _credential_key(self, session: boto3.Session) -> Optional[str]:
+        credentials = session.get_credentials()
+        if credentials is None:
+            return None
+        return credentials.get_frozen_credentials().access_key
+
+    def _evict_idle(self, now: float):
+        if now - self._last_sweep < self._idle_seconds / 4:
+            return
+        self._last_sweep = now
+        for key in [k for k, v in self._clients.items() if now - v["last_used"] > self._idle_seconds]:
+            del self._clients[key]
+            self._stats["evictions"] += 1
+            logger.info(f"🧹 Evicted idle AWS client {key[0]} ({key[1]})")
+
+    def get(self, service: str, region: str):
+        session = self._session_factory()
+        key = (service, region, self._credential_key(session))
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry["last_used"] = now
+                self._stats["hits"] += 1
+                return entry["client"]
+
+            # boto3 sessions are not thread-safe, so build clients under the lock
+            self._stats["misses"] += 1
+            logger.info(f"🔧 New AWS client for {service} ({region})")
+            client = session.client(service, region_name=region, config=self._config)
+            self._clients[key] = {"client": client, "last_used": now}
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "size": len(self._clients)}
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
@@ -1,8 +1,14 @@
 # methods/aws/ec2.py
 
-import concurrent.futures
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional
 from methods.aws.auth import get_aws_boto_client, is_running_in_azure
+from methods.async_support import run_blocking
+from methods.aws.batch import BatchId, chunked, fetch_batch_details
+from methods.aws.fanout import (
+    scatter_gather, scatter_gather_async, scatter_gather_stream, scatter_gather_stream_async,
+)
+from methods.aws.pagination import DEFAULT_LIMIT, RegionPage, collect_region_page, iter_pages
+from methods.aws.regions import get_scan_regions
 
 
 # Configure logging
@@ -10,6 +16,10 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# describe_instances accepts at most 200 values per filter
+EC2_DESCRIBE_BATCH_SIZE = 200
+
+
 def get_aws_ec2_client(region: str):
     """Return EC2 client using OIDC in Azure, default AWS credentials elsewhere."""
     if is_running_in_azure():
@@ -20,19 +30,14 @@ def get_aws_ec2_client(region: str):
         return get_aws_boto_client("ec2", region=region)
 
 
-def _fetch_ec2_instances_in_region(region: str) -> List[Dict[str, Any]]:
-    """For a single region, fetch its EC2 instances without heavy details."""
-    try:
-        ec2 = get_aws_ec2_client(region)
-        logger.info(f"📍 Scanning EC2 instances in {region}")
-
-        resp = ec2.describe_instances()
-        reservations = resp.get("Reservations", [])
-        if not reservations:
-            return []
+def _iter_ec2_instance_pages(region: str, starting_token: Optional[str] = None) -> Iterator[RegionPage]:
+    """Yield (instances, next_token) for each describe_instances page in a region."""
+    ec2 = get_aws_ec2_client(region)
+    logger.info(f"📍 Scanning EC2 instances in {region}")
 
+    for page, next_token in iter_pages(ec2, "describe_instances", "NextToken", starting_token):
         instances = []
-        for reservation in reservations:
+        for reservation in page.get("Reservations", []):
             for inst in reservation.get("Instances", []):
                 # Minimal list view
                 tags = {
@@ -46,49 +51,124 @@ def _fetch_ec2_instances_in_region(region: str) -> List[Dict[str, Any]]:
                     "public_ip": inst.get("PublicIpAddress"),
                     "private_ip": inst.get("PrivateIpAddress"),
                     "region": region,
+                    "tags": tags,
                 })
+        yield instances, next_token
 
-        return instances
 
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to list EC2 instances in {region}: {str(e)}", exc_info=True)
-        return []
+def _fetch_ec2_instances_in_region(region: str) -> List[Dict[str, Any]]:
+    """For a single region, fetch all its EC2 instances without heavy details."""
+    instances = []
+    for page, _ in _iter_ec2_instance_pages(region):
+        instances.extend(page)
+    return instances
 
 
-def list_all_ec2_instances() -> List[Dict[str, Any]]:
+def list_all_ec2_instances(regions: Optional[str] = None) -> Dict[str, Any]:
     """Lists all EC2 instances across all AWS regions for the current account.
-    Optimized for fast list view."""
+    Optimized for fast list view.
+    Returns the fan-out envelope (items + per-region status)."""
     logger.info("🚀 list_all_ec2_instances (FAST) START")
 
-    # Get all regions via EC2
-    ec2 = get_aws_boto_client("ec2")
-    try:
-        response = ec2.describe_regions()
-        regions = [r["RegionName"] for r in response["Regions"]]
-        logger.info(f"🌍 Found {len(regions)} AWS regions")
-    except Exception as e:
-        logger.error(f"❌ Failed to list AWS regions: {str(e)}", exc_info=True)
-        return []
-
-    all_instances: List[Dict[str, Any]] = []
+    # Cached, opt-in/allow-list filtered regions, narrowed by `regions`
+    regions = get_scan_regions(regions)
+    logger.info(f"🌍 Scanning {len(regions)} AWS regions")
+
+    return scatter_gather("ec2", regions, _fetch_ec2_instances_in_region)
+
+
+async def list_all_ec2_instances_async(regions: Optional[str] = None) -> Dict[str, Any]:
+    """asyncio variant of list_all_ec2_instances (same envelope)."""
+    logger.info("🚀 list_all_ec2_instances_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    return await scatter_gather_async("ec2", regions, _fetch_ec2_instances_in_region)
+
+
+def stream_all_ec2_instances(regions: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """list_all_ec2_instances as per-region events followed by a trailer (see scatter_gather_stream)."""
+    logger.info("🚀 stream_all_ec2_instances START")
+    return scatter_gather_stream("ec2", get_scan_regions(regions), _fetch_ec2_instances_in_region)
+
+
+async def stream_all_ec2_instances_async(regions: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """asyncio variant of stream_all_ec2_instances (same events)."""
+    logger.info("🚀 stream_all_ec2_instances_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    async for event in scatter_gather_stream_async("ec2", regions, _fetch_ec2_instances_in_region):
+        yield event
+
+
+def list_ec2_instances_page(regions: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                            next_token: Optional[str] = None) -> Dict[str, Any]:
+    """One cursor-paginated page of EC2 instances: {"items": [...], "next_token": ...}."""
+    logger.info(f"🚀 list_ec2_instances_page START (limit={limit})")
+    return collect_region_page("ec2", get_scan_regions(regions), _iter_ec2_instance_pages, limit, next_token)
+
+
+def _build_ec2_details(inst: Dict[str, Any], region: str) -> Dict[str, Any]:
+    # 1️⃣ Core instance metadata
+    core = {
+        "instance_id": inst.get("InstanceId"),
+        "instance_type": inst.get("InstanceType"),
+        "state": inst.get("State", {}).get("Name"),
+        "region": region,
+        "placement": {
+            "availability_zone": inst.get("Placement", {}).get("AvailabilityZone"),
+            "tenancy": inst.get("Placement", {}).get("Tenancy"),
+        },
+    }
+
+    # 2️⃣ Networking
+    networking = {
+        "public_ip": inst.get("PublicIpAddress"),
+        "private_ip": inst.get("PrivateIpAddress"),
+        "private_dns_name": inst.get("PrivateDnsName"),
+        "public_dns_name": inst.get("PublicDnsName"),
+        "vpc_id": inst.get("VpcId"),
+        "subnet_id": inst.get("SubnetId"),
+    }
+
+    # 3️⃣ Image / boot info
+    image = {}
+    if "ImageId" in inst:
+        image = {
+            "image_id": inst["ImageId"],
+            "image_name": inst.get("Image", {}).get("Name"),  # not always present
+            "kernel_id": inst.get("KernelId"),
+            "ramdisk_id": inst.get("RamdiskId"),
+        }
 
-    # Parallelize region calls for speed
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_region = {
-            executor.submit(_fetch_ec2_instances_in_region, region): region
-            for region in regions
+    # 4️⃣ Security / VPC
+    vpc = {
+        "security_groups": [
+            sg["GroupName"] for sg in inst.get("SecurityGroups", [])
+        ],
+    }
+
+    # 5️⃣ Storage (block device mappings)
+    block_devices = inst.get("BlockDeviceMappings", [])
+    storage = [
+        {
+            "device_name": bd["DeviceName"],
+            "volume_id": bd.get("Ebs", {}).get("VolumeId"),
+            "delete_on_termination": bd.get("Ebs", {}).get("DeleteOnTermination", False),
         }
+        for bd in block_devices
+    ]
 
-        for future in concurrent.futures.as_completed(future_to_region):
-            region = future_to_region[future]
-            try:
-                instances = future.result()
-                all_instances.extend(instances)
-            except Exception as e:
-                logger.warning(f"⚠️ Exception fetching EC2 instances for {region}: {str(e)}", exc_info=True)
+    # 6️⃣ Tags
+    tags = {
+        tag["Key"]: tag["Value"] for tag in inst.get("Tags", [])
+    } if inst.get("Tags") else {}
 
-    logger.info(f"🎉 Found {len(all_instances)} EC2 instances across {len(regions)} regions")
-    return all_instances
+    return {
+        "core": core,
+        "networking": networking,
+        "image": image,
+        "vpc": vpc,
+        "storage": storage,
+        "tags": tags,
+    }
 
 
 def get_ec2_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
@@ -100,70 +180,7 @@ def get_ec2_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
         resp = ec2.describe_instances(InstanceIds=[instance_id])
         reservation = resp.get("Reservations", [{}])[0]
         inst = reservation.get("Instances", [{}])[0]
-
-        # 1️⃣ Core instance metadata
-        core = {
-            "instance_id": inst.get("InstanceId"),
-            "instance_type": inst.get("InstanceType"),
-            "state": inst.get("State", {}).get("Name"),
-            "region": region,
-            "placement": {
-                "availability_zone": inst.get("Placement", {}).get("AvailabilityZone"),
-                "tenancy": inst.get("Placement", {}).get("Tenancy"),
-            },
-        }
-
-        # 2️⃣ Networking
-        networking = {
-            "public_ip": inst.get("PublicIpAddress"),
-            "private_ip": inst.get("PrivateIpAddress"),
-            "private_dns_name": inst.get("PrivateDnsName"),
-            "public_dns_name": inst.get("PublicDnsName"),
-            "vpc_id": inst.get("VpcId"),
-            "subnet_id": inst.get("SubnetId"),
-        }
-
-        # 3️⃣ Image / boot info
-        image = {}
-        if "ImageId" in inst:
-            image = {
-                "image_id": inst["ImageId"],
-                "image_name": inst.get("Image", {}).get("Name"),  # not always present
-                "kernel_id": inst.get("KernelId"),
-                "ramdisk_id": inst.get("RamdiskId"),
-            }
-
-        # 4️⃣ Security / VPC
-        vpc = {
-            "security_groups": [
-                sg["GroupName"] for sg in inst.get("SecurityGroups", [])
-            ],
-        }
-
-        # 5️⃣ Storage (block device mappings)
-        block_devices = inst.get("BlockDeviceMappings", [])
-        storage = [
-            {
-                "device_name": bd["DeviceName"],
-                "volume_id": bd.get("Ebs", {}).get("VolumeId"),
-                "delete_on_termination": bd.get("Ebs", {}).get("DeleteOnTermination", False),
-            }
-            for bd in block_devices
-        ]
-
-        # 6️⃣ Tags
-        tags = {
-            tag["Key"]: tag["Value"] for tag in inst.get("Tags", [])
-        } if inst.get("Tags") else {}
-
-        return {
-            "core": core,
-            "networking": networking,
-            "image": image,
-            "vpc": vpc,
-            "storage": storage,
-            "tags": tags,
-        }
+        return _build_ec2_details(inst, region)
 
     except Exception as e:
         logger.error(f"💥 Failed to get EC2 instance details for {instance_id} in {region}: {str(e)}", exc_info=True)
@@ -173,3 +190,23 @@ def get_ec2_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
             "region": region,
             "state": "Unknown",
         }
+
+
+def _describe_ec2_instances_in_region(region: str, instance_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Full details for many instances in one region, EC2_DESCRIBE_BATCH_SIZE ids per call."""
+    ec2 = get_aws_ec2_client(region)
+    found = {}
+    for chunk in chunked(instance_ids, EC2_DESCRIBE_BATCH_SIZE):
+        # An instance-id filter skips unknown ids instead of failing the whole call
+        filters = [{"Name": "instance-id", "Values": chunk}]
+        for page, _ in iter_pages(ec2, "describe_instances", "NextToken", Filters=filters):
+            for reservation in page.get("Reservations", []):
+                for inst in reservation.get("Instances", []):
+                    found[inst["InstanceId"]] = _build_ec2_details(inst, region)
+    return found
+
+
+def get_ec2_instance_details_batch(ids: List[BatchId]) -> Dict[str, Any]:
+    """Details for many (region, instance id) pairs: one describe_instances per region and chunk."""
+    logger.info(f"🔍 get_ec2_instance_details_batch: {len(ids)} ids")
+    return fetch_batch_details("ec2", ids, _describe_ec2_instances_in_region)
@@ -1,9 +1,20 @@
 # methods/aws/eks.py
 
 import os
+import threading
+import time
 import concurrent.futures
-from typing import List, Dict, Any
-from methods.aws.auth import get_aws_boto_client, is_running_in_azure
+from collections import OrderedDict
+from functools import partial
+from typing import List, Dict, Any, AsyncIterator, FrozenSet, Iterator, Optional, Tuple
+from methods.aws.auth import get_aws_account_key, get_aws_boto_client, is_running_in_azure
+from methods.async_support import run_blocking
+from methods.metrics import in_request_context
+from methods.aws.fanout import (
+    scatter_gather, scatter_gather_async, scatter_gather_stream, scatter_gather_stream_async,
+)
+from methods.aws.pagination import DEFAULT_LIMIT, RegionPage, collect_region_page, iter_pages
+from methods.aws.regions import get_scan_regions
 
 
 # Configure logging
@@ -11,6 +22,21 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+EKS_DESCRIBE_WORKERS = int(os.environ.get("EKS_DESCRIBE_WORKERS", "8"))
+EKS_DESCRIBE_CACHE_TTL_SECONDS = int(os.environ.get("EKS_DESCRIBE_CACHE_TTL_SECONDS", "30"))
+EKS_DESCRIBE_CACHE_MAX_ENTRIES = int(os.environ.get("EKS_DESCRIBE_CACHE_MAX_ENTRIES", "5000"))
+INCLUDE_FIELDS = ("status", "version", "tags")
+
+# Shared across regions and requests, so describe_cluster concurrency is
+# bounded process-wide no matter how many regions scan at once.
+_describe_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=EKS_DESCRIBE_WORKERS, thread_name_prefix="eks-describe"
+)
+# cluster ARN -> (expires_at, summary), in write order so expired entries sit at the front
+_describe_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_describe_cache_lock = threading.Lock()
+
+
 def get_aws_eks_client(region: str):
     """Return EKS client using OIDC in Azure, default AWS credentials elsewhere."""
     if is_running_in_azure():
@@ -21,19 +47,14 @@ def get_aws_eks_client(region: str):
         return get_aws_boto_client("eks", region=region)
 
 
-def _fetch_clusters_in_region(region: str) -> List[Dict[str, Any]]:
-    """For a single region, fetch its EKS clusters without describe_cluster."""
-    try:
-        eks = get_aws_eks_client(region)
-        logger.info(f"📍 Scanning EKS clusters in {region}")
-
-        resp = eks.list_clusters()
-        cluster_names = resp.get("clusters", [])
-        if not cluster_names:
-            return []
+def _iter_cluster_pages(region: str, starting_token: Optional[str] = None) -> Iterator[RegionPage]:
+    """Yield (clusters, next_token) for each list_clusters page, without describe_cluster."""
+    eks = get_aws_eks_client(region)
+    logger.info(f"📍 Scanning EKS clusters in {region}")
 
+    for page, next_token in iter_pages(eks, "list_clusters", "nextToken", starting_token):
         # Do NOT call describe_cluster; just return lightweight entries
-        return [
+        clusters = [
             {
                 "name": name,
                 "region": region,
@@ -41,47 +62,148 @@ def _fetch_clusters_in_region(region: str) -> List[Dict[str, Any]]:
                 # but for quick list page you can fake it or accept it not shown yet.
                 "status": "Fetching..."  # or omit "status" entirely
             }
-            for name in cluster_names
+            for name in page.get("clusters", [])
         ]
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to list EKS clusters in {region}: {str(e)}", exc_info=True)
-        return []
+        yield clusters, next_token
+
+
+def parse_include(value: Optional[str]) -> FrozenSet[str]:
+    """Parse the `include=status,version,tags` query parameter."""
+    include = frozenset(v.strip().lower() for v in (value or "").split(",") if v.strip())
+    unknown = include - set(INCLUDE_FIELDS)
+    if unknown:
+        raise ValueError(f"include supports: {', '.join(INCLUDE_FIELDS)}")
+    return include
+
+
+def _cluster_arn(region: str, name: str) -> str:
+    return f"arn:aws:eks:{region}:{get_aws_account_key()}:cluster/{name}"
+
+
+def _describe_cluster_summary(region: str, name: str) -> Dict[str, Any]:
+    """describe_cluster fields for the list view, cached per cluster ARN for a short TTL."""
+    arn = _cluster_arn(region, name)
+    now = time.monotonic()
+    with _describe_cache_lock:
+        cached = _describe_cache.get(arn)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    desc = get_aws_eks_client(region).describe_cluster(name=name)["cluster"]
+    summary = {
+        "arn": desc["arn"],
+        "status": desc["status"],
+        "version": desc.get("version"),
+        "platform_version": desc.get("platformVersion"),
+        "tags": desc.get("tags", {}),
+    }
+    now = time.monotonic()
+    with _describe_cache_lock:
+        _describe_cache[arn] = (now + EKS_DESCRIBE_CACHE_TTL_SECONDS, summary)
+        _describe_cache.move_to_end(arn)
+        # Drop expired entries, then the oldest beyond the cap
+        while _describe_cache:
+            oldest_arn, (expires_at, _) = next(iter(_describe_cache.items()))
+            if expires_at > now and len(_describe_cache) <= EKS_DESCRIBE_CACHE_MAX_ENTRIES:
+                break
+            del _describe_cache[oldest_arn]
+    return summary
+
+
+def _start_describes(clusters: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], concurrent.futures.Future]]:
+    return [
+        (cluster, _describe_executor.submit(in_request_context(_describe_cluster_summary), cluster["region"], cluster["name"]))
+        for cluster in clusters
+    ]
 
 
-def list_all_eks_clusters() -> List[Dict[str, Any]]:
+def _apply_describes(pending: List[Tuple[Dict[str, Any], concurrent.futures.Future]], include: FrozenSet[str]):
+    for cluster, future in pending:
+        try:
+            summary = future.result()
+        except Exception as e:
+            logger.warning(f"⚠️ describe_cluster failed for {cluster['name']} ({cluster['region']}): {str(e)}")
+            if "status" in include:
+                cluster["status"] = "Unknown"
+            cluster["describe_error"] = str(e)
+            continue
+        cluster["arn"] = summary["arn"]
+        if "status" in include:
+            cluster["status"] = summary["status"]
+        if "version" in include:
+            cluster["version"] = summary["version"]
+            cluster["platform_version"] = summary["platform_version"]
+        if "tags" in include:
+            cluster["tags"] = summary["tags"]
+
+
+def _iter_enriched_cluster_pages(region: str, starting_token: Optional[str] = None,
+                                 include: FrozenSet[str] = frozenset()) -> Iterator[RegionPage]:
+    """_iter_cluster_pages with each page enriched by parallel describe_cluster calls."""
+    for clusters, next_token in _iter_cluster_pages(region, starting_token):
+        _apply_describes(_start_describes(clusters), include)
+        yield clusters, next_token
+
+
+def _fetch_clusters_in_region(region: str, include: FrozenSet[str] = frozenset()) -> List[Dict[str, Any]]:
+    """For a single region, fetch all its EKS clusters.
+
+    With `include`, describe_cluster calls start as soon as each list_clusters
+    page arrives and run while the remaining pages are listed.
+    """
+    clusters = []
+    pending = []
+    for page, _ in _iter_cluster_pages(region):
+        clusters.extend(page)
+        if include:
+            pending.extend(_start_describes(page))
+    _apply_describes(pending, include)
+    return clusters
+
+
+def list_all_eks_clusters(regions: Optional[str] = None, include: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
     """Lists all EKS clusters in all AWS regions for the current account.
-    Returns minimal info optimized for fast list view."""
+    Returns minimal info optimized for fast list view.
+    Returns the fan-out envelope (items + per-region status)."""
     logger.info("🚀 list_all_eks_clusters (FAST) START")
 
-    # Get all regions via EC2
-    ec2 = get_aws_boto_client("ec2")
-    try:
-        response = ec2.describe_regions()
-        regions = [r["RegionName"] for r in response["Regions"]]
-        logger.info(f"🌍 Found {len(regions)} AWS regions")
-    except Exception as e:
-        logger.error(f"❌ Failed to list AWS regions: {str(e)}", exc_info=True)
-        return []
+    # Cached, opt-in/allow-list filtered regions, narrowed by `regions`
+    regions = get_scan_regions(regions)
+    logger.info(f"🌍 Scanning {len(regions)} AWS regions")
 
-    all_clusters: List[Dict[str, Any]] = []
+    return scatter_gather("eks", regions, partial(_fetch_clusters_in_region, include=include))
+
+
+async def list_all_eks_clusters_async(regions: Optional[str] = None,
+                                      include: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+    """asyncio variant of list_all_eks_clusters (same envelope)."""
+    logger.info("🚀 list_all_eks_clusters_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    return await scatter_gather_async("eks", regions, partial(_fetch_clusters_in_region, include=include))
+
+
+def stream_all_eks_clusters(regions: Optional[str] = None, include: FrozenSet[str] = frozenset()) -> Iterator[Dict[str, Any]]:
+    """list_all_eks_clusters as per-region events followed by a trailer (see scatter_gather_stream)."""
+    logger.info("🚀 stream_all_eks_clusters START")
+    return scatter_gather_stream("eks", get_scan_regions(regions), partial(_fetch_clusters_in_region, include=include))
+
+
+async def stream_all_eks_clusters_async(regions: Optional[str] = None, include: FrozenSet[str] = frozenset()) -> AsyncIterator[Dict[str, Any]]:
+    """asyncio variant of stream_all_eks_clusters (same events)."""
+    logger.info("🚀 stream_all_eks_clusters_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    async for event in scatter_gather_stream_async("eks", regions, partial(_fetch_clusters_in_region, include=include)):
+        yield event
 
-    # Parallelize region calls for speed
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_region = {
-            executor.submit(_fetch_clusters_in_region, region): region
-            for region in regions
-        }
 
-        for future in concurrent.futures.as_completed(future_to_region):
-            region = future_to_region[future]
-            try:
-                clusters = future.result()
-                all_clusters.extend(clusters)
-            except Exception as e:
-                logger.warning(f"⚠️ Exception fetching clusters for {region}: {str(e)}", exc_info=True)
+def list_eks_clusters_page(regions: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                           next_token: Optional[str] = None,
+                           include: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+    """One cursor-paginated page of EKS clusters: {"items": [...], "next_token": ...}."""
+    logger.info(f"🚀 list_eks_clusters_page START (limit={limit})")
+    pager = partial(_iter_enriched_cluster_pages, include=include) if include else _iter_cluster_pages
+    return collect_region_page("eks", get_scan_regions(regions), pager, limit, next_token)
 
-    logger.info(f"🎉 Found {len(all_clusters)} EKS clusters across {len(regions)} regions")
-    return all_clusters
 
 def get_eks_cluster_details(name: str, region: str) -> Dict[str, Any]:
     """Returns rich, detailed info for a single EKS cluster (name + region)."""
@@ -100,7 +222,7 @@ def get_eks_cluster_details(name: str, region: str) -> Dict[str, Any]:
             "version": desc.get("version"),
             "platform_version": desc.get("platformVersion"),
             "status": desc["status"],
-            "created_at": desc.get("createdAt").isoformat() if desc.get("createdAt") else None,
+            "created_at": desc.get("createdAt"),
             "endpoint": desc.get("endpoint"),
         }
 
@@ -179,7 +301,7 @@ def get_eks_cluster_details(name: str, region: str) -> Dict[str, Any]:
             "vpc_id": desc.get("resourcesVpcConfig", {}).get("vpcId"),
             "cluster_security_groups": desc.get("resourcesVpcConfig", {}).get("clusterSecurityGroupIds", []),
             "subnets": desc.get("resourcesVpcConfig", {}).get("subnetIds", []),
-            "created_at": desc.get("createdAt").isoformat() if desc.get("createdAt") else None,
+            "created_at": desc.get("createdAt"),
             "endpoint_private_access": desc.get("resourcesVpcConfig", {}).get("endpointPrivateAccess", False),
             "endpoint_public_access": desc.get("resourcesVpcConfig", {}).get("endpointPublicAccess", False),
             "platform_version": desc.get("platformVersion"),
@@ -0,0 +1,69 @@
+# methods/aws/fanout.py
+#
+# AWS entry points to the generic engine in methods/fanout.py; each fan-out
+# also logs the shared boto3 client pool stats when it finishes.
+
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List
+
+from methods import fanout
+from methods.aws.auth import get_aws_client_pool_stats
+from methods.fanout import FANOUT_DEADLINE_SECONDS, REGION_TIMEOUT_SECONDS
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+def _log_pool_stats():
+    logger.info(f"♻️ AWS client pool: {get_aws_client_pool_stats()}")
+
+
+def scatter_gather(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Dict[str, Any]:
+    """methods.fanout.scatter_gather across AWS regions."""
+    result = fanout.scatter_gather(label, regions, fetch, region_timeout, deadline)
+    _log_pool_stats()
+    return result
+
+
+async def scatter_gather_async(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Dict[str, Any]:
+    """methods.fanout.scatter_gather_async across AWS regions."""
+    result = await fanout.scatter_gather_async(label, regions, fetch, region_timeout, deadline)
+    _log_pool_stats()
+    return result
+
+
+def scatter_gather_stream(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Iterator[Dict[str, Any]]:
+    """methods.fanout.scatter_gather_stream across AWS regions."""
+    yield from fanout.scatter_gather_stream(label, regions, fetch, region_timeout, deadline)
+    _log_pool_stats()
+
+
+async def scatter_gather_stream_async(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """methods.fanout.scatter_gather_stream_async across AWS regions."""
+    async for event in fanout.scatter_gather_stream_async(label, regions, fetch, region_timeout, deadline):
+        yield event
+    _log_pool_stats()
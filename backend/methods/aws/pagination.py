@@ -0,0 +1,150 @@
+# methods/aws/pagination.py
+
+import base64
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from botocore.paginate import TokenEncoder
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+# One page of transformed records plus the raw service token for the next page
+RegionPage = Tuple[List[Dict[str, Any]], Optional[str]]
+RegionPager = Callable[[str, Optional[str]], Iterator[RegionPage]]
+
+_token_encoder = TokenEncoder()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a `next_token` query parameter cannot be decoded."""
+
+
+def iter_pages(client, operation: str, token_key: str,
+               starting_token: Optional[str] = None, **kwargs) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+    """Yield (raw page, next raw token) from a botocore paginator.
+
+    `starting_token` is the raw service token (e.g. EC2 NextToken, RDS Marker)
+    a previous page returned; it is re-encoded into botocore's StartingToken.
+    """
+    config = {}
+    if starting_token:
+        config["StartingToken"] = _token_encoder.encode({token_key: starting_token})
+    paginator = client.get_paginator(operation)
+    for page in paginator.paginate(PaginationConfig=config, **kwargs):
+        yield page, page.get(token_key)
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str, kind: Optional[str] = None) -> Dict[str, Any]:
+    """Decode a `next_token`; with `kind`, reject cursors issued by another list."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise InvalidCursorError("Invalid next_token")
+    if not isinstance(state, dict) or "region" not in state:
+        raise InvalidCursorError("Invalid next_token")
+    if kind is not None and state.get("kind") != kind:
+        raise InvalidCursorError(f"next_token was not issued by the {kind} list")
+    return state
+
+
+def scope_fingerprint(regions: List[str], scope: str = "") -> str:
+    """Short hash of the sorted region list (plus other filters) a cursor walks."""
+    raw = json.dumps([sorted(regions), scope], separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def parse_limit(value: Optional[str]) -> Optional[int]:
+    """Parse the `limit` query parameter (None when absent)."""
+    if value in (None, ""):
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidCursorError("limit must be an integer")
+    if limit < 1:
+        raise InvalidCursorError("limit must be positive")
+    return min(limit, MAX_LIMIT)
+
+
+def collect_region_page(
+    kind: str,
+    regions: List[str],
+    pager: RegionPager,
+    limit: int,
+    next_token: Optional[str] = None,
+    scope: str = "",
+) -> Dict[str, Any]:
+    """Walk regions in name order and return at most `limit` records plus a cursor.
+
+    The opaque cursor encodes the region to resume in, the raw service token
+    of the page to re-request and how many records of that page were already
+    returned, so every call costs at most one extra page per region. It also
+    records `kind` and a fingerprint of `regions` and `scope` (other filters),
+    and a cursor replayed against a different list or selection is rejected
+    with InvalidCursorError instead of skipping or repeating regions.
+
+    A region that fails is skipped and reported in `failed_regions` (same
+    shape as the fan-out envelope), so a short page is never mistaken for
+    a complete one; a client can retry those regions with `regions=`.
+    """
+    # Resuming compares region names, so walk them sorted whatever order DescribeRegions used
+    regions = sorted(regions)
+    fingerprint = scope_fingerprint(regions, scope)
+    if next_token:
+        state = decode_cursor(next_token, kind)
+        if state.get("scope") != fingerprint:
+            raise InvalidCursorError("next_token was issued for a different regions= or filter selection")
+    else:
+        state = {"region": regions[0] if regions else None}
+    start_region = state["region"]
+
+    def cursor(region: str, token: Optional[str], skip: int) -> str:
+        return encode_cursor({"kind": kind, "scope": fingerprint, "region": region, "token": token, "skip": skip})
+    remaining = [r for r in regions if start_region is None or r >= start_region]
+
+    items: List[Dict[str, Any]] = []
+    failed: List[Dict[str, str]] = []
+    for index, region in enumerate(remaining):
+        resuming = region == start_region
+        page_token = state.get("token") if resuming else None
+        skip = state.get("skip", 0) if resuming else 0
+
+        try:
+            for records, page_next in pager(region, page_token):
+                records = records[skip:]
+                room = limit - len(items)
+                if len(records) > room:
+                    items.extend(records[:room])
+                    return {
+                        "items": items,
+                        "next_token": cursor(region, page_token, skip + room),
+                        "failed_regions": failed,
+                    }
+                items.extend(records)
+                page_token, skip = page_next, 0
+
+                if len(items) == limit:
+                    if page_next:
+                        resume = cursor(region, page_next, 0)
+                    elif index + 1 < len(remaining):
+                        resume = cursor(remaining[index + 1], None, 0)
+                    else:
+                        resume = None
+                    return {"items": items, "next_token": resume, "failed_regions": failed}
+        except Exception as e:
+            logger.warning(f"⚠️ Paged scan failed in {region}: {str(e)}", exc_info=True)
+            failed.append({"region": region, "error": str(e)})
+
+    return {"items": items, "next_token": None, "failed_regions": failed}
@@ -1,8 +1,14 @@
 # methods/aws/rds.py
 
-import concurrent.futures
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional
 from methods.aws.auth import get_aws_boto_client, is_running_in_azure
+from methods.async_support import run_blocking
+from methods.aws.batch import BatchId, chunked, fetch_batch_details
+from methods.aws.fanout import (
+    scatter_gather, scatter_gather_async, scatter_gather_stream, scatter_gather_stream_async,
+)
+from methods.aws.pagination import DEFAULT_LIMIT, RegionPage, collect_region_page, iter_pages
+from methods.aws.regions import get_scan_regions
 
 
 # Configure logging
@@ -10,6 +16,10 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Values per db-instance-id filter in one describe_db_instances call
+RDS_DESCRIBE_BATCH_SIZE = 100
+
+
 def get_aws_rds_client(region: str):
     """Return RDS client using OIDC in Azure, default AWS credentials elsewhere."""
     if is_running_in_azure():
@@ -20,19 +30,14 @@ def get_aws_rds_client(region: str):
         return get_aws_boto_client("rds", region=region)
 
 
-def _fetch_rds_instances_in_region(region: str) -> List[Dict[str, Any]]:
-    """For a single region, fetch its RDS instances WITHOUT heavy details."""
-    try:
-        rds = get_aws_rds_client(region)
-        logger.info(f"📍 Scanning RDS instances in {region}")
-
-        resp = rds.describe_db_instances()
-        instances = resp.get("DBInstances", [])
-        if not instances:
-            return []
+def _iter_rds_instance_pages(region: str, starting_token: Optional[str] = None) -> Iterator[RegionPage]:
+    """Yield (instances, next_token) for each describe_db_instances page in a region."""
+    rds = get_aws_rds_client(region)
+    logger.info(f"📍 Scanning RDS instances in {region}")
 
+    for page, next_token in iter_pages(rds, "describe_db_instances", "Marker", starting_token):
         # Minimal list view: no engine‑level schema info, no snapshots, etc.
-        return [
+        instances = [
             {
                 "db_instance_identifier": db["DBInstanceIdentifier"],
                 "db_instance_class": db["DBInstanceClass"],
@@ -41,48 +46,120 @@ def _fetch_rds_instances_in_region(region: str) -> List[Dict[str, Any]]:
                 "region": region,
                 "endpoint_address": db.get("Endpoint", {}).get("Address"),
                 "port": db.get("Endpoint", {}).get("Port"),
+                "tags": {tag["Key"]: tag["Value"] for tag in db.get("TagList", [])},
             }
-            for db in instances
+            for db in page.get("DBInstances", [])
         ]
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to list RDS instances in {region}: {str(e)}", exc_info=True)
-        return []
+        yield instances, next_token
 
 
-def list_all_rds_instances() -> List[Dict[str, Any]]:
-    """Lists all RDS instances across all AWS regions for the current account.
-    Optimized for fast list view."""
-    logger.info("🚀 list_all_rds_instances (FAST) START")
+def _fetch_rds_instances_in_region(region: str) -> List[Dict[str, Any]]:
+    """For a single region, fetch all its RDS instances WITHOUT heavy details."""
+    instances = []
+    for page, _ in _iter_rds_instance_pages(region):
+        instances.extend(page)
+    return instances
 
-    # Get all regions via EC2
-    ec2 = get_aws_boto_client("ec2")
-    try:
-        response = ec2.describe_regions()
-        regions = [r["RegionName"] for r in response["Regions"]]
-        logger.info(f"🌍 Found {len(regions)} AWS regions")
-    except Exception as e:
-        logger.error(f"❌ Failed to list AWS regions: {str(e)}", exc_info=True)
-        return []
 
-    all_instances: List[Dict[str, Any]] = []
+def list_all_rds_instances(regions: Optional[str] = None) -> Dict[str, Any]:
+    """Lists all RDS instances across all AWS regions for the current account.
+    Optimized for fast list view.
+    Returns the fan-out envelope (items + per-region status)."""
+    logger.info("🚀 list_all_rds_instances (FAST) START")
 
-    # Parallelize region calls for speed
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_region = {
-            executor.submit(_fetch_rds_instances_in_region, region): region
-            for region in regions
+    # Cached, opt-in/allow-list filtered regions, narrowed by `regions`
+    regions = get_scan_regions(regions)
+    logger.info(f"🌍 Scanning {len(regions)} AWS regions")
+
+    return scatter_gather("rds", regions, _fetch_rds_instances_in_region)
+
+
+async def list_all_rds_instances_async(regions: Optional[str] = None) -> Dict[str, Any]:
+    """asyncio variant of list_all_rds_instances (same envelope)."""
+    logger.info("🚀 list_all_rds_instances_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    return await scatter_gather_async("rds", regions, _fetch_rds_instances_in_region)
+
+
+def stream_all_rds_instances(regions: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """list_all_rds_instances as per-region events followed by a trailer (see scatter_gather_stream)."""
+    logger.info("🚀 stream_all_rds_instances START")
+    return scatter_gather_stream("rds", get_scan_regions(regions), _fetch_rds_instances_in_region)
+
+
+async def stream_all_rds_instances_async(regions: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """asyncio variant of stream_all_rds_instances (same events)."""
+    logger.info("🚀 stream_all_rds_instances_async START")
+    regions = await run_blocking(get_scan_regions, regions)
+    async for event in scatter_gather_stream_async("rds", regions, _fetch_rds_instances_in_region):
+        yield event
+
+
+def list_rds_instances_page(regions: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                            next_token: Optional[str] = None) -> Dict[str, Any]:
+    """One cursor-paginated page of RDS instances: {"items": [...], "next_token": ...}."""
+    logger.info(f"🚀 list_rds_instances_page START (limit={limit})")
+    return collect_region_page("rds", get_scan_regions(regions), _iter_rds_instance_pages, limit, next_token)
+
+
+def _build_rds_details(db: Dict[str, Any], region: str) -> Dict[str, Any]:
+    # 1️⃣ Core instance metadata
+    core = {
+        "db_instance_identifier": db["DBInstanceIdentifier"],
+        "db_instance_class": db["DBInstanceClass"],
+        "engine": db["Engine"],
+        "engine_version": db.get("EngineVersion"),
+        "status": db["DBInstanceStatus"],
+        "region": region,
+        "multi_az": db.get("MultiAZ", False),
+        "storage_type": db.get("StorageType"),
+        "allocated_storage_gb": db.get("AllocatedStorage"),
+        "storage_encrypted": db.get("StorageEncrypted", False),
+        "iam_database_authentication_enabled": db.get("IAMDatabaseAuthenticationEnabled", False),
+    }
+
+    # 2️⃣ Endpoint / network
+    endpoint = db.get("Endpoint", {})
+    networking = {
+        "address": endpoint.get("Address"),
+        "port": endpoint.get("Port"),
+        "hosted_zone_id": endpoint.get("HostedZoneId"),
+    }
+
+    # 3️⃣ VPC / subnet / security groups
+    vpc = {}
+    if "DBSubnetGroup" in db:
+        vpc = {
+            "db_subnet_group": db["DBSubnetGroup"]["DBSubnetGroupName"],
+            "vpc_id": db["DBSubnetGroup"].get("VpcId"),
+            "subnet_ids": [
+                sn["SubnetIdentifier"] for sn in db["DBSubnetGroup"].get("Subnets", [])
+            ],
+            "db_security_group_instances": [
+                sg["DBSecurityGroupName"] for sg in db.get("DBSecurityGroups", [])
+            ],
         }
 
-        for future in concurrent.futures.as_completed(future_to_region):
-            region = future_to_region[future]
-            try:
-                instances = future.result()
-                all_instances.extend(instances)
-            except Exception as e:
-                logger.warning(f"⚠️ Exception fetching RDS instances for {region}: {str(e)}", exc_info=True)
+    # 4️⃣ High‑level storage / performance
+    performance = {
+        "iops": db.get("Iops"),
+        "max_allocated_storage": db.get("MaxAllocatedStorage"),
+        "backup_retention_days": db.get("BackupRetentionPeriod"),
+        "preferred_backup_window": db.get("PreferredBackupWindow"),
+        "preferred_maintenance_window": db.get("PreferredMaintenanceWindow"),
+        "auto_minor_version_upgrade": db.get("AutoMinorVersionUpgrade", False),
+    }
 
-    logger.info(f"🎉 Found {len(all_instances)} RDS instances across {len(regions)} regions")
-    return all_instances
+    # 5️⃣ Tags
+    tags = {"tags": db.get("TagList", [])}
+
+    return {
+        "core": core,
+        "networking": networking,
+        "vpc": vpc,
+        "performance": performance,
+        "tags": tags,
+    }
 
 
 def get_rds_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
@@ -93,64 +170,7 @@ def get_rds_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
         rds = get_aws_rds_client(region)
         resp = rds.describe_db_instances(DBInstanceIdentifier=instance_id)
         db = resp["DBInstances"][0]  # assume exists; caller already has list
-
-        # 1️⃣ Core instance metadata
-        core = {
-            "db_instance_identifier": db["DBInstanceIdentifier"],
-            "db_instance_class": db["DBInstanceClass"],
-            "engine": db["Engine"],
-            "engine_version": db.get("EngineVersion"),
-            "status": db["DBInstanceStatus"],
-            "region": region,
-            "multi_az": db.get("MultiAZ", False),
-            "storage_type": db.get("StorageType"),
-            "allocated_storage_gb": db.get("AllocatedStorage"),
-            "storage_encrypted": db.get("StorageEncrypted", False),
-            "iam_database_authentication_enabled": db.get("IAMDatabaseAuthenticationEnabled", False),
-        }
-
-        # 2️⃣ Endpoint / network
-        endpoint = db.get("Endpoint", {})
-        networking = {
-            "address": endpoint.get("Address"),
-            "port": endpoint.get("Port"),
-            "hosted_zone_id": endpoint.get("HostedZoneId"),
-        }
-
-        # 3️⃣ VPC / subnet / security groups
-        vpc = {}
-        if "DBSubnetGroup" in db:
-            vpc = {
-                "db_subnet_group": db["DBSubnetGroup"]["DBSubnetGroupName"],
-                "vpc_id": db["DBSubnetGroup"].get("VpcId"),
-                "subnet_ids": [
-                    sn["SubnetIdentifier"] for sn in db["DBSubnetGroup"].get("Subnets", [])
-                ],
-                "db_security_group_instances": [
-                    sg["DBSecurityGroupName"] for sg in db.get("DBSecurityGroups", [])
-                ],
-            }
-
-        # 4️⃣ High‑level storage / performance
-        performance = {
-            "iops": db.get("Iops"),
-            "max_allocated_storage": db.get("MaxAllocatedStorage"),
-            "backup_retention_days": db.get("BackupRetentionPeriod"),
-            "preferred_backup_window": db.get("PreferredBackupWindow"),
-            "preferred_maintenance_window": db.get("PreferredMaintenanceWindow"),
-            "auto_minor_version_upgrade": db.get("AutoMinorVersionUpgrade", False),
-        }
-
-        # 5️⃣ Tags
-        tags = {"tags": db.get("TagList", [])}
-
-        return {
-            "core": core,
-            "networking": networking,
-            "vpc": vpc,
-            "performance": performance,
-            "tags": tags,
-        }
+        return _build_rds_details(db, region)
 
     except Exception as e:
         logger.error(f"💥 Failed to get RDS instance details for {instance_id} in {region}: {str(e)}", exc_info=True)
@@ -160,3 +180,21 @@ def get_rds_instance_details(instance_id: str, region: str) -> Dict[str, Any]:
             "region": region,
             "status": "Unknown",
         }
+
+
+def _describe_rds_instances_in_region(region: str, identifiers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Full details for many DB instances in one region via a db-instance-id filter."""
+    rds = get_aws_rds_client(region)
+    found = {}
+    for chunk in chunked(identifiers, RDS_DESCRIBE_BATCH_SIZE):
+        filters = [{"Name": "db-instance-id", "Values": chunk}]
+        for page, _ in iter_pages(rds, "describe_db_instances", "Marker", Filters=filters):
+            for db in page.get("DBInstances", []):
+                found[db["DBInstanceIdentifier"]] = _build_rds_details(db, region)
+    return found
+
+
+def get_rds_instance_details_batch(ids: List[BatchId]) -> Dict[str, Any]:
+    """Details for many (region, DB identifier) pairs: one describe_db_instances per region and chunk."""
+    logger.info(f"🔍 get_rds_instance_details_batch: {len(ids)} ids")
+    return fetch_batch_details("rds", ids, _describe_rds_instances_in_region)
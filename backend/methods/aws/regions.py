@@ -0,0 +1,82 @@
+# methods/aws/regions.py
+
+import os
+import threading
+import time
+from typing import List, Optional
+
+from methods.aws.auth import get_aws_boto_client
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+REGION_CACHE_TTL_SECONDS = int(os.environ.get("AWS_REGION_CACHE_TTL_SECONDS", "3600"))
+ENABLED_OPT_IN_STATUSES = ("opt-in-not-required", "opted-in")
+
+_lock = threading.Lock()
+_cached_regions: List[str] = []
+_cached_at = 0.0
+
+
+def _parse_region_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated region setting/parameter into clean names."""
+    if not value:
+        return []
+    return [r.strip() for r in value.split(",") if r.strip()]
+
+
+def _describe_enabled_regions() -> List[str]:
+    ec2 = get_aws_boto_client("ec2")
+    response = ec2.describe_regions(AllRegions=True)
+    return sorted(
+        r["RegionName"]
+        for r in response["Regions"]
+        if r.get("OptInStatus", "opt-in-not-required") in ENABLED_OPT_IN_STATUSES
+    )
+
+
+def get_account_regions() -> List[str]:
+    """Enabled regions for the account, cached for REGION_CACHE_TTL_SECONDS.
+
+    Falls back to the last known list if describe_regions fails after expiry.
+    """
+    global _cached_regions, _cached_at
+    with _lock:
+        if _cached_regions and time.monotonic() - _cached_at < REGION_CACHE_TTL_SECONDS:
+            return list(_cached_regions)
+        try:
+            _cached_regions = _describe_enabled_regions()
+            _cached_at = time.monotonic()
+            logger.info(f"🌍 Cached {len(_cached_regions)} enabled AWS regions")
+        except Exception as e:
+            if not _cached_regions:
+                raise
+            logger.warning(f"⚠️ describe_regions failed, serving cached regions: {str(e)}")
+        return list(_cached_regions)
+
+
+def get_scan_regions(requested: Optional[str] = None) -> List[str]:
+    """Regions a collector should scan.
+
+    Starts from the enabled account regions, applies the AWS_REGION_ALLOW_LIST
+    and AWS_REGION_DENY_LIST app settings, then narrows to the comma-separated
+    `requested` regions (the `regions=` query parameter) if given.
+    """
+    regions = get_account_regions()
+
+    allow = _parse_region_list(os.environ.get("AWS_REGION_ALLOW_LIST"))
+    deny = set(_parse_region_list(os.environ.get("AWS_REGION_DENY_LIST")))
+    if allow:
+        regions = [r for r in regions if r in allow]
+    regions = [r for r in regions if r not in deny]
+
+    wanted = _parse_region_list(requested)
+    if wanted:
+        unknown = [r for r in wanted if r not in regions]
+        if unknown:
+            logger.warning(f"⚠️ Ignoring regions not enabled/allowed: {unknown}")
+        regions = [r for r in regions if r in wanted]
+
+    return regions
@@ -1,16 +1,31 @@
 # methods/aws/s3.py
 
 import os
-import boto3
+import threading
+import concurrent.futures
 from botocore.exceptions import ClientError
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from methods.aws.auth import get_aws_boto_client, is_running_in_azure
+from methods.detail_sections import gather_sections
+from methods.metrics import in_request_context
+from methods.aws.pagination import DEFAULT_LIMIT, RegionPage, collect_region_page, iter_pages
 
 
 # Configure logging
 import logging
 logger = logging.getLogger(__name__)
 
+GLOBAL_SCOPE = "global"
+REGION_LOOKUP_WORKERS = int(os.environ.get("S3_REGION_LOOKUP_WORKERS", "16"))
+
+# GetBucketLocation still returns these legacy constraints for old buckets
+LEGACY_LOCATIONS = {"EU": "eu-west-1"}
+
+# Bucket name -> region; bucket regions are immutable so entries never expire
+_bucket_region_cache: Dict[str, str] = {}
+_bucket_region_lock = threading.Lock()
+_LOOKUP_FAILED = object()
+
 
 def safe_aws_call(s3_client, func_name: str, key: str, default: Any, **kwargs) -> Any:
     """Error handling wrapper for S3 API calls."""
@@ -34,56 +49,157 @@ def get_aws_s3_client():
         return get_aws_boto_client("s3")
     else:
         logger.info("💻 Running locally – using default AWS credentials (~/.aws/credentials) for S3")
-        return boto3.client("s3")
+        return get_aws_boto_client("s3")
 
 
-def get_s3_buckets_with_metadata() -> List[Dict[str, Any]]:
-    """Lists all S3 buckets."""
-    logger.info("📦 get_s3_buckets_with_metadata START")
-    s3_client = get_aws_s3_client()
+def _normalize_location(location: Optional[str]) -> str:
+    """Map a GetBucketLocation LocationConstraint to a region name."""
+    if not location:
+        return "us-east-1"
+    return LEGACY_LOCATIONS.get(location, location)
 
-    logger.info("🏠 Listing buckets...")
-    response = s3_client.list_buckets()
-    buckets = response.get("Buckets", [])
-    logger.info(f"✅ Found {len(buckets)} buckets")
 
-    bucket_metadata = []
-    for i, bucket in enumerate(buckets, 1):
-        name = bucket["Name"]
-        logger.info(f"📍 [{i}/{len(buckets)}] Processing: {name}")
+def _lookup_bucket_region(s3_client, name: str) -> Optional[str]:
+    """GetBucketLocation for one bucket; None if the call failed."""
+    location = safe_aws_call(
+        s3_client, "get_bucket_location", "LocationConstraint",
+        _LOOKUP_FAILED, Bucket=name
+    )
+    if location is _LOOKUP_FAILED:
+        return None
+    return _normalize_location(location)
+
+
+def _resolve_bucket_regions(s3_client, buckets: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Bucket name -> region, using BucketRegion, then the cache, then GetBucketLocation.
+
+    Bucket regions never change, so anything resolved here is remembered for
+    the life of the process. Missing names are looked up with bounded parallelism.
+    """
+    regions: Dict[str, str] = {}
+    missing: List[str] = []
+    with _bucket_region_lock:
+        for bucket in buckets:
+            name = bucket["Name"]
+            region = bucket.get("BucketRegion") or _bucket_region_cache.get(name)
+            if region:
+                regions[name] = region
+                _bucket_region_cache[name] = region
+            else:
+                missing.append(name)
+
+    if missing:
+        logger.info(f"🔎 Resolving {len(missing)} bucket regions via GetBucketLocation")
+        workers = min(REGION_LOOKUP_WORKERS, len(missing))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            resolved = dict(zip(missing, executor.map(in_request_context(lambda n: _lookup_bucket_region(s3_client, n)), missing)))
+        with _bucket_region_lock:
+            # Failed lookups are not cached so the next request retries them
+            _bucket_region_cache.update({n: r for n, r in resolved.items() if r})
+        regions.update({n: r or "us-east-1" for n, r in resolved.items()})
+
+    return regions
+
+
+def _iter_bucket_pages(scope: str, starting_token: Optional[str] = None,
+                       prefix: Optional[str] = None, region: Optional[str] = None) -> Iterator[RegionPage]:
+    """Yield (buckets, next_token) for each ListBuckets page.
+
+    S3 bucket listing is global, so `scope` is always GLOBAL_SCOPE; it only
+    exists to fit the per-region pager signature used for cursors.
+    """
+    s3_client = get_aws_s3_client()
 
-        region = safe_aws_call(
-            s3_client, "get_bucket_location", "LocationConstraint",
-            "us-east-1", Bucket=name
-        ) or "us-east-1"
+    filters = {}
+    if prefix:
+        filters["Prefix"] = prefix
+    if region:
+        filters["BucketRegion"] = region
+
+    for page, next_token in iter_pages(s3_client, "list_buckets", "ContinuationToken", starting_token, **filters):
+        buckets = page.get("Buckets", [])
+        logger.info(f"✅ Found {len(buckets)} buckets in page")
+
+        bucket_regions = _resolve_bucket_regions(s3_client, buckets)
+        bucket_metadata = [
+            {
+                "name": bucket["Name"],
+                "created": bucket["CreationDate"],
+                "region": bucket_regions[bucket["Name"]],
+            }
+            for bucket in buckets
+            if not region or bucket_regions[bucket["Name"]] == region
+        ]
+        yield bucket_metadata, next_token
+
+
+def get_s3_buckets_with_metadata(prefix: Optional[str] = None, region: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Lists all S3 buckets, optionally filtered by name prefix and region."""
+    logger.info("📦 get_s3_buckets_with_metadata START")
 
-        bucket_metadata.append({
-            "name": name,
-            "created": bucket["CreationDate"].isoformat(),
-            "region": region
-        })
+    bucket_metadata = []
+    for page, _ in _iter_bucket_pages(GLOBAL_SCOPE, prefix=prefix, region=region):
+        bucket_metadata.extend(page)
 
     logger.info(f"🎉 Returning {len(bucket_metadata)} buckets")
     return bucket_metadata
 
 
+def list_s3_buckets_page(limit: int = DEFAULT_LIMIT, next_token: Optional[str] = None,
+                         prefix: Optional[str] = None, region: Optional[str] = None) -> Dict[str, Any]:
+    """One cursor-paginated page of S3 buckets: {"items": [...], "next_token": ...}."""
+    logger.info(f"📦 list_s3_buckets_page START (limit={limit})")
+
+    def pager(scope: str, token: Optional[str]) -> Iterator[RegionPage]:
+        return _iter_bucket_pages(scope, token, prefix=prefix, region=region)
+
+    return collect_region_page("s3", [GLOBAL_SCOPE], pager, limit, next_token, scope=f"{prefix or ''}|{region or ''}")
+
+
+def _bucket_location(s3_client, bucket_name: str) -> Optional[str]:
+    with _bucket_region_lock:
+        cached = _bucket_region_cache.get(bucket_name)
+    if cached:
+        return cached
+    region = _lookup_bucket_region(s3_client, bucket_name)
+    if region:
+        with _bucket_region_lock:
+            _bucket_region_cache[bucket_name] = region
+    return region
+
+
 def get_s3_bucket_details(bucket_name: str) -> Dict[str, Any]:
-    """Get detailed info for specific S3 bucket."""
+    """Get detailed info for specific S3 bucket.
+
+    The per-bucket configuration calls are independent, so they run
+    concurrently; a section that is slow or fails comes back as None.
+    """
     logger.info(f"📋 get_s3_bucket_details: {bucket_name}")
     s3_client = get_aws_s3_client()
 
-    location = safe_aws_call(
-        s3_client, "get_bucket_location", "LocationConstraint",
-        "us-east-1", Bucket=bucket_name
-    )
-
-    policy = safe_aws_call(
-        s3_client, "get_bucket_policy", "Policy", None,
-        Bucket=bucket_name
-    )
-
+    sections, degraded = gather_sections(f"s3 {bucket_name}", {
+        "region": lambda: _bucket_location(s3_client, bucket_name),
+        "policy": lambda: safe_aws_call(
+            s3_client, "get_bucket_policy", "Policy", None, Bucket=bucket_name
+        ),
+        "versioning": lambda: safe_aws_call(
+            s3_client, "get_bucket_versioning", "Status", "Disabled", Bucket=bucket_name
+        ),
+        "encryption": lambda: safe_aws_call(
+            s3_client, "get_bucket_encryption", "ServerSideEncryptionConfiguration", None, Bucket=bucket_name
+        ),
+        "public_access_block": lambda: safe_aws_call(
+            s3_client, "get_public_access_block", "PublicAccessBlockConfiguration", None, Bucket=bucket_name
+        ),
+    })
+
+    encryption = sections["encryption"]
     return {
         "name": bucket_name,
-        "region": location or "us-east-1",
-        "policy_exists": policy is not None
+        "region": sections["region"],
+        "policy_exists": sections["policy"] is not None if "policy" not in degraded else None,
+        "versioning": sections["versioning"],
+        "encryption_rules": encryption.get("Rules", []) if encryption else None,
+        "public_access_block": sections["public_access_block"],
+        "degraded_sections": degraded,
     }
@@ -0,0 +1,272 @@
+# methods/azure/clients.py
+
+import os
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+import requests
+import azure.identity
+import azure.identity.aio
+import azure.mgmt.storage
+import azure.mgmt.storage.aio
+import azure.mgmt.web
+import azure.mgmt.web.aio
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+# azure-mgmt-resource 24+ no longer exports SubscriptionClient from azure.mgmt.resource
+from azure.mgmt.resource.subscriptions import SubscriptionClient
+
+from methods.metrics import azure_metrics_policies
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+AZURE_MAX_POOL_CONNECTIONS = int(os.environ.get("AZURE_MAX_POOL_CONNECTIONS", "25"))
+# Refresh a cached token this long before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = int(os.environ.get("AZURE_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+
+
+class _TokenStats:
+    """Token cache shared by the sync and async caching credentials."""
+
+    def __init__(self):
+        self._tokens: Dict[Tuple[str, ...], Any] = {}
+        self.stats = {"token_hits": 0, "token_misses": 0, "token_seconds": 0.0}
+
+    def lookup(self, scopes: Tuple[str, ...]):
+        token = self._tokens.get(scopes)
+        if token is not None and token.expires_on - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            self.stats["token_hits"] += 1
+            return token
+        return None
+
+    def store(self, scopes: Tuple[str, ...], token, elapsed: float):
+        self._tokens[scopes] = token
+        self.stats["token_misses"] += 1
+        self.stats["token_seconds"] += elapsed
+        logger.info(f"🔑 Azure token for {', '.join(scopes)} acquired in {elapsed * 1000:.0f}ms")
+
+
+class CachingCredential:
+    """Wraps a TokenCredential and reuses each scope's token until shortly before expiry."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self._cache = _TokenStats()
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs):
+        if kwargs.get("claims"):
+            # Claims challenges (CAE) must always reach the real credential
+            return self._inner.get_token(*scopes, **kwargs)
+        with self._lock:
+            token = self._cache.lookup(scopes)
+            if token is None:
+                started = time.monotonic()
+                token = self._inner.get_token(*scopes, **kwargs)
+                self._cache.store(scopes, token, time.monotonic() - started)
+            return token
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._cache.stats)
+
+
+class AsyncCachingCredential:
+    """asyncio counterpart of CachingCredential for the .aio management clients."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self._cache = _TokenStats()
+
+    async def get_token(self, *scopes: str, **kwargs):
+        if kwargs.get("claims"):
+            return await self._inner.get_token(*scopes, **kwargs)
+        token = self._cache.lookup(scopes)
+        if token is None:
+            started = time.monotonic()
+            token = await self._inner.get_token(*scopes, **kwargs)
+            self._cache.store(scopes, token, time.monotonic() - started)
+        return token
+
+    async def close(self):
+        await self._inner.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._cache.stats)
+
+
+_lock = threading.Lock()
+_credential: Optional[CachingCredential] = None
+_http_session: Optional[requests.Session] = None
+_clients: Dict[Tuple[str, str], Any] = {}
+_client_stats = {"client_hits": 0, "client_misses": 0, "async_client_hits": 0, "async_client_misses": 0}
+
+_async_lock = threading.Lock()
+_async_credential: Optional[AsyncCachingCredential] = None
+# aiohttp sessions and the .aio clients using them are bound to one event loop
+_aiohttp_sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+_async_clients: Dict[Tuple[str, str, asyncio.AbstractEventLoop], Any] = {}
+_closing = set()
+
+
+def get_azure_credential() -> CachingCredential:
+    """Process-wide DefaultAzureCredential with a per-scope token cache in front."""
+    global _credential
+    with _lock:
+        if _credential is None:
+            logger.info("🔐 Creating shared DefaultAzureCredential")
+            _credential = CachingCredential(azure.identity.DefaultAzureCredential())
+        return _credential
+
+
+def _get_http_session() -> requests.Session:
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=AZURE_MAX_POOL_CONNECTIONS, pool_maxsize=AZURE_MAX_POOL_CONNECTIONS
+        )
+        _http_session.mount("https://", adapter)
+    return _http_session
+
+
+def _get_client(kind: str, subscription_id: str, factory):
+    key = (kind, subscription_id)
+    credential = get_azure_credential()
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _client_stats["client_hits"] += 1
+            return client
+        _client_stats["client_misses"] += 1
+        logger.info(f"🔧 New Azure {kind} client for subscription {subscription_id}")
+        # Every client shares one requests session, so connections are pooled process-wide
+        transport = RequestsTransport(session=_get_http_session(), session_owner=False)
+        client = factory(credential, subscription_id, transport=transport, **azure_metrics_policies())
+        _clients[key] = client
+        return client
+
+
+def get_web_client(subscription_id: str) -> azure.mgmt.web.WebSiteManagementClient:
+    """Cached WebSiteManagementClient for a subscription."""
+    return _get_client("web", subscription_id, azure.mgmt.web.WebSiteManagementClient)
+
+
+def get_storage_client(subscription_id: str) -> azure.mgmt.storage.StorageManagementClient:
+    """Cached StorageManagementClient for a subscription."""
+    return _get_client("storage", subscription_id, azure.mgmt.storage.StorageManagementClient)
+
+
+def get_subscription_client() -> SubscriptionClient:
+    """Cached tenant-level SubscriptionClient."""
+    def factory(credential, _, **kwargs):
+        return SubscriptionClient(credential, **kwargs)
+    return _get_client("subscriptions", "*", factory)
+
+
+def _connection_stats() -> Dict[str, int]:
+    """New connections vs. requests across the shared urllib3 pools."""
+    opened = sent = 0
+    if _http_session is not None:
+        adapter = _http_session.get_adapter("https://")
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+    return {"connections_opened": opened, "requests_sent": sent}
+
+
+def get_azure_client_stats() -> Dict[str, Any]:
+    """Token, client and connection reuse counters for the sync Azure clients."""
+    with _lock:
+        stats = dict(_client_stats)
+        stats["clients"] = len(_clients)
+        stats["async_clients"] = len(_async_clients)
+        stats.update(_connection_stats())
+    if _credential is not None:
+        stats.update(_credential.stats())
+        stats["token_seconds"] = round(stats["token_seconds"], 3)
+    return stats
+
+
+def get_async_credential() -> AsyncCachingCredential:
+    """Process-wide azure.identity.aio.DefaultAzureCredential with a per-scope token cache."""
+    global _async_credential
+    with _async_lock:
+        if _async_credential is None:
+            _async_credential = AsyncCachingCredential(azure.identity.aio.DefaultAzureCredential())
+        return _async_credential
+
+
+def _drop_closed_loops(loop: asyncio.AbstractEventLoop):
+    """Forget clients of finished event loops and close their sessions on `loop` (caller holds _async_lock)."""
+    for key in [k for k in _async_clients if k[2].is_closed()]:
+        del _async_clients[key]
+    for old_loop in [l for l in _aiohttp_sessions if l.is_closed()]:
+        session = _aiohttp_sessions.pop(old_loop)
+        if not session.closed:
+            logger.info("🔌 Closing aiohttp session of a finished event loop")
+            task = loop.create_task(session.close())
+            # Keep a reference until it finishes
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+
+def get_async_transport():
+    """AioHttpTransport over the running event loop's shared aiohttp session.
+
+    The transport does not own the session, so closing a client leaves the
+    connection pool open for the next request on the same event loop.
+    Sessions of event loops that have since closed are closed here.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        _drop_closed_loops(loop)
+        session = _aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            logger.info("🔌 Creating shared aiohttp session for Azure clients")
+            session = _aiohttp_sessions[loop] = aiohttp.ClientSession()
+        return AioHttpTransport(session=session, session_owner=False)
+
+
+def _get_async_client(kind: str, subscription_id: str, factory):
+    """Cached .aio management client per (kind, subscription, event loop)."""
+    key = (kind, subscription_id, asyncio.get_running_loop())
+    with _async_lock:
+        client = _async_clients.get(key)
+    if client is not None:
+        with _lock:
+            _client_stats["async_client_hits"] += 1
+        return client
+    credential, transport = get_async_credential(), get_async_transport()
+    with _async_lock:
+        _drop_closed_loops(key[2])
+        client = _async_clients.get(key)
+        if client is None:
+            logger.info(f"🔧 New async Azure {kind} client for subscription {subscription_id}")
+            client = factory(credential, subscription_id, transport=transport, **azure_metrics_policies())
+            _async_clients[key] = client
+    with _lock:
+        _client_stats["async_client_misses"] += 1
+    return client
+
+
+def get_async_web_client(subscription_id: str) -> "azure.mgmt.web.aio.WebSiteManagementClient":
+    """Cached azure.mgmt.web.aio client for a subscription on the running event loop."""
+    return _get_async_client("web", subscription_id, azure.mgmt.web.aio.WebSiteManagementClient)
+
+
+def get_async_storage_client(subscription_id: str) -> "azure.mgmt.storage.aio.StorageManagementClient":
+    """Cached azure.mgmt.storage.aio client for a subscription on the running event loop."""
+    return _get_async_client("storage", subscription_id, azure.mgmt.storage.aio.StorageManagementClient)
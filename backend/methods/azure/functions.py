@@ -1,74 +1,206 @@
 # methods/azure/functions.py
 
+import asyncio
 import logging
-from typing import List, Dict, Any
-import azure.identity
-import azure.mgmt.web
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from methods.azure.clients import get_async_web_client, get_azure_client_stats, get_web_client
+from methods.detail_sections import (
+    DETAIL_REQUIRED_TIMEOUT_SECONDS, DETAIL_SECTION_TIMEOUT_SECONDS, gather_sections, gather_sections_async,
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-operation limits for the sync detail sections. gather_sections cannot
+# stop a running thread, so azure-core must end the call itself: `timeout`
+# caps the operation including retries, `read_timeout` each socket read.
+# The site itself is required, so it gets the longer required-section limit.
+DETAIL_CALL_OPTIONS = {"timeout": DETAIL_SECTION_TIMEOUT_SECONDS, "read_timeout": DETAIL_SECTION_TIMEOUT_SECONDS}
+REQUIRED_CALL_OPTIONS = {"timeout": DETAIL_REQUIRED_TIMEOUT_SECONDS, "read_timeout": DETAIL_REQUIRED_TIMEOUT_SECONDS}
+
+
+def _to_function_app_record(app) -> Optional[Dict[str, Any]]:
+    """List-view record for a site, or None if it is not a Function App."""
+    # 🛡️ Basic safety checks
+    if not app or not hasattr(app, 'name'):
+        return None
+
+    app_name = app.name
+    logger.debug(f"🔍 Checking: {app_name}")
+
+    # 🎯 CORRECT Function App Detection (3 methods)
+    is_function_app = False
+
+    # Method 1: Classic Function App
+    if (hasattr(app, 'site_config') and app.site_config and
+        hasattr(app.site_config, 'app_settings') and app.site_config.app_settings and
+        "FUNCTIONS_EXTENSION_VERSION" in app.site_config.app_settings):
+        is_function_app = True
+        logger.debug(f"  ✅ {app_name}: Classic Function App")
+
+    # Method 2: Function indicators (storage, worker runtime)
+    elif (hasattr(app, 'site_config') and app.site_config and
+          hasattr(app.site_config, 'app_settings') and app.site_config.app_settings):
+        settings = app.site_config.app_settings
+        function_indicators = ["AzureWebJobsStorage", "FUNCTIONS_WORKER_RUNTIME"]
+        if any(indicator in settings for indicator in function_indicators):
+            is_function_app = True
+            logger.debug(f"  ✅ {app_name}: Function by indicators")
+
+    # Method 3: Kind contains 'functionapp'
+    if not is_function_app and hasattr(app, 'kind') and app.kind:
+        if 'functionapp' in app.kind.lower():
+            is_function_app = True
+            logger.debug(f"  ✅ {app_name}: Function by kind='{app.kind}'")
+
+    if not is_function_app:
+        return None
+
+    parts = app.id.split("/") if hasattr(app, 'id') and app.id else []
+    resource_group = parts[4] if len(parts) > 4 else "unknown"
+
+    logger.info(f"🎉 ADDED: {app_name} ({app.kind or 'unknown'})")
+    return {
+        "name": app_name,
+        "location": getattr(app, 'location', 'unknown'),
+        "kind": getattr(app, 'kind', 'unknown'),
+        "resource_group": resource_group,
+        "id": getattr(app, 'id', ''),
+        "state": getattr(app, 'state', None) or 'Unknown',
+        "tags": dict(getattr(app, 'tags', None) or {}),
+    }
+
+
 def get_azure_functions_with_metadata(subscription_id: str) -> List[Dict[str, Any]]:
     """Fetch ALL Azure Function Apps (including Static Web Apps) in subscription."""
     logger.info(f"🪄 Fetching Azure Functions for subscription: {subscription_id}")
     try:
-        credential = azure.identity.DefaultAzureCredential()
-        client = azure.mgmt.web.WebSiteManagementClient(credential, subscription_id)
+        client = get_web_client(subscription_id)
 
         apps = []
         for app in client.web_apps.list():
-            # 🛡️ Basic safety checks
-            if not app or not hasattr(app, 'name'):
-                continue
-                
-            app_name = app.name
-            logger.debug(f"🔍 Checking: {app_name}")
-
-            # 🎯 CORRECT Function App Detection (3 methods)
-            is_function_app = False
-            
-            # Method 1: Classic Function App
-            if (hasattr(app, 'site_config') and app.site_config and 
-                hasattr(app.site_config, 'app_settings') and app.site_config.app_settings and
-                "FUNCTIONS_EXTENSION_VERSION" in app.site_config.app_settings):
-                is_function_app = True
-                logger.debug(f"  ✅ {app_name}: Classic Function App")
-            
-            # Method 2: Function indicators (storage, worker runtime)
-            elif (hasattr(app, 'site_config') and app.site_config and 
-                  hasattr(app.site_config, 'app_settings') and app.site_config.app_settings):
-                settings = app.site_config.app_settings
-                function_indicators = ["AzureWebJobsStorage", "FUNCTIONS_WORKER_RUNTIME"]
-                if any(indicator in settings for indicator in function_indicators):
-                    is_function_app = True
-                    logger.debug(f"  ✅ {app_name}: Function by indicators")
-            
-            # Method 3: Kind contains 'functionapp'
-            if not is_function_app and hasattr(app, 'kind') and app.kind:
-                if 'functionapp' in app.kind.lower():
-                    is_function_app = True
-                    logger.debug(f"  ✅ {app_name}: Function by kind='{app.kind}'")
-
-            if is_function_app:
-                parts = app.id.split("/") if hasattr(app, 'id') and app.id else []
-                resource_group = parts[4] if len(parts) > 4 else "unknown"
-
-                apps.append({
-                    "name": app_name,
-                    "location": getattr(app, 'location', 'unknown'),
-                    "kind": getattr(app, 'kind', 'unknown'),
-                    "resource_group": resource_group,
-                    "id": getattr(app, 'id', ''),
-                    "state": str(getattr(app, 'state', 'Unknown')),
-                })
-                logger.info(f"🎉 ADDED: {app_name} ({app.kind or 'unknown'})")
+            record = _to_function_app_record(app)
+            if record:
+                apps.append(record)
 
         logger.info(f"✅ Found {len(apps)} Function Apps total")
+        logger.info(f"♻️ Azure clients: {get_azure_client_stats()}")
         return apps
 
     except Exception as e:
         logger.error(f"💥 Error: {str(e)}", exc_info=True)
         raise
 
+
+async def get_azure_functions_with_metadata_async(subscription_id: str) -> List[Dict[str, Any]]:
+    """asyncio variant of get_azure_functions_with_metadata using azure.mgmt.web.aio."""
+    logger.info(f"🪄 Fetching Azure Functions (async) for subscription: {subscription_id}")
+    try:
+        client = get_async_web_client(subscription_id)
+        apps = []
+        async for app in client.web_apps.list():
+            record = _to_function_app_record(app)
+            if record:
+                apps.append(record)
+
+        logger.info(f"✅ Found {len(apps)} Function Apps total")
+        return apps
+
+    except Exception as e:
+        logger.error(f"💥 Error: {str(e)}", exc_info=True)
+        raise
+
+
+def _build_function_details(app, app_settings: Optional[Dict[str, str]], resource_group: str,
+                            function_app_name: str, site_config: Optional[Dict[str, Any]] = None,
+                            plan_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get_enum_value(attr) -> str:
+        return getattr(attr, "value", str(attr)) if attr else "Unknown"
+
+    # Plan details (if linked to an App Service Plan)
+    plan = None
+    if getattr(app, 'server_farm_id', None):
+        plan_parts = app.server_farm_id.split("/")
+        plan_name = plan_parts[-1] if plan_parts else None
+        plan = {
+            "name": plan_name,
+            "id": getattr(app, 'server_farm_id', ''),
+            **(plan_details or {}),
+        }
+
+    return {
+        "name": getattr(app, 'name', function_app_name),
+        "location": getattr(app, 'location', 'unknown'),
+        "kind": getattr(app, 'kind', 'unknown'),
+        "state": get_enum_value(getattr(app, 'state', None)),
+        "resource_group": resource_group,
+        "id": getattr(app, 'id', ''),
+        "host_names": list(getattr(app, 'host_names', [])),
+        "enabled": getattr(app, 'enabled', False),
+        "https_only": getattr(app, 'https_only', False),
+        "app_service_plan": plan,
+        "sku": getattr(app, 'sku', {}),
+        "app_settings": app_settings,
+        "site_config": site_config,
+        "tags": dict(getattr(app, 'tags', {})),
+    }
+
+
+def _settings_to_dict(settings) -> Dict[str, str]:
+    return {s.name: s.value for s in settings.properties} if settings and settings.properties else {}
+
+
+def _site_config_to_dict(config) -> Dict[str, Any]:
+    return {
+        "linux_fx_version": getattr(config, 'linux_fx_version', None),
+        "always_on": getattr(config, 'always_on', None),
+        "http20_enabled": getattr(config, 'http20_enabled', None),
+        "min_tls_version": getattr(config, 'min_tls_version', None),
+        "ftps_state": getattr(config, 'ftps_state', None),
+        "function_app_scale_limit": getattr(config, 'function_app_scale_limit', None),
+    }
+
+
+def _plan_ref(app) -> Optional[Tuple[str, str]]:
+    """(resource group, plan name) from the site's server_farm_id."""
+    parts = (getattr(app, 'server_farm_id', None) or "").split("/")
+    return (parts[4], parts[-1]) if len(parts) > 8 else None
+
+
+def _plan_to_dict(plan) -> Dict[str, Any]:
+    sku = getattr(plan, 'sku', None)
+    return {
+        "sku_name": getattr(sku, 'name', None),
+        "sku_tier": getattr(sku, 'tier', None),
+        "workers": getattr(plan, 'number_of_workers', None),
+        "kind": getattr(plan, 'kind', None),
+    }
+
+
+class _Once:
+    """Run a call at most once; concurrent callers share its result or its exception."""
+
+    def __init__(self, fn):
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._done = False
+        self._value = None
+        self._error: Optional[BaseException] = None
+
+    def __call__(self):
+        with self._lock:
+            if not self._done:
+                try:
+                    self._value = self._fn()
+                except Exception as e:
+                    self._error = e
+                self._done = True
+            if self._error is not None:
+                raise self._error
+            return self._value
+
+
 def get_azure_function_details(
     subscription_id: str, resource_group: str, function_app_name: str
 ) -> Dict[str, Any]:
@@ -77,51 +209,86 @@ def get_azure_function_details(
         f"📋 Fetching details for Azure Function App: {function_app_name} in RG={resource_group}"
     )
     try:
-        credential = azure.identity.DefaultAzureCredential()
-        client = azure.mgmt.web.WebSiteManagementClient(
-            credential, subscription_id
+        client = get_web_client(subscription_id)
+        get_app = _Once(lambda: client.web_apps.get(resource_group, function_app_name, **REQUIRED_CALL_OPTIONS))
+
+        def get_plan():
+            ref = _plan_ref(get_app())
+            return _plan_to_dict(client.app_service_plans.get(*ref, **DETAIL_CALL_OPTIONS)) if ref else None
+
+        # The plan lookup needs server_farm_id, so it waits on the site; the rest are independent
+        sections, degraded = gather_sections(f"function {function_app_name}", {
+            "app": get_app,
+            "app_settings": lambda: _settings_to_dict(
+                client.web_apps.list_application_settings(resource_group, function_app_name, **DETAIL_CALL_OPTIONS)
+            ),
+            "site_config": lambda: _site_config_to_dict(
+                client.web_apps.get_configuration(resource_group, function_app_name, **DETAIL_CALL_OPTIONS)
+            ),
+            "plan": get_plan,
+        }, required=("app",))
+        logger.debug(f"App properties retrieved: {sections['app'].name}")
+
+        details = _build_function_details(
+            sections["app"], sections["app_settings"], resource_group, function_app_name,
+            site_config=sections["site_config"], plan_details=sections["plan"],
         )
+        details["degraded_sections"] = degraded
 
-        app = client.web_apps.get(resource_group, function_app_name)
-        logger.debug(f"App properties retrieved: {app.name}")
+        logger.info(
+            f"✅ Details fetched successfully for Function App: {function_app_name}"
+        )
+        return details
 
-        def get_enum_value(attr) -> str:
-            return getattr(attr, "value", str(attr)) if attr else "Unknown"
+    except Exception as e:
+        logger.error(
+            f"💥 Failed to fetch details for {function_app_name} (RG={resource_group}): {str(e)}",
+            exc_info=True,
+        )
+        raise
+
+
+async def get_azure_function_details_async(
+    subscription_id: str, resource_group: str, function_app_name: str
+) -> Dict[str, Any]:
+    """asyncio variant of get_azure_function_details using azure.mgmt.web.aio."""
+    logger.info(
+        f"📋 Fetching details (async) for Azure Function App: {function_app_name} in RG={resource_group}"
+    )
+    try:
+        client = get_async_web_client(subscription_id)
+        app_task = asyncio.ensure_future(client.web_apps.get(resource_group, function_app_name))
 
-        # 🛡️ Safe app settings retrieval
-        try:
-            settings = client.web_apps.list_application_settings(
-                resource_group, function_app_name
+        async def get_app():
+            return await app_task
+
+        async def get_settings():
+            return _settings_to_dict(
+                await client.web_apps.list_application_settings(resource_group, function_app_name)
             )
-            app_settings = {s.name: s.value for s in settings.properties} if settings and settings.properties else {}
-        except:
-            app_settings = {}
-
-        # Plan details (if linked to an App Service Plan)
-        plan = None
-        if getattr(app, 'server_farm_id', None):
-            plan_parts = app.server_farm_id.split("/")
-            plan_name = plan_parts[-1] if plan_parts else None
-            plan = {
-                "name": plan_name,
-                "id": getattr(app, 'server_farm_id', ''),
-            }
-
-        details = {
-            "name": getattr(app, 'name', function_app_name),
-            "location": getattr(app, 'location', 'unknown'),
-            "kind": getattr(app, 'kind', 'unknown'),
-            "state": get_enum_value(getattr(app, 'state', None)),
-            "resource_group": resource_group,
-            "id": getattr(app, 'id', ''),
-            "host_names": list(getattr(app, 'host_names', [])),
-            "enabled": getattr(app, 'enabled', False),
-            "https_only": getattr(app, 'https_only', False),
-            "app_service_plan": plan,
-            "sku": getattr(app, 'sku', {}),
-            "app_settings": app_settings,
-            "tags": dict(getattr(app, 'tags', {})),
-        }
+
+        async def get_site_config():
+            return _site_config_to_dict(
+                await client.web_apps.get_configuration(resource_group, function_app_name)
+            )
+
+        async def get_plan():
+            # shield: a plan timeout must not cancel the shared site request
+            ref = _plan_ref(await asyncio.shield(app_task))
+            return _plan_to_dict(await client.app_service_plans.get(*ref)) if ref else None
+
+        sections, degraded = await gather_sections_async(f"function {function_app_name}", {
+            "app": get_app,
+            "app_settings": get_settings,
+            "site_config": get_site_config,
+            "plan": get_plan,
+        }, required=("app",))
+
+        details = _build_function_details(
+            sections["app"], sections["app_settings"], resource_group, function_app_name,
+            site_config=sections["site_config"], plan_details=sections["plan"],
+        )
+        details["degraded_sections"] = degraded
 
         logger.info(
             f"✅ Details fetched successfully for Function App: {function_app_name}"
@@ -2,36 +2,61 @@
 
 import logging
 from typing import List, Dict, Any
-import azure.identity
-import azure.mgmt.storage
+
+from methods.azure.clients import get_async_storage_client, get_azure_client_stats, get_storage_client
 
 
 logger = logging.getLogger(__name__)
 
 
+def _to_storage_account_record(account) -> Dict[str, Any]:
+    parts = account.id.split("/")
+    resource_group = parts[4] if len(parts) > 4 else "unknown"
+
+    logger.debug(f"Account found: {account.name} in RG={resource_group}")
+    return {
+        "name": account.name,
+        "location": account.location,
+        "sku": account.sku.name,
+        "kind": account.kind,
+        "resource_group": resource_group,
+        "id": account.id,
+        "tags": dict(account.tags) if account.tags else {},
+    }
+
+
 def get_azure_storage_accounts_with_metadata(subscription_id: str) -> List[Dict[str, Any]]:
     """Fetch metadata for all Azure Storage accounts in a subscription."""
     logger.info(f"📦 Fetching Azure Storage accounts for subscription: {subscription_id}")
     try:
-        credential = azure.identity.DefaultAzureCredential()
-        storage_client = azure.mgmt.storage.StorageManagementClient(
-            credential, subscription_id
+        storage_client = get_storage_client(subscription_id)
+
+        accounts = [
+            _to_storage_account_record(account)
+            for account in storage_client.storage_accounts.list()
+        ]
+
+        logger.info(f"✅ Total accounts fetched: {len(accounts)}")
+        logger.info(f"♻️ Azure clients: {get_azure_client_stats()}")
+        return accounts
+
+    except Exception as e:
+        logger.error(
+            f"💥 Failed to fetch storage accounts for {subscription_id}: {str(e)}",
+            exc_info=True,
         )
+        raise
 
-        accounts = []
-        for account in storage_client.storage_accounts.list():
-            parts = account.id.split("/")
-            resource_group = parts[4] if len(parts) > 4 else "unknown"
-
-            logger.debug(f"Account found: {account.name} in RG={resource_group}")
-            accounts.append({
-                "name": account.name,
-                "location": account.location,
-                "sku": account.sku.name,
-                "kind": account.kind,
-                "resource_group": resource_group,
-                "id": account.id,
-            })
+
+async def get_azure_storage_accounts_with_metadata_async(subscription_id: str) -> List[Dict[str, Any]]:
+    """asyncio variant of get_azure_storage_accounts_with_metadata using azure.mgmt.storage.aio."""
+    logger.info(f"📦 Fetching Azure Storage accounts (async) for subscription: {subscription_id}")
+    try:
+        storage_client = get_async_storage_client(subscription_id)
+        accounts = [
+            _to_storage_account_record(account)
+            async for account in storage_client.storage_accounts.list()
+        ]
 
         logger.info(f"✅ Total accounts fetched: {len(accounts)}")
         return accounts
@@ -44,6 +69,28 @@ def get_azure_storage_accounts_with_metadata(subscription_id: str) -> List[Dict[
         raise
 
 
+def _build_storage_details(account) -> Dict[str, Any]:
+    def get_enum_value(attr) -> str:
+        return getattr(attr, "value", attr) if attr else None
+
+    return {
+        "name": account.name,
+        "location": account.location,
+        "sku": account.sku.name,
+        "kind": account.kind,
+        "status": get_enum_value(account.status_of_primary),
+        "access_tier": get_enum_value(account.access_tier),
+        "endpoints": {
+            "blob": account.primary_endpoints.blob,
+            "file": account.primary_endpoints.file,
+            "queue": account.primary_endpoints.queue,
+            "table": account.primary_endpoints.table,
+        },
+        "encryption": account.encryption.as_dict() if account.encryption else None,
+        "tags": dict(account.tags) if account.tags else {},
+    }
+
+
 def get_azure_storage_details(
     subscription_id: str, resource_group: str, account_name: str
 ) -> Dict[str, Any]:
@@ -52,35 +99,42 @@ def get_azure_storage_details(
         f"📋 Fetching details for storage account: {account_name} in RG={resource_group}"
     )
     try:
-        credential = azure.identity.DefaultAzureCredential()
-        client = azure.mgmt.storage.StorageManagementClient(
-            credential, subscription_id
-        )
+        client = get_storage_client(subscription_id)
 
         account = client.storage_accounts.get_properties(
             resource_group_name=resource_group, account_name=account_name
         )
         logger.debug(f"Properties retrieved for account: {account.name}")
 
-        def get_enum_value(attr) -> str:
-            return getattr(attr, "value", attr) if attr else None
-
-        details = {
-            "name": account.name,
-            "location": account.location,
-            "sku": account.sku.name,
-            "kind": account.kind,
-            "status": get_enum_value(account.status_of_primary),
-            "access_tier": get_enum_value(account.access_tier),
-            "endpoints": {
-                "blob": account.primary_endpoints.blob,
-                "file": account.primary_endpoints.file,
-                "queue": account.primary_endpoints.queue,
-                "table": account.primary_endpoints.table,
-            },
-            "encryption": account.encryption.as_dict() if account.encryption else None,
-            "tags": dict(account.tags) if account.tags else {},
-        }
+        details = _build_storage_details(account)
+
+        logger.info(
+            f"✅ Details fetched successfully for account: {account_name}"
+        )
+        return details
+
+    except Exception as e:
+        logger.error(
+            f"💥 Failed to fetch details for {account_name} (RG={resource_group}): {str(e)}",
+            exc_info=True,
+        )
+        raise
+
+
+async def get_azure_storage_details_async(
+    subscription_id: str, resource_group: str, account_name: str
+) -> Dict[str, Any]:
+    """asyncio variant of get_azure_storage_details using azure.mgmt.storage.aio."""
+    logger.info(
+        f"📋 Fetching details (async) for storage account: {account_name} in RG={resource_group}"
+    )
+    try:
+        client = get_async_storage_client(subscription_id)
+        account = await client.storage_accounts.get_properties(
+            resource_group_name=resource_group, account_name=account_name
+        )
+
+        details = _build_storage_details(account)
 
         logger.info(
             f"✅ Details fetched successfully for account: {account_name}"
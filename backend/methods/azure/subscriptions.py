@@ -0,0 +1,110 @@
+# methods/azure/subscriptions.py
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from methods.async_support import run_blocking
+from methods.fanout import scatter_gather, scatter_gather_async
+from methods.azure.clients import get_subscription_client
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+SUBSCRIPTION_CACHE_TTL_SECONDS = int(os.environ.get("AZURE_SUBSCRIPTION_CACHE_TTL_SECONDS", "3600"))
+SUBSCRIPTION_TIMEOUT_SECONDS = float(os.environ.get("AZURE_SUBSCRIPTION_TIMEOUT_SECONDS", "20"))
+SUBSCRIPTION_DEADLINE_SECONDS = float(os.environ.get("AZURE_SUBSCRIPTION_DEADLINE_SECONDS", "45"))
+ALL_SUBSCRIPTIONS = "*"
+
+_lock = threading.Lock()
+_cached_subscriptions: List[str] = []
+_cached_at = 0.0
+
+
+def is_multi_subscription(value: str) -> bool:
+    """True for `subscription_id=*` or a comma-separated list."""
+    return value.strip() == ALL_SUBSCRIPTIONS or "," in value
+
+
+def _list_enabled_subscriptions() -> List[str]:
+    client = get_subscription_client()
+    return sorted(
+        sub.subscription_id
+        for sub in client.subscriptions.list()
+        if str(getattr(sub.state, "value", sub.state)) == "Enabled"
+    )
+
+
+def get_tenant_subscriptions() -> List[str]:
+    """Enabled subscriptions visible to the credential, cached for SUBSCRIPTION_CACHE_TTL_SECONDS."""
+    global _cached_subscriptions, _cached_at
+    with _lock:
+        if _cached_subscriptions and time.monotonic() - _cached_at < SUBSCRIPTION_CACHE_TTL_SECONDS:
+            return list(_cached_subscriptions)
+        try:
+            _cached_subscriptions = _list_enabled_subscriptions()
+            _cached_at = time.monotonic()
+            logger.info(f"🔑 Cached {len(_cached_subscriptions)} enabled Azure subscriptions")
+        except Exception as e:
+            if not _cached_subscriptions:
+                raise
+            logger.warning(f"⚠️ Subscription listing failed, serving cached list: {str(e)}")
+        return list(_cached_subscriptions)
+
+
+def resolve_subscriptions(value: str) -> List[str]:
+    """`*` -> every enabled subscription; otherwise the comma-separated ids, de-duplicated."""
+    if value.strip() == ALL_SUBSCRIPTIONS:
+        return get_tenant_subscriptions()
+    return list(dict.fromkeys(s.strip() for s in value.split(",") if s.strip()))
+
+
+def _tagged(fetch: Callable[[str], List[Dict[str, Any]]]) -> Callable[[str], List[Dict[str, Any]]]:
+    def fetch_subscription(subscription_id: str) -> List[Dict[str, Any]]:
+        return [{**item, "subscription_id": subscription_id} for item in fetch(subscription_id)]
+    return fetch_subscription
+
+
+def _subscription_envelope(fan: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename the fan-out envelope's region fields for subscriptions."""
+    return {
+        "items": fan["items"],
+        "completed_subscriptions": fan["completed_regions"],
+        "failed_subscriptions": [
+            {"subscription_id": f["region"], "error": f["error"]} for f in fan["failed_regions"]
+        ],
+        "timed_out_subscriptions": fan["timed_out_regions"],
+        "subscription_timings": fan["region_timings"],
+        "duration_seconds": fan["duration_seconds"],
+    }
+
+
+def scan_subscriptions(label: str, subscriptions: str,
+                       fetch: Callable[[str], List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Run a per-subscription collector across many subscriptions concurrently.
+
+    Each item carries `subscription_id`; a subscription that fails or runs
+    past AZURE_SUBSCRIPTION_TIMEOUT_SECONDS is reported on its own.
+    """
+    subscription_ids = resolve_subscriptions(subscriptions)
+    logger.info(f"🌐 Scanning {label} across {len(subscription_ids)} subscriptions")
+    fan = scatter_gather(
+        label, subscription_ids, _tagged(fetch),
+        region_timeout=SUBSCRIPTION_TIMEOUT_SECONDS, deadline=SUBSCRIPTION_DEADLINE_SECONDS,
+    )
+    return _subscription_envelope(fan)
+
+
+async def scan_subscriptions_async(label: str, subscriptions: str,
+                                   fetch: Callable[[str], List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """asyncio variant of scan_subscriptions (same envelope)."""
+    subscription_ids = await run_blocking(resolve_subscriptions, subscriptions)
+    logger.info(f"🌐 Scanning {label} (async) across {len(subscription_ids)} subscriptions")
+    fan = await scatter_gather_async(
+        label, subscription_ids, _tagged(fetch),
+        region_timeout=SUBSCRIPTION_TIMEOUT_SECONDS, deadline=SUBSCRIPTION_DEADLINE_SECONDS,
+    )
+    return _subscription_envelope(fan)
@@ -0,0 +1,266 @@
+# methods/cache.py
+
+import os
+import asyncio
+import threading
+import time
+import concurrent.futures
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+INVENTORY_FRESH_TTL_SECONDS = int(os.environ.get("INVENTORY_FRESH_TTL_SECONDS", "60"))
+INVENTORY_STALE_TTL_SECONDS = int(os.environ.get("INVENTORY_STALE_TTL_SECONDS", "900"))
+# Scopes come from request parameters, so the number of keys is capped (LRU)
+INVENTORY_CACHE_MAX_ENTRIES = int(os.environ.get("INVENTORY_CACHE_MAX_ENTRIES", "256"))
+
+# (provider, resource type, account/subscription, region/filter scope)
+CacheKey = Tuple[str, str, str, str]
+
+
+class InventoryCache:
+    """Stale-while-revalidate snapshot cache for list endpoints.
+
+    Entries younger than `fresh_ttl` are served as-is. Entries younger than
+    `stale_ttl` are served immediately while one background refresh per key
+    runs. Older or missing entries are loaded inline, single-flight per key;
+    forced refreshes that queue behind the same load share its result.
+    """
+
+    def __init__(self, fresh_ttl: int = INVENTORY_FRESH_TTL_SECONDS,
+                 stale_ttl: int = INVENTORY_STALE_TTL_SECONDS, max_workers: int = 4,
+                 max_entries: int = INVENTORY_CACHE_MAX_ENTRIES):
+        self._fresh_ttl = fresh_ttl
+        self._stale_ttl = max(stale_ttl, fresh_ttl)
+        self._max_entries = max(max_entries, 1)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._key_locks: Dict[CacheKey, threading.Lock] = {}
+        self._refreshing = set()
+        self._async_loads: Dict[CacheKey, Tuple[asyncio.Future, float]] = {}
+        self._background_tasks = set()
+        self._listeners: List[Callable[[CacheKey, Any], None]] = []
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inventory-refresh"
+        )
+
+    def _key_lock(self, key: CacheKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _store(self, key: CacheKey, data: Any, started: float) -> Dict[str, Any]:
+        entry = {
+            "data": data,
+            "generated_at": datetime.now(timezone.utc),
+            "started_at": started,
+            "stored_at": time.monotonic(),
+        }
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current["started_at"] > started:
+                # Overlapping async loads: never replace data gathered by a later one
+                return current
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+        logger.info(f"🗃️ Cached {key} in {time.monotonic() - started:.2f}s")
+        for listener in self._listeners:
+            try:
+                listener(key, data)
+            except Exception as e:
+                logger.warning(f"⚠️ Inventory listener failed for {key}: {str(e)}")
+        return entry
+
+    def _evict(self):
+        """Drop least recently used entries over the cap, with their key locks (caller holds _lock)."""
+        while len(self._entries) > self._max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self._key_locks.pop(key, None)
+        if len(self._key_locks) > 2 * self._max_entries:
+            # Locks of keys whose loads failed never got an entry
+            for key in [k for k, lock in self._key_locks.items() if k not in self._entries and not lock.locked()]:
+                del self._key_locks[key]
+
+    def subscribe(self, listener: Callable[[CacheKey, Any], None]):
+        """Call `listener(key, data)` after every successful load (e.g. to update an index)."""
+        self._listeners.append(listener)
+
+    def _load(self, key: CacheKey, loader: Callable[[], Any]) -> Dict[str, Any]:
+        started = time.monotonic()
+        return self._store(key, loader(), started)
+
+    def _refresh_in_background(self, key: CacheKey, loader: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                with self._key_lock(key):
+                    self._load(key, loader)
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh failed for {key}: {str(e)}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+
+    def _classify(self, key: CacheKey, force_refresh: bool) -> Tuple[str, Optional[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if force_refresh:
+            return "bypass", entry
+        if entry is None:
+            return "miss", None
+        age = time.monotonic() - entry["stored_at"]
+        if age < self._fresh_ttl:
+            return "hit", entry
+        if age < self._stale_ttl:
+            return "stale", entry
+        return "miss", entry
+
+    def _is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is not None and time.monotonic() - entry["stored_at"] < self._fresh_ttl
+
+    @staticmethod
+    def _result(entry: Dict[str, Any], status: str) -> Dict[str, Any]:
+        return {
+            "data": entry["data"],
+            "generated_at": entry["generated_at"],
+            "age_seconds": round(time.monotonic() - entry["stored_at"], 3),
+            "cache": status,
+        }
+
+    def get(self, key: CacheKey, loader: Callable[[], Any], force_refresh: bool = False) -> Dict[str, Any]:
+        """Return {"data", "generated_at", "age_seconds", "cache"} for `key`."""
+        status, entry = self._classify(key, force_refresh)
+
+        if status == "bypass":
+            arrived = time.monotonic()
+            with self._key_lock(key):
+                # A forced load that began after we arrived already covers
+                # this request; queued refreshes share it instead of rescanning
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is None or entry["started_at"] < arrived:
+                    entry = self._load(key, loader)
+        elif status == "stale":
+            self._refresh_in_background(key, loader)
+        elif status == "miss":
+            with self._key_lock(key):
+                # Another thread may have loaded it while we waited
+                with self._lock:
+                    entry = self._entries.get(key)
+                if not self._is_fresh(entry):
+                    entry = self._load(key, loader)
+
+        return self._result(entry, status)
+
+    async def _load_async(self, key: CacheKey, loader: Callable[[], Awaitable[Any]],
+                          not_before: Optional[float] = None) -> Dict[str, Any]:
+        """Single-flight async load: concurrent callers await the same task.
+
+        With `not_before`, an in-flight load that started earlier is not
+        joined; a new one replaces it so the caller gets data gathered after
+        that time.
+        """
+        load = self._async_loads.get(key)
+        if load is None or (not_before is not None and load[1] < not_before):
+            started = time.monotonic()
+
+            async def run():
+                return self._store(key, await loader(), started)
+
+            load = (asyncio.ensure_future(run()), started)
+            self._async_loads[key] = load
+
+            def done(_, load=load):
+                if self._async_loads.get(key) is load:
+                    del self._async_loads[key]
+
+            load[0].add_done_callback(done)
+        return await asyncio.shield(load[0])
+
+    def _refresh_async_in_background(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def run():
+            try:
+                await self._load_async(key, loader)
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh failed for {key}: {str(e)}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # Keep a reference so the task is not garbage-collected mid-flight
+        task = asyncio.ensure_future(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def get_async(self, key: CacheKey, loader: Callable[[], Awaitable[Any]],
+                        force_refresh: bool = False) -> Dict[str, Any]:
+        """asyncio variant of get(); `loader` is a coroutine function."""
+        status, entry = self._classify(key, force_refresh)
+
+        if status == "bypass":
+            # Like get(): a refresh may share a load, but only one that began after it arrived
+            entry = await self._load_async(key, loader, not_before=time.monotonic())
+        elif status == "stale":
+            self._refresh_async_in_background(key, loader)
+        elif status == "miss":
+            entry = await self._load_async(key, loader)
+
+        return self._result(entry, status)
+
+    def invalidate(self, key: Optional[CacheKey] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._key_locks.clear()
+            else:
+                self._entries.pop(key, None)
+                self._key_locks.pop(key, None)
+
+
+inventory_cache = InventoryCache()
+
+
+def _envelope(result: Dict[str, Any]) -> Dict[str, Any]:
+    data = result["data"]
+    body = dict(data) if isinstance(data, dict) else {"items": data}
+    body.update({
+        "generated_at": result["generated_at"],
+        "age_seconds": result["age_seconds"],
+        "cache": result["cache"],
+    })
+    return body
+
+
+def cached_inventory(provider: str, resource_type: str, account: str, scope: str,
+                     loader: Callable[[], Any], force_refresh: bool = False) -> Dict[str, Any]:
+    """Serve a list from the shared inventory cache as a response envelope.
+
+    `loader` may return a plain list or an envelope dict that already has
+    "items" (e.g. the AWS fan-out result with per-region status).
+    """
+    return _envelope(inventory_cache.get((provider, resource_type, account, scope), loader, force_refresh))
+
+
+async def cached_inventory_async(provider: str, resource_type: str, account: str, scope: str,
+                                 loader: Callable[[], Awaitable[Any]], force_refresh: bool = False) -> Dict[str, Any]:
+    """asyncio variant of cached_inventory; shares the same snapshots."""
+    key = (provider, resource_type, account, scope)
+    return _envelope(await inventory_cache.get_async(key, loader, force_refresh))
@@ -0,0 +1,77 @@
+# methods/columnar.py
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+# A string column is dictionary-encoded while it has at most this many distinct
+# values (and fewer than half as many as there are rows)
+COLUMNAR_DICTIONARY_MAX = int(os.environ.get("COLUMNAR_DICTIONARY_MAX", "256"))
+
+
+def _dictionary_encode(values: List[Any]) -> Tuple[Optional[List[Any]], Optional[List[int]]]:
+    """(dictionary, codes) for a low-cardinality string column, else (None, None)."""
+    limit = min(COLUMNAR_DICTIONARY_MAX, len(values) // 2)
+    index: Dict[Any, int] = {}
+    codes = []
+    for value in values:
+        if value is not None and not isinstance(value, str):
+            return None, None
+        code = index.get(value)
+        if code is None:
+            if len(index) >= limit:
+                return None, None
+            code = index[value] = len(index)
+        codes.append(code)
+    return list(index), codes
+
+
+def to_columnar(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rows -> {"count", "schema", "columns"}: one array per field instead of one dict per record.
+
+    `schema[i]` describes `columns[i]`. Dictionary-encoded columns carry
+    their distinct values in `schema[i]["dictionary"]` and integer codes
+    in the column. A field missing from a record is encoded as null.
+    """
+    names: Dict[str, None] = {}
+    for item in items:
+        for name in item:
+            names.setdefault(name, None)
+
+    schema, columns = [], []
+    for name in names:
+        values = [item.get(name) for item in items]
+        dictionary, codes = _dictionary_encode(values)
+        if dictionary is not None:
+            schema.append({"name": name, "encoding": "dictionary", "dictionary": dictionary})
+            columns.append(codes)
+        else:
+            schema.append({"name": name, "encoding": "plain"})
+            columns.append(values)
+    return {"count": len(items), "schema": schema, "columns": columns}
+
+
+def from_columnar(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Inverse of to_columnar (reference decoder for clients and benchmarks)."""
+    names = [column["name"] for column in table["schema"]]
+    decoded = []
+    for column, values in zip(table["schema"], table["columns"]):
+        if column["encoding"] == "dictionary":
+            dictionary = column["dictionary"]
+            values = [dictionary[code] for code in values]
+        decoded.append(values)
+    if not names:
+        return [{} for _ in range(table["count"])]
+    return [dict(zip(names, row)) for row in zip(*decoded)]
+
+
+def columnar_envelope(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """A list envelope with its "items" replaced by the columnar table; other keys pass through."""
+    body = {k: v for k, v in envelope.items() if k != "items"}
+    body["format"] = "columnar"
+    body.update(to_columnar(envelope.get("items") or []))
+    return body
@@ -0,0 +1,113 @@
+# methods/delta.py
+
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from methods import serialization
+from methods.aws.eks import _cluster_arn
+from methods.query import ListQuery, index_for
+from methods.snapshots import SnapshotStore, get_snapshot_store, is_version
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+class SnapshotVersionGone(LookupError):
+    """Raised when a `since` version has been pruned (or never existed)."""
+
+
+# collection -> stable record key
+RECORD_KEYS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "ec2": lambda r: r["instance_id"],
+    # DB identifiers are only unique within a region
+    "rds": lambda r: f"{r['region']}:{r['db_instance_identifier']}",
+    "eks": lambda r: r.get("arn") or _cluster_arn(r["region"], r["name"]),
+    "s3": lambda r: r["name"],
+    "azure_functions": lambda r: r["id"].lower(),
+    "azure_storage": lambda r: r["id"].lower(),
+}
+
+
+def record_key(collection: str, record: Dict[str, Any]) -> str:
+    return RECORD_KEYS[collection](record)
+
+
+def _content_hash(record: Dict[str, Any]) -> str:
+    return hashlib.blake2b(serialization.dumps(record), digest_size=8).hexdigest()
+
+
+def record_hashes(collection: str, items: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Stable key -> content hash for every record; stored with each snapshot."""
+    return {record_key(collection, item): _content_hash(item) for item in items}
+
+
+def _hashes(collection: str, document: Dict[str, Any]) -> Dict[str, str]:
+    # Snapshots written before hashes were stored get them computed on read
+    return document.get("hashes") or record_hashes(collection, document["data"]["items"])
+
+
+def _matching_keys(collection: str, items: List[Dict[str, Any]], query: ListQuery) -> Set[str]:
+    positions = index_for(collection, items).select(query.clauses)
+    return {record_key(collection, items[i]) for i in (range(len(items)) if positions is None else positions)}
+
+
+def compute_delta(collection: str, since: str, store: Optional[SnapshotStore] = None,
+                  query: Optional[ListQuery] = None) -> Dict[str, Any]:
+    """Records added, removed and modified between snapshot `since` and the latest one.
+
+    Only the two hash maps are compared; full records are looked up just
+    for the keys that changed, so a steady-state poll costs one dict walk.
+    With a `query`, its filter clauses select the records on both sides: a
+    record that starts matching counts as added, one that stops as removed.
+    Raises ValueError when `since` is not a snapshot version.
+    """
+    if not is_version(since):
+        raise ValueError("since must be a snapshot version (15 digits)")
+    store = store or get_snapshot_store()
+    latest = store.read(collection)
+    if latest is None:
+        raise SnapshotVersionGone(f"No {collection} snapshot yet")
+
+    delta: Dict[str, Any] = {
+        "since": since,
+        "version": latest["version"],
+        "generated_at": latest["generated_at"],
+        "added": [],
+        "modified": [],
+        "removed": [],
+    }
+    if since == latest["version"]:
+        return delta
+
+    previous = store.read(collection, since)
+    if previous is None:
+        raise SnapshotVersionGone(f"{collection} snapshot {since} is no longer available; reload the full list")
+
+    old_hashes = _hashes(collection, previous)
+    new_hashes = _hashes(collection, latest)
+    if query is not None and query.clauses:
+        old_keys = _matching_keys(collection, previous["data"]["items"], query)
+        new_keys = _matching_keys(collection, latest["data"]["items"], query)
+        old_hashes = {k: h for k, h in old_hashes.items() if k in old_keys}
+        new_hashes = {k: h for k, h in new_hashes.items() if k in new_keys}
+    added = {k for k in new_hashes if k not in old_hashes}
+    modified = {k for k, h in new_hashes.items() if k in old_hashes and old_hashes[k] != h}
+    delta["removed"] = [k for k in old_hashes if k not in new_hashes]
+
+    if added or modified:
+        for item in latest["data"]["items"]:
+            key = record_key(collection, item)
+            if key in added:
+                delta["added"].append(item)
+            elif key in modified:
+                delta["modified"].append(item)
+        if query is not None and query.fields:
+            for name in ("added", "modified"):
+                delta[name] = [{f: r[f] for f in query.fields if f in r} for r in delta[name]]
+
+    logger.info(
+        f"🔀 {collection} delta {since}->{latest['version']}: +{len(delta['added'])} "
+        f"~{len(delta['modified'])} -{len(delta['removed'])}"
+    )
+    return delta
@@ -0,0 +1,106 @@
+# methods/detail_sections.py
+
+import os
+import asyncio
+import time
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+from methods.metrics import in_request_context
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+DETAIL_SECTION_TIMEOUT_SECONDS = float(os.environ.get("DETAIL_SECTION_TIMEOUT_SECONDS", "5"))
+# Required sections have no fallback, so they get a longer limit than optional ones
+DETAIL_REQUIRED_TIMEOUT_SECONDS = float(os.environ.get("DETAIL_REQUIRED_TIMEOUT_SECONDS", "30"))
+DETAIL_SECTION_WORKERS = int(os.environ.get("DETAIL_SECTION_WORKERS", "32"))
+
+# Separate from the async offload pool: sync detail functions that fan out
+# here may themselves be running on that pool.
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=DETAIL_SECTION_WORKERS, thread_name_prefix="detail-section"
+)
+
+
+def _degrade(label: str, name: str, reason: str, degraded: Dict[str, str], results: Dict[str, Any]):
+    logger.warning(f"⚠️ {label}: section '{name}' degraded to null ({reason})")
+    results[name] = None
+    degraded[name] = reason
+
+
+def gather_sections(
+    label: str,
+    sections: Dict[str, Callable[[], Any]],
+    required: Iterable[str] = (),
+    timeout: float = DETAIL_SECTION_TIMEOUT_SECONDS,
+    required_timeout: float = DETAIL_REQUIRED_TIMEOUT_SECONDS,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Run independent detail sub-requests concurrently.
+
+    Returns (results, degraded). An optional section that raises or is still
+    running after `timeout` becomes None and is listed in `degraded` with
+    the reason; a `required` section gets `required_timeout` and re-raises
+    on failure so the caller's error handling applies.
+    """
+    required = set(required)
+    started = time.monotonic()
+    futures = {name: _executor.submit(in_request_context(fn)) for name, fn in sections.items()}
+    concurrent.futures.wait(futures.values(), timeout=timeout)
+    pending_required = [futures[name] for name in required if name in futures and not futures[name].done()]
+    if pending_required:
+        concurrent.futures.wait(pending_required, timeout=max(0.0, required_timeout - (time.monotonic() - started)))
+
+    results: Dict[str, Any] = {}
+    degraded: Dict[str, str] = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            if name in required:
+                raise TimeoutError(f"{label}: {name} exceeded {required_timeout:.0f}s")
+            _degrade(label, name, "timeout", degraded, results)
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            if name in required:
+                raise
+            _degrade(label, name, str(e), degraded, results)
+
+    logger.info(f"⏱️ {label}: {len(sections)} sections in {time.monotonic() - started:.2f}s "
+                f"(degraded={len(degraded)})")
+    return results, degraded
+
+
+async def gather_sections_async(
+    label: str,
+    sections: Dict[str, Callable[[], Awaitable[Any]]],
+    required: Iterable[str] = (),
+    timeout: float = DETAIL_SECTION_TIMEOUT_SECONDS,
+    required_timeout: float = DETAIL_REQUIRED_TIMEOUT_SECONDS,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """asyncio variant of gather_sections for coroutine sub-requests."""
+    required = set(required)
+    started = time.monotonic()
+    names = list(sections)
+    outcomes = await asyncio.gather(
+        *(asyncio.wait_for(sections[name](), required_timeout if name in required else timeout) for name in names),
+        return_exceptions=True,
+    )
+
+    results: Dict[str, Any] = {}
+    degraded: Dict[str, str] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            if name in required:
+                raise outcome
+            reason = "timeout" if isinstance(outcome, asyncio.TimeoutError) else str(outcome)
+            _degrade(label, name, reason, degraded, results)
+        else:
+            results[name] = outcome
+
+    logger.info(f"⏱️ {label}: {len(sections)} sections in {time.monotonic() - started:.2f}s "
+                f"(degraded={len(degraded)})")
+    return results, degraded
@@ -0,0 +1,288 @@
+# methods/fanout.py
+#
+# Cloud-neutral scatter-gather over "regions" (AWS regions, Azure
+# subscriptions, inventory units). methods/aws/fanout.py wraps it for AWS.
+
+import os
+import asyncio
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List
+
+from methods.async_support import BLOCKING_EXECUTOR
+from methods.metrics import in_request_context
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+def _setting(name: str, legacy: str, default: str) -> str:
+    # The AWS_* names these settings had before the engine became cloud-neutral still work
+    return os.environ.get(name) or os.environ.get(legacy, default)
+
+
+REGION_TIMEOUT_SECONDS = float(_setting("FANOUT_REGION_TIMEOUT_SECONDS", "AWS_REGION_TIMEOUT_SECONDS", "20"))
+FANOUT_DEADLINE_SECONDS = float(_setting("FANOUT_DEADLINE_SECONDS", "AWS_FANOUT_DEADLINE_SECONDS", "45"))
+FANOUT_MIN_WORKERS = int(_setting("FANOUT_MIN_WORKERS", "AWS_FANOUT_MIN_WORKERS", "4"))
+FANOUT_MAX_WORKERS = int(_setting("FANOUT_MAX_WORKERS", "AWS_FANOUT_MAX_WORKERS", "24"))
+FANOUT_TARGET_LATENCY_SECONDS = float(
+    _setting("FANOUT_TARGET_LATENCY_SECONDS", "AWS_FANOUT_TARGET_LATENCY_SECONDS", "2.0")
+)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight region calls, driven by observed latency.
+
+    Fast regions grow the limit by one; slow regions shrink it by one;
+    failures and timeouts halve it. The limit persists across requests so
+    each fan-out starts from what the previous one learned.
+    """
+
+    def __init__(self, minimum: int = FANOUT_MIN_WORKERS, maximum: int = FANOUT_MAX_WORKERS,
+                 target_latency: float = FANOUT_TARGET_LATENCY_SECONDS):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_latency = target_latency
+        self._limit = min(self.maximum, max(self.minimum, 10))
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def record(self, latency: float, ok: bool = True):
+        with self._lock:
+            if not ok:
+                self._limit = max(self.minimum, self._limit // 2)
+            elif latency <= self.target_latency:
+                self._limit = min(self.maximum, self._limit + 1)
+            elif latency > 2 * self.target_latency:
+                self._limit = max(self.minimum, self._limit - 1)
+
+
+_controllers: Dict[str, AdaptiveConcurrency] = {}
+_controllers_lock = threading.Lock()
+
+
+def _controller_for(label: str) -> AdaptiveConcurrency:
+    with _controllers_lock:
+        return _controllers.setdefault(label, AdaptiveConcurrency())
+
+
+class _FanOut:
+    """Bookkeeping shared by the thread and asyncio scatter-gather drivers."""
+
+    def __init__(self, label: str, regions: List[str], region_timeout: float, deadline: float,
+                 keep_items: bool = True):
+        self.label = label
+        self.keep_items = keep_items
+        self.item_count = 0
+        self.region_count = len(regions)
+        self.region_timeout = region_timeout
+        self.deadline = deadline
+        self.controller = _controller_for(label)
+        self.started = time.monotonic()
+        self.deadline_at = self.started + deadline
+
+        self.items: List[Dict[str, Any]] = []
+        self.completed: List[str] = []
+        self.failed: List[Dict[str, str]] = []
+        self.timed_out: List[str] = []
+        self.timings: Dict[str, float] = {}
+
+        self.pending = deque(regions)
+        self.in_flight: Dict[Any, tuple] = {}
+
+    def active(self) -> bool:
+        return bool(self.pending or self.in_flight)
+
+    def deadline_passed(self) -> bool:
+        """Time out everything left once the overall deadline has passed."""
+        if time.monotonic() < self.deadline_at:
+            return False
+        for region, region_started in self.in_flight.values():
+            self.timed_out.append(region)
+            self.timings[region] = round(time.monotonic() - region_started, 3)
+        for region in self.pending:
+            self.timed_out.append(region)
+            self.timings[region] = 0.0
+        self.in_flight.clear()
+        self.pending.clear()
+        logger.warning(f"⏰ {self.label} fan-out hit its {self.deadline:.0f}s deadline")
+        return True
+
+    def regions_to_start(self) -> List[str]:
+        starting = []
+        while self.pending and len(self.in_flight) + len(starting) < self.controller.limit:
+            starting.append(self.pending.popleft())
+        return starting
+
+    def track(self, future, region: str):
+        self.in_flight[future] = (region, time.monotonic())
+
+    def wait_timeout(self) -> float:
+        next_expiry = min(s + self.region_timeout for _, s in self.in_flight.values())
+        return max(0.0, min(next_expiry, self.deadline_at) - time.monotonic())
+
+    def collect(self, done) -> List[Dict[str, Any]]:
+        """Record finished regions; returns one event per region for streaming callers."""
+        events = []
+        for future in done:
+            region, region_started = self.in_flight.pop(future)
+            elapsed = time.monotonic() - region_started
+            self.timings[region] = round(elapsed, 3)
+            try:
+                region_items = future.result()
+                if self.keep_items:
+                    self.items.extend(region_items)
+                self.item_count += len(region_items)
+                self.completed.append(region)
+                self.controller.record(elapsed, ok=True)
+                events.append({"type": "region", "region": region, "items": region_items,
+                               "seconds": self.timings[region]})
+            except Exception as e:
+                logger.warning(f"⚠️ {self.label} failed in {region}: {str(e)}", exc_info=True)
+                self.failed.append({"region": region, "error": str(e)})
+                self.controller.record(elapsed, ok=False)
+                events.append({"type": "region", "region": region, "error": str(e),
+                               "seconds": self.timings[region]})
+        return events
+
+    def expire_slow(self):
+        now = time.monotonic()
+        for future, (region, region_started) in list(self.in_flight.items()):
+            if now - region_started >= self.region_timeout:
+                self.in_flight.pop(future)
+                future.cancel()
+                logger.warning(f"⏰ {self.label} in {region} exceeded {self.region_timeout:.0f}s")
+                self.timed_out.append(region)
+                self.controller.record(now - region_started, ok=False)
+                self.timings[region] = round(now - region_started, 3)
+
+    def result(self) -> Dict[str, Any]:
+        duration = time.monotonic() - self.started
+        logger.info(
+            f"🎉 {self.label}: {self.item_count} items from {len(self.completed)}/{self.region_count} regions "
+            f"in {duration:.2f}s (failed={len(self.failed)}, timed_out={len(self.timed_out)}, "
+            f"concurrency={self.controller.limit})"
+        )
+        return {
+            "items": self.items,
+            "completed_regions": self.completed,
+            "failed_regions": self.failed,
+            "timed_out_regions": self.timed_out,
+            "region_timings": self.timings,
+            "duration_seconds": round(duration, 3),
+        }
+
+    def trailer(self) -> Dict[str, Any]:
+        """Closing stream event: the envelope's status fields without the items."""
+        summary = self.result()
+        del summary["items"]
+        return {"type": "trailer", "item_count": self.item_count, **summary}
+
+
+def _drive(fan: _FanOut, fetch: Callable[[str], List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Thread-pool fan-out loop; yields region events as futures complete."""
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=fan.controller.maximum, thread_name_prefix=f"fanout-{fan.label}"
+    )
+    try:
+        while fan.active() and not fan.deadline_passed():
+            for region in fan.regions_to_start():
+                fan.track(executor.submit(in_request_context(fetch), region), region)
+            done, _ = concurrent.futures.wait(
+                fan.in_flight, timeout=fan.wait_timeout(), return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            yield from fan.collect(done)
+            fan.expire_slow()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _drive_async(fan: _FanOut, fetch: Callable[[str], List[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+    """asyncio fan-out loop; blocking fetches run on the shared offload pool."""
+    loop = asyncio.get_running_loop()
+    while fan.active() and not fan.deadline_passed():
+        for region in fan.regions_to_start():
+            fan.track(loop.run_in_executor(BLOCKING_EXECUTOR, in_request_context(fetch), region), region)
+        done, _ = await asyncio.wait(
+            list(fan.in_flight), timeout=fan.wait_timeout(), return_when=asyncio.FIRST_COMPLETED
+        )
+        for event in fan.collect(done):
+            yield event
+        fan.expire_slow()
+
+
+def scatter_gather(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Dict[str, Any]:
+    """Run `fetch(region)` across regions and gather whatever finishes in time.
+
+    Regions that raise are reported in `failed_regions`; regions still running
+    after `region_timeout` or when the overall `deadline` passes are reported
+    in `timed_out_regions` and their late results are discarded. Threads of
+    timed-out regions are left to finish on their own (the SDK read timeouts
+    bound them).
+    """
+    fan = _FanOut(label, regions, region_timeout, deadline)
+    for _ in _drive(fan, fetch):
+        pass
+    return fan.result()
+
+
+async def scatter_gather_async(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Dict[str, Any]:
+    """asyncio variant of scatter_gather with the same envelope.
+
+    Blocking per-region fetches run on the shared offload pool, so waiting
+    on a fan-out never holds an event-loop thread.
+    """
+    fan = _FanOut(label, regions, region_timeout, deadline)
+    async for _ in _drive_async(fan, fetch):
+        pass
+    return fan.result()
+
+
+def scatter_gather_stream(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> Iterator[Dict[str, Any]]:
+    """scatter_gather as a generator: one event per region as it finishes, then a trailer.
+
+    Region events are {"type": "region", "region", "items" | "error", "seconds"};
+    the trailer carries the usual per-region status and timings. Items are
+    not retained, so memory stays bounded by the largest region.
+    """
+    fan = _FanOut(label, regions, region_timeout, deadline, keep_items=False)
+    yield from _drive(fan, fetch)
+    yield fan.trailer()
+
+
+async def scatter_gather_stream_async(
+    label: str,
+    regions: List[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    region_timeout: float = REGION_TIMEOUT_SECONDS,
+    deadline: float = FANOUT_DEADLINE_SECONDS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """asyncio variant of scatter_gather_stream (same events)."""
+    fan = _FanOut(label, regions, region_timeout, deadline, keep_items=False)
+    async for event in _drive_async(fan, fetch):
+        yield event
+    yield fan.trailer()
@@ -0,0 +1,135 @@
+# methods/inventory.py
+
+import os
+from typing import Any, Dict, List, Optional
+
+from methods.aws.fanout import scatter_gather, scatter_gather_async
+from methods.aws.regions import get_scan_regions
+from methods.async_support import run_blocking
+from methods.aws.ec2 import _fetch_ec2_instances_in_region
+from methods.aws.rds import _fetch_rds_instances_in_region
+from methods.aws.eks import _fetch_clusters_in_region
+from methods.aws.s3 import GLOBAL_SCOPE, get_s3_buckets_with_metadata
+from methods.azure.functions import get_azure_functions_with_metadata
+from methods.azure.storage import get_azure_storage_accounts_with_metadata
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SUBSCRIPTION_ID = os.environ.get("AZURE_SUBSCRIPTION_ID")
+
+# section -> (fetch(scope), is_regional)
+SECTIONS: Dict[str, tuple] = {
+    "ec2": (_fetch_ec2_instances_in_region, True),
+    "rds": (_fetch_rds_instances_in_region, True),
+    "eks": (_fetch_clusters_in_region, True),
+    "s3": (lambda _: get_s3_buckets_with_metadata(), False),
+    "azure_functions": (get_azure_functions_with_metadata, False),
+    "azure_storage": (get_azure_storage_accounts_with_metadata, False),
+}
+
+
+def parse_sections(raw: Optional[str]) -> List[str]:
+    """Comma-separated `types=` parameter -> known section names (all by default)."""
+    if not raw:
+        return list(SECTIONS)
+    requested = [s.strip().lower() for s in raw.split(",") if s.strip()]
+    unknown = [s for s in requested if s not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown inventory types: {', '.join(unknown)}")
+    return requested
+
+
+def _plan_units(sections: List[str], regions: Optional[str], subscription_id: Optional[str]) -> List[str]:
+    """One `section:scope` unit per (service, region), S3 bucket scan, or subscription."""
+    units = []
+    aws_regions = None
+    for section in sections:
+        _, regional = SECTIONS[section]
+        if regional:
+            if aws_regions is None:
+                # Resolved once and shared by every regional service
+                aws_regions = get_scan_regions(regions)
+            units.extend(f"{section}:{region}" for region in aws_regions)
+        elif section.startswith("azure_"):
+            if subscription_id:
+                units.append(f"{section}:{subscription_id}")
+        else:
+            units.append(f"{section}:{GLOBAL_SCOPE}")
+    return units
+
+
+def _fetch_unit(unit: str) -> List[Dict[str, Any]]:
+    section, _, scope = unit.partition(":")
+    fetch, _ = SECTIONS[section]
+    return [{"section": section, "scope": scope, "items": fetch(scope)}]
+
+
+def _split_sections(sections: List[str], subscription_id: Optional[str], fan: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn the combined fan-out envelope back into one envelope per section."""
+    document: Dict[str, Any] = {
+        section: {
+            "items": [],
+            "completed_regions": [],
+            "failed_regions": [],
+            "timed_out_regions": [],
+            "region_timings": {},
+        }
+        for section in sections
+    }
+
+    for chunk in fan["items"]:
+        document[chunk["section"]]["items"].extend(chunk["items"])
+    for unit in fan["completed_regions"]:
+        section, _, scope = unit.partition(":")
+        document[section]["completed_regions"].append(scope)
+    for failure in fan["failed_regions"]:
+        section, _, scope = failure["region"].partition(":")
+        document[section]["failed_regions"].append({"region": scope, "error": failure["error"]})
+    for unit in fan["timed_out_regions"]:
+        section, _, scope = unit.partition(":")
+        document[section]["timed_out_regions"].append(scope)
+    for unit, seconds in fan["region_timings"].items():
+        section, _, scope = unit.partition(":")
+        document[section]["region_timings"][scope] = seconds
+
+    if not subscription_id:
+        for section in sections:
+            if section.startswith("azure_"):
+                document[section]["skipped"] = "subscription_id required"
+
+    document["duration_seconds"] = fan["duration_seconds"]
+    return document
+
+
+def collect_inventory(
+    regions: Optional[str] = None,
+    subscription_id: Optional[str] = None,
+    types: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Collect every resource type in one fan-out and return a section per type.
+
+    All (service, region) calls share one worker pool, one region list and
+    the pooled clients, instead of one cold fan-out per list endpoint.
+    """
+    sections = parse_sections(types)
+    subscription_id = subscription_id or DEFAULT_SUBSCRIPTION_ID
+    units = _plan_units(sections, regions, subscription_id)
+    logger.info(f"🗂️ Inventory: {len(units)} units across {len(sections)} sections")
+    return _split_sections(sections, subscription_id, scatter_gather("inventory", units, _fetch_unit))
+
+
+async def collect_inventory_async(
+    regions: Optional[str] = None,
+    subscription_id: Optional[str] = None,
+    types: Optional[str] = None,
+) -> Dict[str, Any]:
+    """asyncio variant of collect_inventory with the same document."""
+    sections = parse_sections(types)
+    subscription_id = subscription_id or DEFAULT_SUBSCRIPTION_ID
+    units = await run_blocking(_plan_units, sections, regions, subscription_id)
+    logger.info(f"🗂️ Inventory (async): {len(units)} units across {len(sections)} sections")
+    fan = await scatter_gather_async("inventory", units, _fetch_unit)
+    return _split_sections(sections, subscription_id, fan)
@@ -0,0 +1,287 @@
+# methods/metrics.py
+
+import os
+import re
+import sys
+import time
+import bisect
+import threading
+import contextvars
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from azure.core.pipeline.policies import SansIOHTTPPolicy
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+METRICS_ENABLED = os.environ.get("CLOUD_API_METRICS_ENABLED", "true").lower() == "true"
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = tuple(
+    float(b) for b in os.environ.get(
+        "CLOUD_API_LATENCY_BUCKETS", "0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30"
+    ).split(",")
+)
+
+AWS_THROTTLE_CODES = frozenset({
+    "Throttling", "ThrottlingException", "ThrottledException", "RequestThrottledException",
+    "TooManyRequestsException", "ProvisionedThroughputExceededException", "RequestLimitExceeded",
+    "SlowDown", "BandwidthLimitExceeded", "RequestThrottled", "PriorRequestNotComplete",
+})
+
+# (cloud, service, operation, region)
+Labels = Tuple[str, str, str, str]
+LABEL_NAMES = ("cloud", "service", "operation", "region")
+
+
+class _Series:
+    __slots__ = ("buckets", "total", "count", "errors", "throttles")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors: Dict[str, int] = {}
+        self.throttles = 0
+
+
+class CloudApiMetrics:
+    """Process-wide latency histograms and error/throttle counters per cloud API call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Labels, _Series] = {}
+
+    def _get(self, labels: Labels) -> _Series:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _Series()
+        return series
+
+    def observe(self, labels: Labels, seconds: float, error: Optional[str] = None):
+        with self._lock:
+            series = self._get(labels)
+            series.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            series.total += seconds
+            series.count += 1
+            if error:
+                series.errors[error] = series.errors.get(error, 0) + 1
+        _record_request_timing(labels, seconds)
+
+    def throttled(self, labels: Labels):
+        with self._lock:
+            self._get(labels).throttles += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (labels, list(s.buckets), s.total, s.count, dict(s.errors), s.throttles)
+                for labels, s in sorted(self._series.items())
+            ]
+
+        lines = [
+            "# HELP cloud_api_call_duration_seconds Latency of cloud SDK calls, including SDK retries.",
+            "# TYPE cloud_api_call_duration_seconds histogram",
+        ]
+        for labels, buckets, total, count, _, _ in snapshot:
+            base = _format_labels(labels)
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+                cumulative += hits
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'cloud_api_call_duration_seconds_bucket{{{base},le="{le}"}} {cumulative}')
+            lines.append(f"cloud_api_call_duration_seconds_sum{{{base}}} {total:.6f}")
+            lines.append(f"cloud_api_call_duration_seconds_count{{{base}}} {count}")
+
+        lines += [
+            "# HELP cloud_api_call_errors_total Cloud SDK calls that failed, by error code.",
+            "# TYPE cloud_api_call_errors_total counter",
+        ]
+        for labels, _, _, _, errors, _ in snapshot:
+            base = _format_labels(labels)
+            for code, hits in sorted(errors.items()):
+                lines.append(f'cloud_api_call_errors_total{{{base},code="{_escape(code)}"}} {hits}')
+
+        lines += [
+            "# HELP cloud_api_throttles_total Throttled attempts (each retried attempt counts).",
+            "# TYPE cloud_api_throttles_total counter",
+        ]
+        for labels, _, _, _, _, throttles in snapshot:
+            if throttles:
+                lines.append(f"cloud_api_throttles_total{{{_format_labels(labels)}}} {throttles}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(LABEL_NAMES, labels))
+
+
+cloud_api_metrics = CloudApiMetrics()
+
+
+# ---------------------------------------------------------------------------
+# Per-request totals for the Server-Timing header
+
+_request_timings: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar(
+    "cloud_api_request_timings", default=None
+)
+_timings_lock = threading.Lock()
+
+
+def _record_request_timing(labels: Labels, seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        # Several worker threads may add to the same request's totals
+        with _timings_lock:
+            entry = timings.setdefault(f"{labels[0]}-{labels[1]}", [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+
+def start_request_timing() -> contextvars.Token:
+    """Begin collecting cloud call totals for the current request (see server_timing)."""
+    return _request_timings.set({})
+
+
+def server_timing(token: contextvars.Token, started: float) -> str:
+    """Server-Timing value for the request begun with `token`; ends the collection.
+
+    One entry per cloud/service with the summed call time (calls made in
+    parallel add up, so this can exceed the wall time) plus `total`.
+    """
+    timings = _request_timings.get() or {}
+    _request_timings.reset(token)
+    with _timings_lock:
+        parts = [
+            f'{re.sub(r"[^A-Za-z0-9_.-]", "_", name)};dur={seconds * 1000:.1f};desc="{count} call{"s" if count != 1 else ""}"'
+            for name, (count, seconds) in sorted(timings.items())
+        ]
+    parts.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def in_request_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind `fn` to the caller's context so calls it makes on a worker thread count towards this request."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so each call runs in its own copy
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# AWS: botocore event hooks
+
+def _aws_before_call(model, context, **kwargs):
+    context["metrics_labels"] = (
+        "aws", model.service_model.service_name, model.name, context.get("client_region") or "global"
+    )
+    context["metrics_started"] = time.perf_counter()
+
+
+def _aws_after_call(http_response, parsed, context, **kwargs):
+    started = context.pop("metrics_started", None)
+    if started is None:
+        return
+    error = None
+    if http_response is not None and http_response.status_code >= 300:
+        error = (parsed or {}).get("Error", {}).get("Code") or str(http_response.status_code)
+    cloud_api_metrics.observe(context["metrics_labels"], time.perf_counter() - started, error)
+
+
+def _aws_after_call_error(exception, context, **kwargs):
+    started = context.pop("metrics_started", None)
+    if started is not None:
+        cloud_api_metrics.observe(context["metrics_labels"], time.perf_counter() - started, type(exception).__name__)
+
+
+def _aws_needs_retry(response=None, request_dict=None, **kwargs):
+    # Runs once per attempt, so throttles that a retry later absorbed still count
+    if response is None or request_dict is None:
+        return None
+    code = (response[1] or {}).get("Error", {}).get("Code")
+    labels = request_dict.get("context", {}).get("metrics_labels")
+    if code in AWS_THROTTLE_CODES and labels:
+        cloud_api_metrics.throttled(labels)
+    return None
+
+
+def instrument_botocore_session(session):
+    """Register the metrics hooks on a botocore session; clients created from it inherit them."""
+    if not METRICS_ENABLED:
+        return session
+    session.register("before-call", _aws_before_call, unique_id="cloud-api-metrics-before")
+    session.register("after-call", _aws_after_call, unique_id="cloud-api-metrics-after")
+    session.register("after-call-error", _aws_after_call_error, unique_id="cloud-api-metrics-error")
+    session.register("needs-retry", _aws_needs_retry, unique_id="cloud-api-metrics-retry")
+    return session
+
+
+# ---------------------------------------------------------------------------
+# Azure: azure-core pipeline policies
+
+def _azure_labels(request) -> Labels:
+    """("azure", provider, "GET sites/config", "global") from an ARM URL, without resource names."""
+    path = request.url.split("?", 1)[0].split("://", 1)[-1].split("/")[1:]
+    segments = [s for s in path if s]
+    lowered = [s.lower() for s in segments]
+    if "providers" in lowered:
+        start = len(lowered) - 1 - lowered[::-1].index("providers")
+        service = segments[start + 1] if start + 1 < len(segments) else "providers"
+        types = segments[start + 2::2]
+    else:
+        # Tenant-level calls such as /subscriptions and /subscriptions/{id}/resourceGroups
+        service = "Microsoft.Resources"
+        types = segments[::2]
+    return "azure", service, f"{request.method} {'/'.join(types)}", "global"
+
+
+class AzureCallMetricsPolicy(SansIOHTTPPolicy):
+    """Per-call policy: latency (retries included) and final error status of each ARM call."""
+
+    def on_request(self, request):
+        request.context["metrics_started"] = time.perf_counter()
+
+    def on_response(self, request, response):
+        started = request.context.pop("metrics_started", None)
+        if started is None:
+            return
+        status = response.http_response.status_code
+        error = str(status) if status >= 400 else None
+        cloud_api_metrics.observe(_azure_labels(request.http_request), time.perf_counter() - started, error)
+
+    def on_exception(self, request):
+        started = request.context.pop("metrics_started", None)
+        if started is not None:
+            error = type(sys.exc_info()[1]).__name__
+            cloud_api_metrics.observe(_azure_labels(request.http_request), time.perf_counter() - started, error)
+
+
+class AzureThrottleMetricsPolicy(SansIOHTTPPolicy):
+    """Per-retry policy: counts every 429 attempt, including ones the retry policy absorbed."""
+
+    def on_response(self, request, response):
+        if response.http_response.status_code == 429:
+            cloud_api_metrics.throttled(_azure_labels(request.http_request))
+
+
+def azure_metrics_policies() -> Dict[str, Any]:
+    """Keyword arguments that add the metrics policies to an Azure management client."""
+    if not METRICS_ENABLED:
+        return {}
+    return {
+        "per_call_policies": [AzureCallMetricsPolicy()],
+        "per_retry_policies": [AzureThrottleMetricsPolicy()],
+    }
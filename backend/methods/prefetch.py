@@ -0,0 +1,192 @@
+# methods/prefetch.py
+
+import os
+import threading
+import time
+import concurrent.futures
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from methods.aws.ec2 import get_ec2_instance_details
+from methods.aws.rds import get_rds_instance_details
+from methods.aws.eks import get_eks_cluster_details
+from methods.query import ListQuery, apply_list_query
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+DETAIL_CACHE_TTL_SECONDS = int(os.environ.get("DETAIL_CACHE_TTL_SECONDS", "120"))
+DETAIL_CACHE_MAX_ENTRIES = int(os.environ.get("DETAIL_CACHE_MAX_ENTRIES", "2000"))
+PREFETCH_ENABLED = os.environ.get("DETAIL_PREFETCH_ENABLED", "false").lower() in ("1", "true", "yes")
+PREFETCH_TOP_N = int(os.environ.get("DETAIL_PREFETCH_TOP_N", "10"))
+PREFETCH_WORKERS = int(os.environ.get("DETAIL_PREFETCH_WORKERS", "2"))
+PREFETCH_MAX_PENDING = int(os.environ.get("DETAIL_PREFETCH_MAX_PENDING", "50"))
+
+# kind -> (list record id field, detail function(id, region))
+PREFETCH_TARGETS: Dict[str, Tuple[str, Callable[[str, str], Dict[str, Any]]]] = {
+    "ec2": ("instance_id", get_ec2_instance_details),
+    "rds": ("db_instance_identifier", get_rds_instance_details),
+    "eks": ("name", get_eks_cluster_details),
+}
+
+# (kind, region, resource id)
+DetailKey = Tuple[str, str, str]
+
+
+class DetailCache:
+    """Short-TTL cache of detail responses, shared by the detail routes and the prefetcher.
+
+    Entries are kept in write order, so expired ones are always at the front:
+    each put drops them and then the oldest entries beyond `max_entries`.
+    """
+
+    def __init__(self, ttl: int = DETAIL_CACHE_TTL_SECONDS, max_entries: int = DETAIL_CACHE_MAX_ENTRIES):
+        self._ttl = ttl
+        self._max_entries = max(max_entries, 1)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[DetailKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: DetailKey) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """(stored_at monotonic time, details) for a live entry, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self._ttl:
+                del self._entries[key]
+                return None
+            return entry
+
+    def put(self, key: DetailKey, details: Dict[str, Any]):
+        # Detail functions report failures in-band; never cache those
+        if "error" in details:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, details)
+            self._entries.move_to_end(key)
+            while self._entries:
+                oldest_key, (stored_at, _) = next(iter(self._entries.items()))
+                if now - stored_at <= self._ttl and len(self._entries) <= self._max_entries:
+                    break
+                del self._entries[oldest_key]
+
+
+detail_cache = DetailCache()
+
+
+def cached_details(kind: str, region: str, resource_id: str,
+                   loader: Callable[[], Dict[str, Any]], force_refresh: bool = False) -> Dict[str, Any]:
+    """Serve a detail view, from the detail cache only while prefetching is enabled.
+
+    Like list envelopes, the response carries "cache" (hit | miss | bypass)
+    and "age_seconds"; with prefetching off every request loads live data.
+    """
+    key = (kind, region, resource_id)
+    if not PREFETCH_ENABLED or force_refresh:
+        status = "bypass"
+    else:
+        entry = detail_cache.get(key)
+        if entry is not None:
+            logger.info(f"⚡ Detail cache hit for {kind} {resource_id} ({region})")
+            return {**entry[1], "age_seconds": round(time.monotonic() - entry[0], 3), "cache": "hit"}
+        status = "miss"
+    details = loader()
+    if PREFETCH_ENABLED:
+        detail_cache.put(key, details)
+    return {**details, "age_seconds": 0.0, "cache": status}
+
+
+def _parse_predicate(raw: Optional[str]) -> Optional[Tuple[str, str]]:
+    """`field=value` (e.g. state=running) -> (field, value)."""
+    if not raw or "=" not in raw:
+        return None
+    field, _, value = raw.partition("=")
+    return field.strip(), value.strip()
+
+
+class DetailPrefetcher:
+    """Warms the detail cache for the list items a user is likely to open next.
+
+    Runs on a small dedicated pool so it never competes with request
+    threads for more than PREFETCH_WORKERS slots, and drops work once
+    PREFETCH_MAX_PENDING prefetches are queued.
+    """
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, max_pending: int = PREFETCH_MAX_PENDING):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="detail-prefetch"
+        )
+        self._budget = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self._queued = set()
+        self.stats = {"scheduled": 0, "warmed": 0, "skipped": 0, "dropped": 0}
+
+    def _count(self, stat: str):
+        # Workers and request threads update the counters concurrently
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _candidates(self, kind: str, items: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+        predicate = _parse_predicate(
+            os.environ.get(f"DETAIL_PREFETCH_PREDICATE_{kind.upper()}")
+            or os.environ.get("DETAIL_PREFETCH_PREDICATE")
+        )
+        if predicate:
+            field, value = predicate
+            items = [item for item in items if str(item.get(field)) == value]
+        return items[:top_n]
+
+    def _warm(self, kind: str, key: DetailKey, fetch: Callable[[str, str], Dict[str, Any]]):
+        try:
+            if detail_cache.get(key) is None:
+                detail_cache.put(key, fetch(key[2], key[1]))
+                self._count("warmed")
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch of {kind} {key[2]} ({key[1]}) failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._queued.discard(key)
+            self._budget.release()
+
+    def schedule(self, kind: str, items: List[Dict[str, Any]], top_n: int = PREFETCH_TOP_N):
+        """Queue detail loads for the first `top_n` (predicate-matching) items; never blocks."""
+        if kind not in PREFETCH_TARGETS:
+            return
+        id_field, fetch = PREFETCH_TARGETS[kind]
+        for item in self._candidates(kind, items, top_n):
+            key = (kind, item.get("region"), item.get(id_field))
+            if not all(key) or detail_cache.get(key) is not None:
+                self._count("skipped")
+                continue
+            with self._lock:
+                if key in self._queued:
+                    self.stats["skipped"] += 1
+                    continue
+                if not self._budget.acquire(blocking=False):
+                    self.stats["dropped"] += 1
+                    continue
+                self._queued.add(key)
+                self.stats["scheduled"] += 1
+            self._executor.submit(self._warm, kind, key, fetch)
+
+
+prefetcher = DetailPrefetcher()
+
+
+def schedule_prefetch(kind: str, data: Dict[str, Any], query: Optional[ListQuery] = None):
+    """Hook for list routes: prefetch details for the rows a list response serves (opt-in).
+
+    With the request's `query`, candidates follow its filter and sort; the
+    full records are used so a fields= projection cannot drop their ids.
+    """
+    if not PREFETCH_ENABLED:
+        return
+    try:
+        if query is not None:
+            data = apply_list_query(kind, data, query._replace(fields=()))
+        prefetcher.schedule(kind, data.get("items") or [])
+    except Exception as e:
+        logger.warning(f"⚠️ Prefetch scheduling for {kind} failed: {str(e)}")
@@ -0,0 +1,250 @@
+# methods/query.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+# collection -> filter name -> record field. Only these fields are indexed;
+# the record field names themselves are accepted as well as the aliases.
+FILTER_FIELDS: Dict[str, Dict[str, str]] = {
+    "ec2": {"state": "state", "region": "region", "type": "instance_type"},
+    "rds": {"state": "status", "status": "status", "region": "region",
+            "type": "db_instance_class", "class": "db_instance_class", "engine": "engine"},
+    "eks": {"state": "status", "status": "status", "region": "region", "version": "version"},
+    "s3": {"name": "name", "region": "region"},
+    "azure_functions": {"state": "state", "region": "location", "location": "location",
+                        "kind": "kind", "resource_group": "resource_group", "subscription": "subscription_id"},
+    "azure_storage": {"region": "location", "location": "location", "kind": "kind", "type": "sku",
+                      "resource_group": "resource_group", "subscription": "subscription_id"},
+}
+TAG_PREFIX = "tag:"
+
+# Indexes kept per items list; an inventory cache entry or snapshot reuses one list
+INDEX_CACHE_SIZE = 16
+
+
+class Clause(NamedTuple):
+    field: str                 # record field, or "tag:<key>"
+    values: FrozenSet[str]     # lower-cased alternatives; empty = tag key present
+
+
+class ListQuery(NamedTuple):
+    clauses: Tuple[Clause, ...]
+    sort: Tuple[Tuple[str, bool], ...]   # (record field, descending)
+    fields: Tuple[str, ...]
+
+
+def _norm(value: Any) -> str:
+    return str(value).lower()
+
+
+def _filter_fields(collection: str) -> Dict[str, str]:
+    aliases = FILTER_FIELDS.get(collection)
+    if aliases is None:
+        raise ValueError(f"{collection} lists cannot be filtered or sorted")
+    return aliases
+
+
+def _resolve_field(collection: str, name: str) -> str:
+    aliases = _filter_fields(collection)
+    name = name.strip().lower()
+    if name in aliases:
+        return aliases[name]
+    if name in aliases.values():
+        return name
+    raise ValueError(
+        f"{collection} can be filtered by: {', '.join(sorted(aliases))} and tag:<key>=<value>"
+    )
+
+
+def _parse_filter(collection: str, raw: str) -> Tuple[Clause, ...]:
+    """`state=running|stopped,region=us-east-1,tag:env=prod` -> clauses (AND across, OR within)."""
+    clauses = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, value = part.partition("=")
+        if name.lower().startswith(TAG_PREFIX):
+            key = name[len(TAG_PREFIX):].strip()
+            if not key:
+                raise ValueError(f"Empty tag key in filter '{part}'")
+            values = frozenset(_norm(v) for v in value.split("|")) if sep else frozenset()
+            clauses.append(Clause(TAG_PREFIX + key.lower(), values))
+            continue
+        if not sep or not value:
+            raise ValueError(f"Filter '{part}' must look like field=value")
+        clauses.append(Clause(_resolve_field(collection, name), frozenset(_norm(v) for v in value.split("|"))))
+    return tuple(clauses)
+
+
+def _parse_sort(collection: str, raw: str) -> Tuple[Tuple[str, bool], ...]:
+    keys = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        name = part.lstrip("+-").strip()
+        try:
+            field = _resolve_field(collection, name)
+        except ValueError:
+            # Any record field can be sorted on; only filters need an index
+            field = name
+        keys.append((field, descending))
+    return tuple(keys)
+
+
+def parse_list_query(collection: str, filter_expr: Optional[str] = None, sort: Optional[str] = None,
+                     fields: Optional[str] = None) -> Optional[ListQuery]:
+    """Parse the `filter`, `sort` and `fields` list parameters; None when none were given.
+
+    Raises ValueError for unknown filter fields or malformed clauses.
+    """
+    if not (filter_expr or sort or fields):
+        return None
+    return ListQuery(
+        clauses=_parse_filter(collection, filter_expr or ""),
+        sort=_parse_sort(collection, sort or ""),
+        fields=tuple(f.strip() for f in (fields or "").split(",") if f.strip()),
+    )
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Numbers before strings (compared case-insensitively), None last
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, _norm(value))
+
+
+class RecordIndex:
+    """Secondary index over one items list: value -> positions per field, plus tags.
+
+    Built once per list (inventory cache entry or snapshot) and reused by
+    every filtered request against it.
+    """
+
+    def __init__(self, collection: str, items: List[Dict[str, Any]]):
+        self.items = items
+        self._postings: Dict[str, Dict[str, Set[int]]] = {
+            field: {} for field in set(_filter_fields(collection).values())
+        }
+        # tag:<key> -> value -> positions; the "" bucket holds every record with the key
+        self._tags: Dict[str, Dict[str, Set[int]]] = {}
+        self._orders: Dict[str, Tuple[List[int], List[int], int]] = {}
+        self._lock = threading.Lock()
+
+        for position, item in enumerate(items):
+            for field, postings in self._postings.items():
+                value = item.get(field)
+                if value is not None:
+                    postings.setdefault(_norm(value), set()).add(position)
+            for key, value in (item.get("tags") or {}).items():
+                by_value = self._tags.setdefault(TAG_PREFIX + key.lower(), {})
+                by_value.setdefault("", set()).add(position)
+                by_value.setdefault(_norm(value), set()).add(position)
+
+    def _postings_for(self, clause: Clause) -> List[Set[int]]:
+        by_value = (self._tags if clause.field.startswith(TAG_PREFIX) else self._postings).get(clause.field, {})
+        if not clause.values:
+            return [by_value.get("", set())]
+        return [by_value[v] for v in clause.values if v in by_value]
+
+    def select(self, clauses: Tuple[Clause, ...]) -> Optional[Set[int]]:
+        """Positions matching every clause, or None for "all records". Never mutate the result."""
+        if not clauses:
+            return None
+        groups = sorted((self._postings_for(c) for c in clauses), key=lambda g: sum(map(len, g)))
+        # Start from the rarest clause; later clauses only probe membership,
+        # so the work is bounded by that clause rather than by the list size
+        first = groups[0]
+        result = first[0] if len(first) == 1 else set().union(*first)
+        for group in groups[1:]:
+            if not result:
+                break
+            if len(group) == 1:
+                result = result & group[0]
+            else:
+                result = {p for p in result if any(p in s for s in group)}
+        return result
+
+    def _ranks(self, field: str) -> Tuple[List[int], List[int], int]:
+        """(positions in `field` order, rank per position, rank count); equal values share a rank."""
+        with self._lock:
+            cached = self._orders.get(field)
+            if cached is None:
+                keys = [_sort_key(item.get(field)) for item in self.items]
+                order = sorted(range(len(keys)), key=keys.__getitem__)
+                ranks = [0] * len(keys)
+                rank, previous = 0, None
+                for n, position in enumerate(order):
+                    if n and keys[position] != previous:
+                        rank += 1
+                    ranks[position] = rank
+                    previous = keys[position]
+                cached = self._orders[field] = (order, ranks, rank + 1)
+            return cached
+
+    def ordered(self, positions: Optional[Set[int]], sort: Tuple[Tuple[str, bool], ...]) -> List[int]:
+        if not sort:
+            return list(range(len(self.items))) if positions is None else sorted(positions)
+        if len(sort) == 1 and not sort[0][1] and (positions is None or len(positions) * 8 > len(self.items)):
+            # Large ascending selections walk the cached order instead of sorting
+            order = self._ranks(sort[0][0])[0]
+            return list(order) if positions is None else [i for i in order if i in positions]
+        candidates = list(range(len(self.items))) if positions is None else sorted(positions)
+        # Fold each column's rank into one integer key (position last, so ties
+        # keep list order); sorting plain ints avoids per-comparison tuple work
+        keys = [0] * len(candidates)
+        for field, descending in sort:
+            _, ranks, count = self._ranks(field)
+            if descending:
+                keys = [k * count + count - 1 - ranks[i] for k, i in zip(keys, candidates)]
+            else:
+                keys = [k * count + ranks[i] for k, i in zip(keys, candidates)]
+        size = len(self.items)
+        return [i for _, i in sorted(zip([k * size + i for k, i in zip(keys, candidates)], candidates))]
+
+
+_index_cache: "OrderedDict[Tuple[str, int], RecordIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def index_for(collection: str, items: List[Dict[str, Any]]) -> RecordIndex:
+    """The index for this exact items list, building it on first use."""
+    key = (collection, id(items))
+    with _index_lock:
+        index = _index_cache.get(key)
+        # The index holds a reference to its list, so the id cannot be reused while cached
+        if index is not None and index.items is items:
+            _index_cache.move_to_end(key)
+            return index
+    index = RecordIndex(collection, items)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    logger.info(f"🗂️ Built {collection} index over {len(items)} records")
+    return index
+
+
+def apply_list_query(collection: str, envelope: Dict[str, Any], query: Optional[ListQuery]) -> Dict[str, Any]:
+    """Filter, sort and project a list envelope's items; other envelope keys pass through."""
+    if query is None:
+        return envelope
+    items = envelope.get("items") or []
+    index = index_for(collection, items)
+    positions = index.ordered(index.select(query.clauses), query.sort)
+    if query.fields:
+        fields = query.fields
+        selected = [{f: items[i][f] for f in fields if f in items[i]} for i in positions]
+    else:
+        selected = [items[i] for i in positions]
+    return {**envelope, "items": selected, "total_items": len(items), "matched_items": len(selected)}
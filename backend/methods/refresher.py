@@ -0,0 +1,98 @@
+# methods/refresher.py
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from methods.delta import record_hashes
+from methods.inventory import DEFAULT_SUBSCRIPTION_ID, SECTIONS, collect_inventory
+from methods.search import sync_snapshot
+from methods.snapshots import SnapshotStore, get_snapshot_store
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Collection holding the latest refresh report
+REFRESH_STATUS = "_refresh"
+
+
+def _collector_status(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    timings = envelope.get("region_timings", {})
+    errors = [f"{f['region']}: {f['error']}" for f in envelope.get("failed_regions", [])]
+    errors += [f"{scope}: timed out" for scope in envelope.get("timed_out_regions", [])]
+    return {
+        # Scopes run concurrently, so the slowest one is the collector's wall time
+        "duration_seconds": max(timings.values(), default=0.0),
+        "items": len(envelope.get("items", [])),
+        "errors": errors,
+    }
+
+
+def refresh_snapshots(store: Optional[SnapshotStore] = None,
+                      subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run every collector once and write one versioned snapshot per collector.
+
+    A collector with no successful scope keeps its previous snapshot; the
+    refresh report records duration, item count, errors and the written
+    version for each collector.
+    """
+    store = store or get_snapshot_store()
+    subscription_id = subscription_id or DEFAULT_SUBSCRIPTION_ID
+    started = time.monotonic()
+    generated_at = datetime.now(timezone.utc)
+    logger.info("🔄 Inventory snapshot refresh START")
+
+    document = collect_inventory(subscription_id=subscription_id)
+
+    collectors: Dict[str, Any] = {}
+    for section in SECTIONS:
+        envelope = document[section]
+        status = _collector_status(envelope)
+        if envelope.get("skipped"):
+            status["skipped"] = envelope["skipped"]
+        elif status["errors"] and not envelope["completed_regions"]:
+            logger.warning(f"⚠️ {section}: every scope failed, keeping the previous snapshot")
+        else:
+            snapshot = {
+                "collector": section,
+                "generated_at": generated_at,
+                "subscription_id": subscription_id if section.startswith("azure_") else None,
+                "data": envelope,
+                "hashes": record_hashes(section, envelope["items"]),
+            }
+            try:
+                status["version"] = store.write(section, snapshot)
+            except Exception as e:
+                logger.error(f"💥 Writing {section} snapshot failed: {str(e)}", exc_info=True)
+                status["errors"].append(f"store: {str(e)}")
+            else:
+                try:
+                    sync_snapshot(section, {**snapshot, "version": status["version"]})
+                except Exception as e:
+                    logger.warning(f"⚠️ Search index update for {section} failed: {str(e)}")
+        collectors[section] = status
+
+    report = {
+        "generated_at": generated_at,
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "collectors": collectors,
+    }
+    store.write(REFRESH_STATUS, report)
+    logger.info(f"🎉 Inventory snapshot refresh done in {report['duration_seconds']:.2f}s")
+    return report
+
+
+def read_snapshot_envelope(collection: str, store: Optional[SnapshotStore] = None) -> Optional[Dict[str, Any]]:
+    """The latest snapshot of a collection as a list envelope, or None if none exists yet."""
+    document = (store or get_snapshot_store()).read(collection)
+    if document is None:
+        return None
+    return {
+        **document["data"],
+        "generated_at": document["generated_at"],
+        "subscription_id": document.get("subscription_id"),
+        "snapshot_version": document["version"],
+        "source": "snapshot",
+    }
@@ -0,0 +1,395 @@
+# methods/search.py
+
+import os
+import bisect
+import heapq
+import re
+import threading
+import time
+import concurrent.futures
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from methods.aws.auth import get_aws_account_key
+from methods.cache import inventory_cache
+from methods.delta import record_hashes, record_key
+from methods.snapshots import SnapshotStore, get_snapshot_store
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+SEARCH_SYNC_INTERVAL_SECONDS = float(os.environ.get("SEARCH_SYNC_INTERVAL_SECONDS", "30"))
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_MIN_TERM_LENGTH = 2
+
+# collection -> [(record field, weight)]; identifiers outrank addresses, which outrank tags
+INDEXED_FIELDS: Dict[str, List[Tuple[str, float]]] = {
+    "ec2": [("name", 3.0), ("instance_id", 3.0), ("public_ip", 2.0), ("private_ip", 2.0)],
+    "rds": [("db_instance_identifier", 3.0), ("endpoint_address", 2.0), ("engine", 1.0)],
+    "eks": [("name", 3.0), ("arn", 2.0)],
+    "s3": [("name", 3.0)],
+    "azure_functions": [("name", 3.0), ("id", 2.0), ("resource_group", 1.0)],
+    "azure_storage": [("name", 3.0), ("id", 2.0), ("resource_group", 1.0)],
+}
+TAG_WEIGHT = 1.0
+# A term equal to a whole token scores this much more than a prefix match
+EXACT_BONUS = 2.0
+# Above this many vocabulary changes per sync, re-sort once instead of bisecting each
+VOCABULARY_BATCH = 256
+
+
+def _detail_params(collection: str, record: Dict[str, Any], partition: str) -> Tuple[str, Dict[str, str]]:
+    if collection == "ec2":
+        return "/aws/ec2/details", {"instance_id": record["instance_id"], "region": record["region"]}
+    if collection == "rds":
+        return "/aws/rds/details", {"instance_id": record["db_instance_identifier"], "region": record["region"]}
+    if collection == "eks":
+        return "/aws/eks/details", {"name": record["name"], "region": record["region"]}
+    if collection == "s3":
+        return "/aws/s3/details", {"bucket_name": record["name"]}
+    route = "/azure/functions/details" if collection == "azure_functions" else "/azure/storage/details"
+    return route, {
+        "subscription_id": record.get("subscription_id") or partition,
+        "resource_group": record.get("resource_group"),
+        "name": record["name"],
+    }
+
+
+def detail_url(collection: str, record: Dict[str, Any], partition: str) -> str:
+    route, params = _detail_params(collection, record, partition)
+    return f"{route}?{urlencode(params)}"
+
+
+_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def _tokens(value: Any) -> Set[str]:
+    """The whole lower-cased value plus its alphanumeric parts ("10.0.1.5" -> 10.0.1.5, 10, 0, 1, 5)."""
+    if value is None or value == "":
+        return set()
+    text = str(value).lower()
+    tokens = {text}
+    tokens.update(part for part in _SPLIT.split(text) if part)
+    return tokens
+
+
+def _record_tokens(collection: str, record: Dict[str, Any]) -> Dict[str, float]:
+    """token -> best field weight for one record."""
+    weights: Dict[str, float] = {}
+
+    def add(tokens: Iterable[str], weight: float):
+        for token in tokens:
+            if weights.get(token, 0.0) < weight:
+                weights[token] = weight
+
+    for field, weight in INDEXED_FIELDS[collection]:
+        add(_tokens(record.get(field)), weight)
+    for key, value in (record.get("tags") or {}).items():
+        add(_tokens(key), TAG_WEIGHT)
+        add(_tokens(value), TAG_WEIGHT)
+        # "team=payments" matches the pair exactly
+        add((f"{key}={value}".lower(),), TAG_WEIGHT)
+    return weights
+
+
+# (collection, partition, record key); partition = AWS account or Azure subscription scope
+DocId = Tuple[str, str, str]
+
+
+class SearchIndex:
+    """Inverted index over the list records of every collector, kept in sync by diffing.
+
+    Each (collection, partition) is replaced with `sync`, which compares
+    per-record content hashes with what is indexed and only re-tokenizes
+    records that were added or modified. The vocabulary is a sorted list
+    so prefix lookups are two bisects.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[DocId, float]] = {}
+        self._vocabulary: List[str] = []
+        self._docs: Dict[DocId, Tuple[str, Dict[str, Any], Dict[str, float]]] = {}   # -> (hash, record, tokens)
+        self._partitions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._members: Dict[Tuple[str, str], Set[str]] = {}
+        self.stats = {"syncs": 0, "added": 0, "modified": 0, "removed": 0}
+
+    # -- maintenance --------------------------------------------------------
+    def _add_doc(self, doc_id: DocId, content_hash: str, record: Dict[str, Any], changed: Set[str]):
+        tokens = _record_tokens(doc_id[0], record)
+        self._docs[doc_id] = (content_hash, record, tokens)
+        for token, weight in tokens.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                changed.add(token)
+            posting[doc_id] = weight
+
+    def _remove_doc(self, doc_id: DocId, changed: Set[str]):
+        _, _, tokens = self._docs.pop(doc_id)
+        for token in tokens:
+            posting = self._postings[token]
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[token]
+                changed.add(token)
+
+    def _update_vocabulary(self, changed: Set[str]):
+        """Apply tokens that gained their first or lost their last document."""
+        if len(changed) > VOCABULARY_BATCH:
+            self._vocabulary = sorted(self._postings)
+            return
+        for token in changed:
+            at = bisect.bisect_left(self._vocabulary, token)
+            present = at < len(self._vocabulary) and self._vocabulary[at] == token
+            if token in self._postings and not present:
+                self._vocabulary.insert(at, token)
+            elif token not in self._postings and present:
+                del self._vocabulary[at]
+
+    def sync(self, collection: str, partition: str, items: List[Dict[str, Any]],
+             version: Optional[str] = None, hashes: Optional[Dict[str, str]] = None,
+             source: str = "list", complete: bool = True) -> Dict[str, int]:
+        """Make the indexed records of (collection, partition) equal to `items`.
+
+        With `complete=False` (some regions or subscriptions failed) records
+        missing from `items` are kept rather than removed.
+        """
+        started = time.monotonic()
+        hashes = hashes or record_hashes(collection, items)
+        by_key = {record_key(collection, item): item for item in items}
+        changed: Set[str] = set()
+        with self._lock:
+            members = self._members.setdefault((collection, partition), set())
+            counts = {"added": 0, "modified": 0, "removed": 0}
+            if complete:
+                for key in [k for k in members if k not in hashes]:
+                    self._remove_doc((collection, partition, key), changed)
+                    members.discard(key)
+                    counts["removed"] += 1
+            for key, content_hash in hashes.items():
+                doc_id = (collection, partition, key)
+                current = self._docs.get(doc_id)
+                if current is not None and current[0] == content_hash:
+                    continue
+                if current is not None:
+                    self._remove_doc(doc_id, changed)
+                    counts["modified"] += 1
+                else:
+                    counts["added"] += 1
+                    members.add(key)
+                self._add_doc(doc_id, content_hash, by_key[key], changed)
+            self._update_vocabulary(changed)
+            self._partitions[(collection, partition)] = {
+                "version": version, "source": source, "documents": len(members), "synced_at": time.time(),
+            }
+            self.stats["syncs"] += 1
+            for name, count in counts.items():
+                self.stats[name] += count
+        logger.info(
+            f"🔎 Search index {collection}/{partition} from {source}: +{counts['added']} "
+            f"~{counts['modified']} -{counts['removed']} in {time.monotonic() - started:.3f}s"
+        )
+        return counts
+
+    def indexed_version(self, collection: str, partition: str) -> Optional[str]:
+        with self._lock:
+            return (self._partitions.get((collection, partition)) or {}).get("version")
+
+    # -- queries ------------------------------------------------------------
+    def _prefix_matches(self, term: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, collections: Optional[Iterable[str]] = None,
+               limit: int = SEARCH_DEFAULT_LIMIT) -> Dict[str, Any]:
+        """Documents matching every term of `query` by prefix, best first."""
+        terms = [t for t in query.lower().split() if t]
+        wanted = set(collections) if collections else None
+        with self._lock:
+            scores: Optional[Dict[DocId, float]] = None
+            for term in terms:
+                term_scores: Dict[DocId, float] = {}
+                for token in self._prefix_matches(term):
+                    bonus = EXACT_BONUS if token == term else 1.0
+                    for doc_id, weight in self._postings[token].items():
+                        if wanted is not None and doc_id[0] not in wanted:
+                            continue
+                        if scores is not None and doc_id not in scores:
+                            continue
+                        score = weight * bonus
+                        if term_scores.get(doc_id, 0.0) < score:
+                            term_scores[doc_id] = score
+                scores = term_scores if scores is None else {
+                    doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()
+                }
+                if not scores:
+                    break
+            scores = scores or {}
+
+            def rank(item):
+                return (-item[1], item[0])
+
+            # Only the head is ordered; overlapping partitions may need a few extra
+            ranked = heapq.nsmallest(2 * limit, scores.items(), key=rank)
+            results = self._results(ranked, terms, limit)
+            if len(results) < limit < len(scores):
+                results = self._results(sorted(scores.items(), key=rank), terms, limit)
+            return {
+                "query": query,
+                "results": results,
+                "total_matches": len(scores),
+                "indexed_documents": len(self._docs),
+            }
+
+    def _results(self, ranked: List[Tuple[DocId, float]], terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        results, seen = [], set()
+        for doc_id, score in ranked:
+            collection, partition, key = doc_id
+            # The same record can be indexed under overlapping partitions
+            if (collection, key) in seen:
+                continue
+            seen.add((collection, key))
+            _, record, tokens = self._docs[doc_id]
+            results.append({
+                "collection": collection,
+                "key": key,
+                "name": record.get("name") or record.get("db_instance_identifier"),
+                "region": record.get("region") or record.get("location"),
+                "score": round(score, 2),
+                "matched": sorted(t for t in tokens if any(t.startswith(term) for term in terms)),
+                "detail_url": detail_url(collection, record, partition),
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "tokens": len(self._vocabulary),
+                "partitions": {f"{c}/{p}": dict(info) for (c, p), info in self._partitions.items()},
+                **self.stats,
+            }
+
+
+search_index = SearchIndex()
+
+
+def _is_complete(envelope: Any) -> bool:
+    """False when a fan-out envelope reports failed or timed-out regions/subscriptions."""
+    if not isinstance(envelope, dict):
+        return True
+    return not any(envelope.get(k) for k in (
+        "failed_regions", "timed_out_regions", "failed_subscriptions", "timed_out_subscriptions"
+    ))
+
+
+def snapshot_partition(collection: str, document: Dict[str, Any]) -> str:
+    return (document.get("subscription_id") or "") if collection.startswith("azure_") else get_aws_account_key()
+
+
+def sync_snapshot(collection: str, document: Dict[str, Any], index: SearchIndex = search_index):
+    """Index a snapshot document written by the refresher (no-op if already indexed)."""
+    partition = snapshot_partition(collection, document)
+    if index.indexed_version(collection, partition) == document["version"]:
+        return
+    index.sync(collection, partition, document["data"]["items"], version=document["version"],
+               hashes=document.get("hashes"), source="snapshot", complete=_is_complete(document["data"]))
+
+
+_last_snapshot_sync = 0.0
+_snapshot_sync_lock = threading.Lock()
+
+
+def sync_from_snapshots(store: Optional[SnapshotStore] = None, force: bool = False):
+    """Pull snapshots written by other instances; at most once per SEARCH_SYNC_INTERVAL_SECONDS."""
+    global _last_snapshot_sync
+    with _snapshot_sync_lock:
+        if not force and time.monotonic() - _last_snapshot_sync < SEARCH_SYNC_INTERVAL_SECONDS:
+            return
+        _last_snapshot_sync = time.monotonic()
+    try:
+        store = store or get_snapshot_store()
+    except Exception as e:
+        logger.warning(f"⚠️ Search cannot read snapshots: {str(e)}")
+        return
+    for collection in INDEXED_FIELDS:
+        try:
+            document = store.read(collection)
+            if document is not None:
+                sync_snapshot(collection, document)
+        except Exception as e:
+            logger.warning(f"⚠️ Search sync of {collection} snapshot failed: {str(e)}")
+
+
+# inventory cache (provider, resource type) -> collection
+CACHE_COLLECTIONS = {
+    ("aws", "ec2"): "ec2",
+    ("aws", "rds"): "rds",
+    ("aws", "eks"): "eks",
+    ("aws", "s3"): "s3",
+    ("azure", "functions"): "azure_functions",
+    ("azure", "storage"): "azure_storage",
+}
+
+# One worker keeps index updates off request threads and in arrival order
+_sync_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-index")
+
+
+def _is_full_list(collection: str, scope: str) -> bool:
+    # Region/prefix-filtered lists are partial and must not remove other records;
+    # the EKS scope's second part is `include`, which does not filter
+    parts = scope.split("|")
+    if collection == "eks":
+        parts = parts[:1]
+    return all(part == "*" for part in parts)
+
+
+def on_inventory_loaded(key: Tuple[str, str, str, str], data: Any):
+    """Inventory cache listener: re-sync the index when a full list is (re)loaded."""
+    provider, resource_type, account, scope = key
+    collection = CACHE_COLLECTIONS.get((provider, resource_type))
+    if collection is None or not _is_full_list(collection, scope):
+        return
+    items = data.get("items", []) if isinstance(data, dict) else data
+    _sync_executor.submit(_sync_quietly, collection, account, items, _is_complete(data))
+
+
+def _sync_quietly(collection: str, partition: str, items: List[Dict[str, Any]], complete: bool):
+    try:
+        search_index.sync(collection, partition, items, source="list", complete=complete)
+    except Exception as e:
+        logger.warning(f"⚠️ Search index sync of {collection} failed: {str(e)}", exc_info=True)
+
+
+inventory_cache.subscribe(on_inventory_loaded)
+
+
+def parse_search_types(raw: Optional[str]) -> Optional[List[str]]:
+    """`types=ec2,azure_storage` -> collections (None = all); raises ValueError on unknown names."""
+    if not raw:
+        return None
+    requested = [t.strip().lower() for t in raw.split(",") if t.strip()]
+    unknown = [t for t in requested if t not in INDEXED_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown search types: {', '.join(unknown)}")
+    return requested
+
+
+def search_inventory(query: str, types: Optional[str] = None, limit: int = SEARCH_DEFAULT_LIMIT) -> Dict[str, Any]:
+    """Ranked cross-resource search; raises ValueError for a missing or too-short query."""
+    query = (query or "").strip()
+    if len(query) < SEARCH_MIN_TERM_LENGTH:
+        raise ValueError(f"q must be at least {SEARCH_MIN_TERM_LENGTH} characters")
+    collections = parse_search_types(types)
+    started = time.monotonic()
+    sync_from_snapshots()
+    result = search_index.search(query, collections, max(1, min(limit, SEARCH_MAX_LIMIT)))
+    result["duration_ms"] = round((time.monotonic() - started) * 1000, 2)
+    return result
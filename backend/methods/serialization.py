@@ -0,0 +1,85 @@
+# methods/serialization.py
+
+import os
+import json
+import enum
+import decimal
+from datetime import date, datetime
+from typing import Any
+
+# orjson is optional; the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgpack is optional; application/msgpack is only offered when it is installed
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON backends don't handle natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if hasattr(obj, "as_dict"):
+        # Azure SDK (msrest / azure-core) models
+        return obj.as_dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    # datetime, date and Enum are encoded natively; _default handles the rest
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+BACKENDS = {"stdlib": _stdlib_dumps}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_dumps
+
+_requested = os.environ.get("JSON_BACKEND", "orjson" if orjson is not None else "stdlib")
+if _requested not in BACKENDS:
+    logger.warning(f"⚠️ JSON_BACKEND={_requested} unavailable, using stdlib")
+    _requested = "stdlib"
+BACKEND = _requested
+_dumps = BACKENDS[BACKEND]
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with the configured backend."""
+    return _dumps(obj)
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """Serialize to MessagePack; non-native types are encoded like the JSON backends."""
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def msgpack_map_header(size: int) -> bytes:
+    """The bytes that open a MessagePack map of `size` pairs."""
+    return msgpack.Packer().pack_map_header(size)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
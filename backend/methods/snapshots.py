@@ -0,0 +1,218 @@
+# methods/snapshots.py
+
+import os
+import re
+from abc import ABC, abstractmethod
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from methods import serialization
+from methods.aws.auth import is_running_in_azure
+
+# azure-storage-blob is only needed for the blob backend
+try:
+    from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+    from azure.storage.blob import BlobServiceClient
+except ImportError:
+    BlobServiceClient = None
+
+# Configure logging
+import logging
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_STORE = os.environ.get("SNAPSHOT_STORE", "blob" if is_running_in_azure() else "file").lower()
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "inventory-snapshots"))
+SNAPSHOT_BLOB_CONTAINER = os.environ.get("SNAPSHOT_BLOB_CONTAINER", "inventory-snapshots")
+SNAPSHOT_RETENTION = int(os.environ.get("SNAPSHOT_RETENTION", "48"))
+
+LATEST = "latest"
+VERSION_PATTERN = re.compile(r"^\d{15}$")
+
+
+def new_version() -> str:
+    """Sortable snapshot version: zero-padded epoch milliseconds."""
+    return f"{int(time.time() * 1000):015d}"
+
+
+def is_version(value: Optional[str]) -> bool:
+    """True for strings in the new_version() format."""
+    return bool(value) and VERSION_PATTERN.match(value) is not None
+
+
+class SnapshotStore(ABC):
+    """Versioned JSON documents per collection (e.g. "ec2", "azure_storage").
+
+    Backends implement the four raw operations; pruning, the latest
+    pointer and in-process memoization of documents live here.
+    """
+
+    def __init__(self, retention: int = SNAPSHOT_RETENTION):
+        self._retention = max(1, retention)
+        self._memo: Dict[tuple, Dict[str, Any]] = {}
+        self._memo_lock = threading.Lock()
+
+    # -- backend operations -------------------------------------------------
+    @abstractmethod
+    def _put(self, name: str, data: bytes):
+        ...
+
+    @abstractmethod
+    def _get(self, name: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def _list(self, prefix: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    def _delete(self, name: str):
+        ...
+
+    # -- public API ---------------------------------------------------------
+    def write(self, collection: str, document: Dict[str, Any], version: Optional[str] = None) -> str:
+        version = version or new_version()
+        document = {**document, "version": version}
+        self._put(f"{collection}/{version}.json", serialization.dumps(document))
+        self._put(f"{collection}/{LATEST}", version.encode("ascii"))
+        self._prune(collection)
+        logger.info(f"💾 Wrote {collection} snapshot {version}")
+        return version
+
+    def versions(self, collection: str) -> List[str]:
+        names = self._list(f"{collection}/")
+        return sorted(n.rsplit("/", 1)[-1][:-len(".json")] for n in names if n.endswith(".json"))
+
+    def latest_version(self, collection: str) -> Optional[str]:
+        raw = self._get(f"{collection}/{LATEST}")
+        return raw.decode("ascii").strip() if raw else None
+
+    def read(self, collection: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """A snapshot document (the latest when `version` is None), or None if missing."""
+        version = version or self.latest_version(collection)
+        if not version:
+            return None
+        key = (collection, version)
+        with self._memo_lock:
+            if key in self._memo:
+                return self._memo[key]
+        raw = self._get(f"{collection}/{version}.json")
+        if raw is None:
+            return None
+        document = serialization.loads(raw)
+        with self._memo_lock:
+            # Snapshots are immutable, so a handful of recent ones can stay decoded
+            if len(self._memo) >= 4 * self._retention:
+                self._memo.clear()
+            self._memo[key] = document
+        return document
+
+    def _prune(self, collection: str):
+        for version in self.versions(collection)[:-self._retention]:
+            self._delete(f"{collection}/{version}.json")
+            with self._memo_lock:
+                self._memo.pop((collection, version), None)
+
+
+class FileSnapshotStore(SnapshotStore):
+    """Snapshots as files under a local directory (tests, local runs)."""
+
+    def __init__(self, root: str = SNAPSHOT_DIR, **kwargs):
+        super().__init__(**kwargs)
+        self._root = root
+
+    def _path(self, name: str) -> str:
+        parts = name.split("/")
+        # Names are built from request parameters; never let one leave the root
+        if any(p in ("", ".", "..") or os.path.isabs(p) or os.sep in p or (os.altsep and os.altsep in p)
+               for p in parts):
+            raise ValueError(f"Invalid snapshot name: {name!r}")
+        return os.path.join(self._root, *parts)
+
+    def _put(self, name: str, data: bytes):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so readers never see a partial document
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _get(self, name: str) -> Optional[bytes]:
+        try:
+            with open(self._path(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _list(self, prefix: str) -> List[str]:
+        directory = self._path(prefix.rstrip("/"))
+        if not os.path.isdir(directory):
+            return []
+        return [f"{prefix}{name}" for name in os.listdir(directory)]
+
+    def _delete(self, name: str):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+class BlobSnapshotStore(SnapshotStore):
+    """Snapshots as blobs in one container; works against Azure Storage and Azurite."""
+
+    def __init__(self, connection_string: str, container: str = SNAPSHOT_BLOB_CONTAINER, **kwargs):
+        super().__init__(**kwargs)
+        if BlobServiceClient is None:
+            raise RuntimeError("azure-storage-blob is required for SNAPSHOT_STORE=blob")
+        service = BlobServiceClient.from_connection_string(connection_string)
+        self._container = service.get_container_client(container)
+        try:
+            self._container.create_container()
+        except ResourceExistsError:
+            pass
+
+    def _put(self, name: str, data: bytes):
+        self._container.upload_blob(name, data, overwrite=True)
+
+    def _get(self, name: str) -> Optional[bytes]:
+        try:
+            return self._container.download_blob(name).readall()
+        except ResourceNotFoundError:
+            return None
+
+    def _list(self, prefix: str) -> List[str]:
+        return [blob.name for blob in self._container.list_blobs(name_starts_with=prefix)]
+
+    def _delete(self, name: str):
+        try:
+            self._container.delete_blob(name)
+        except ResourceNotFoundError:
+            pass
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Process-wide store selected by SNAPSHOT_STORE (file | blob)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if SNAPSHOT_STORE == "blob":
+                connection_string = (os.environ.get("SNAPSHOT_BLOB_CONNECTION_STRING")
+                                     or os.environ.get("AzureWebJobsStorage"))
+                if not connection_string:
+                    # e.g. identity-based AzureWebJobsStorage__accountName has no connection string
+                    raise RuntimeError(
+                        "SNAPSHOT_STORE=blob needs SNAPSHOT_BLOB_CONNECTION_STRING or an "
+                        "AzureWebJobsStorage connection string (or set SNAPSHOT_STORE=file)"
+                    )
+                _store = BlobSnapshotStore(connection_string)
+            else:
+                _store = FileSnapshotStore()
+            logger.info(f"🗄️ Snapshot store: {type(_store).__name__}")
+        return _store
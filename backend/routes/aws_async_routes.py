@@ -0,0 +1,263 @@
+# routes/aws_async_routes.py - async variants of routes/aws_routes.py (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from routes.snapshot_helpers import snapshot_list_response, wants_snapshot
+from routes.http_helpers import http_json_response, http_list_response, cache_scope, list_query, buffered_ndjson_response_async, wants_ndjson, wants_refresh
+
+# Import your methods
+from methods.async_support import run_blocking
+from methods.aws.auth import get_aws_account_key
+from methods.aws.batch import parse_batch_ids
+from methods.aws.regions import get_account_regions
+from methods.prefetch import cached_details, schedule_prefetch
+from methods.query import apply_list_query
+from methods.cache import cached_inventory_async
+from methods.aws.pagination import DEFAULT_LIMIT, InvalidCursorError, decode_cursor, parse_limit
+from methods.aws.s3 import get_s3_buckets_with_metadata, get_s3_bucket_details, list_s3_buckets_page
+from methods.aws.eks import parse_include, list_all_eks_clusters_async, get_eks_cluster_details, list_eks_clusters_page, stream_all_eks_clusters_async
+from methods.aws.rds import list_all_rds_instances_async, get_rds_instance_details, get_rds_instance_details_batch, list_rds_instances_page, stream_all_rds_instances_async
+from methods.aws.ec2 import list_all_ec2_instances_async, get_ec2_instance_details, get_ec2_instance_details_batch, list_ec2_instances_page, stream_all_ec2_instances_async
+
+async def _batch_details_response(req: func.HttpRequest, label: str, ids: str, fetch_batch) -> func.HttpResponse:
+    """?ids= lookup: 400 only for malformed ids; STS/region or batch failures are JSON 500s."""
+    try:
+        account_regions = await run_blocking(get_account_regions)
+        try:
+            batch_ids = parse_batch_ids(ids, account_regions)
+        except ValueError as e:
+            return http_json_response(data=None, error_message=str(e), status_code=400)
+        data = await run_blocking(fetch_batch, batch_ids)
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 {label} batch details failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+# PLAIN ASYNC FUNCTIONS - NO @app.route()
+async def list_s3(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_s3 (async) START")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "s3")
+    try:
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        prefix = req.params.get("prefix")
+        region = req.params.get("region")
+        if limit or next_token:
+            data = await run_blocking(
+                list_s3_buckets_page,
+                limit=limit or DEFAULT_LIMIT, next_token=next_token, prefix=prefix, region=region
+            )
+        else:
+            data = await cached_inventory_async(
+                "aws", "s3", get_aws_account_key(), cache_scope(prefix, region),
+                lambda: run_blocking(get_s3_buckets_with_metadata, prefix=prefix, region=region),
+                force_refresh=wants_refresh(req),
+            )
+        return http_list_response(data, req)
+    except InvalidCursorError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 S3 list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def list_eks(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_eks (async) START")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "eks")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "eks", pageable=True)
+        include = parse_include(req.params.get("include"))
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "eks")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        if wants_ndjson(req):
+            return await buffered_ndjson_response_async(stream_all_eks_clusters_async(regions=regions, include=include), req)
+        if limit or next_token:
+            data = await run_blocking(
+                list_eks_clusters_page, regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token, include=include
+            )
+        else:
+            data = await cached_inventory_async(
+                "aws", "eks", get_aws_account_key(), cache_scope(regions, ",".join(include)),
+                lambda: list_all_eks_clusters_async(regions=regions, include=include),
+                force_refresh=wants_refresh(req),
+            )
+        queried = await run_blocking(apply_list_query, "eks", data, query) if query else data
+        # After the query, so the prefetcher reuses the index built off the event loop
+        schedule_prefetch("eks", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 EKS list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def eks_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 eks_details (async) START")
+    name = req.params.get("name")
+    region = req.params.get("region")
+    if not all([name, region]):
+        return http_json_response(
+            data=None,
+            error_message="Missing: name and region",
+            status_code=400
+        )
+    data = await run_blocking(
+        cached_details, "eks", region, name,
+        lambda: get_eks_cluster_details(name, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
+
+async def s3_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 s3_details (async) START")
+    bucket_name = req.params.get("bucket_name")
+    if not bucket_name:
+        return http_json_response(
+            data=None,
+            error_message="bucket_name required",
+            status_code=400
+        )
+    data = await run_blocking(get_s3_bucket_details, bucket_name)
+    return http_json_response(data, 200, req=req)
+
+async def list_rds(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_rds (async) START")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "rds")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "rds", pageable=True)
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "rds")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        if wants_ndjson(req):
+            return await buffered_ndjson_response_async(stream_all_rds_instances_async(regions=regions), req)
+        if limit or next_token:
+            data = await run_blocking(
+                list_rds_instances_page, regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token
+            )
+        else:
+            data = await cached_inventory_async(
+                "aws", "rds", get_aws_account_key(), cache_scope(regions),
+                lambda: list_all_rds_instances_async(regions=regions),
+                force_refresh=wants_refresh(req),
+            )
+        queried = await run_blocking(apply_list_query, "rds", data, query) if query else data
+        # After the query, so the prefetcher reuses the index built off the event loop
+        schedule_prefetch("rds", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 RDS list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def rds_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 rds_details (async) START")
+    ids = req.params.get("ids")
+    if ids:
+        return await _batch_details_response(req, "RDS", ids, get_rds_instance_details_batch)
+    instance_id = req.params.get("instance_id")
+    region = req.params.get("region")
+    if not all([instance_id, region]):
+        return http_json_response(
+            data=None,
+            error_message="Missing: instance_id and region",
+            status_code=400
+        )
+    data = await run_blocking(
+        cached_details, "rds", region, instance_id,
+        lambda: get_rds_instance_details(instance_id, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
+
+async def list_ec2(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_ec2 (async) START")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "ec2")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "ec2", pageable=True)
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "ec2")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        if wants_ndjson(req):
+            return await buffered_ndjson_response_async(stream_all_ec2_instances_async(regions=regions), req)
+        if limit or next_token:
+            data = await run_blocking(
+                list_ec2_instances_page, regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token
+            )
+        else:
+            data = await cached_inventory_async(
+                "aws", "ec2", get_aws_account_key(), cache_scope(regions),
+                lambda: list_all_ec2_instances_async(regions=regions),
+                force_refresh=wants_refresh(req),
+            )
+        queried = await run_blocking(apply_list_query, "ec2", data, query) if query else data
+        # After the query, so the prefetcher reuses the index built off the event loop
+        schedule_prefetch("ec2", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 EC2 list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def ec2_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 ec2_details (async) START")
+    ids = req.params.get("ids")
+    if ids:
+        return await _batch_details_response(req, "EC2", ids, get_ec2_instance_details_batch)
+    instance_id = req.params.get("instance_id")
+    region = req.params.get("region")
+    if not all([instance_id, region]):
+        return http_json_response(
+            data=None,
+            error_message="Missing: instance_id and region",
+            status_code=400
+        )
+    data = await run_blocking(
+        cached_details, "ec2", region, instance_id,
+        lambda: get_ec2_instance_details(instance_id, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
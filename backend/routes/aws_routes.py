@@ -2,37 +2,66 @@
 
 import azure.functions as func
 import logging
-from datetime import datetime
-import json
 
 logger = logging.getLogger(__name__)
 
-def http_json_response(data, status_code=200, error_message=None):
-    if error_message:
-        body = {
-            "error": error_message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    else:
-        body = data
-    return func.HttpResponse(
-        json.dumps(body, default=str),
-        mimetype="application/json",
-        status_code=status_code
-    )
+from routes.snapshot_helpers import snapshot_list_response, wants_snapshot
+from routes.http_helpers import http_json_response, http_list_response, cache_scope, list_query, buffered_ndjson_response, wants_ndjson, wants_refresh
 
 # Import your methods
-from methods.aws.s3 import get_s3_buckets_with_metadata, get_s3_bucket_details
-from methods.aws.eks import list_all_eks_clusters, get_eks_cluster_details
-from methods.aws.rds import list_all_rds_instances, get_rds_instance_details
-from methods.aws.ec2 import list_all_ec2_instances, get_ec2_instance_details
+from methods.aws.auth import get_aws_account_key
+from methods.aws.batch import parse_batch_ids
+from methods.aws.regions import get_account_regions
+from methods.prefetch import cached_details, schedule_prefetch
+from methods.query import apply_list_query
+from methods.cache import cached_inventory
+from methods.aws.pagination import DEFAULT_LIMIT, InvalidCursorError, decode_cursor, parse_limit
+from methods.aws.s3 import get_s3_buckets_with_metadata, get_s3_bucket_details, list_s3_buckets_page
+from methods.aws.eks import parse_include, list_all_eks_clusters, get_eks_cluster_details, list_eks_clusters_page, stream_all_eks_clusters
+from methods.aws.rds import list_all_rds_instances, get_rds_instance_details, get_rds_instance_details_batch, list_rds_instances_page, stream_all_rds_instances
+from methods.aws.ec2 import list_all_ec2_instances, get_ec2_instance_details, get_ec2_instance_details_batch, list_ec2_instances_page, stream_all_ec2_instances
+
+def _batch_details_response(req: func.HttpRequest, label: str, ids: str, fetch_batch) -> func.HttpResponse:
+    """?ids= lookup: 400 only for malformed ids; STS/region or batch failures are JSON 500s."""
+    try:
+        account_regions = get_account_regions()
+        try:
+            batch_ids = parse_batch_ids(ids, account_regions)
+        except ValueError as e:
+            return http_json_response(data=None, error_message=str(e), status_code=400)
+        data = fetch_batch(batch_ids)
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 {label} batch details failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
 
 # PLAIN FUNCTIONS - NO @app.route()
 def list_s3(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_s3 START")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "s3")
     try:
-        data = get_s3_buckets_with_metadata()
-        return http_json_response(data, 200)
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        prefix = req.params.get("prefix")
+        region = req.params.get("region")
+        if limit or next_token:
+            data = list_s3_buckets_page(
+                limit=limit or DEFAULT_LIMIT, next_token=next_token, prefix=prefix, region=region
+            )
+        else:
+            data = cached_inventory(
+                "aws", "s3", get_aws_account_key(), cache_scope(prefix, region),
+                lambda: get_s3_buckets_with_metadata(prefix=prefix, region=region),
+                force_refresh=wants_refresh(req),
+            )
+        return http_list_response(data, req)
+    except InvalidCursorError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 S3 list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -43,9 +72,35 @@ def list_s3(req: func.HttpRequest) -> func.HttpResponse:
 
 def list_eks(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_eks START")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "eks")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "eks", pageable=True)
+        include = parse_include(req.params.get("include"))
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "eks")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     try:
-        data = list_all_eks_clusters()
-        return http_json_response(data, 200)
+        if wants_ndjson(req):
+            return buffered_ndjson_response(stream_all_eks_clusters(regions=regions, include=include), req)
+        if limit or next_token:
+            data = list_eks_clusters_page(regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token, include=include)
+        else:
+            data = cached_inventory(
+                "aws", "eks", get_aws_account_key(), cache_scope(regions, ",".join(include)),
+                lambda: list_all_eks_clusters(regions=regions, include=include),
+                force_refresh=wants_refresh(req),
+            )
+        queried = apply_list_query("eks", data, query)
+        schedule_prefetch("eks", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 EKS list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -64,8 +119,11 @@ def eks_details(req: func.HttpRequest) -> func.HttpResponse:
             error_message="Missing: name and region",
             status_code=400
         )
-    data = get_eks_cluster_details(name, region)
-    return http_json_response(data, 200)
+    data = cached_details(
+        "eks", region, name,
+        lambda: get_eks_cluster_details(name, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
 
 def s3_details(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 s3_details START")
@@ -77,13 +135,38 @@ def s3_details(req: func.HttpRequest) -> func.HttpResponse:
             status_code=400
         )
     data = get_s3_bucket_details(bucket_name)
-    return http_json_response(data, 200)
+    return http_json_response(data, 200, req=req)
 
 def list_rds(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_rds START")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "rds")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "rds", pageable=True)
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "rds")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     try:
-        data = list_all_rds_instances()
-        return http_json_response(data, 200)
+        if wants_ndjson(req):
+            return buffered_ndjson_response(stream_all_rds_instances(regions=regions), req)
+        if limit or next_token:
+            data = list_rds_instances_page(regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token)
+        else:
+            data = cached_inventory(
+                "aws", "rds", get_aws_account_key(), cache_scope(regions),
+                lambda: list_all_rds_instances(regions=regions),
+                force_refresh=wants_refresh(req),
+            )
+        queried = apply_list_query("rds", data, query)
+        schedule_prefetch("rds", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 RDS list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -94,6 +177,9 @@ def list_rds(req: func.HttpRequest) -> func.HttpResponse:
 
 def rds_details(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 rds_details START")
+    ids = req.params.get("ids")
+    if ids:
+        return _batch_details_response(req, "RDS", ids, get_rds_instance_details_batch)
     instance_id = req.params.get("instance_id")
     region = req.params.get("region")
     if not all([instance_id, region]):
@@ -102,14 +188,42 @@ def rds_details(req: func.HttpRequest) -> func.HttpResponse:
             error_message="Missing: instance_id and region",
             status_code=400
         )
-    data = get_rds_instance_details(instance_id, region)
-    return http_json_response(data, 200)
+    data = cached_details(
+        "rds", region, instance_id,
+        lambda: get_rds_instance_details(instance_id, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
 
 def list_ec2(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_ec2 START")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "ec2")
+    try:
+        regions = req.params.get("regions")
+        query = list_query(req, "ec2", pageable=True)
+        limit = parse_limit(req.params.get("limit"))
+        next_token = req.params.get("next_token")
+        if next_token:
+            decode_cursor(next_token, "ec2")
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     try:
-        data = list_all_ec2_instances()
-        return http_json_response(data, 200)
+        if wants_ndjson(req):
+            return buffered_ndjson_response(stream_all_ec2_instances(regions=regions), req)
+        if limit or next_token:
+            data = list_ec2_instances_page(regions=regions, limit=limit or DEFAULT_LIMIT, next_token=next_token)
+        else:
+            data = cached_inventory(
+                "aws", "ec2", get_aws_account_key(), cache_scope(regions),
+                lambda: list_all_ec2_instances(regions=regions),
+                force_refresh=wants_refresh(req),
+            )
+        queried = apply_list_query("ec2", data, query)
+        schedule_prefetch("ec2", data, query)
+        return http_list_response(queried, req)
+    except InvalidCursorError as e:
+        # e.g. a cursor replayed with a different regions= selection
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 EC2 list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -120,6 +234,9 @@ def list_ec2(req: func.HttpRequest) -> func.HttpResponse:
 
 def ec2_details(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 ec2_details START")
+    ids = req.params.get("ids")
+    if ids:
+        return _batch_details_response(req, "EC2", ids, get_ec2_instance_details_batch)
     instance_id = req.params.get("instance_id")
     region = req.params.get("region")
     if not all([instance_id, region]):
@@ -128,5 +245,8 @@ def ec2_details(req: func.HttpRequest) -> func.HttpResponse:
             error_message="Missing: instance_id and region",
             status_code=400
         )
-    data = get_ec2_instance_details(instance_id, region)
-    return http_json_response(data, 200)
+    data = cached_details(
+        "ec2", region, instance_id,
+        lambda: get_ec2_instance_details(instance_id, region), force_refresh=wants_refresh(req)
+    )
+    return http_json_response(data, 200, req=req)
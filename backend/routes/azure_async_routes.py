@@ -0,0 +1,138 @@
+# routes/azure_async_routes.py - async variants of routes/azure_routes.py (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from routes.snapshot_helpers import snapshot_list_response, wants_snapshot
+from routes.http_helpers import http_json_response, http_list_response, cache_scope, list_query, wants_refresh
+
+# Import Azure methods
+from methods.async_support import run_blocking
+from methods.query import apply_list_query
+from methods.cache import cached_inventory_async
+from methods.azure.subscriptions import is_multi_subscription, scan_subscriptions_async
+from methods.azure.functions import (
+    get_azure_functions_with_metadata,
+    get_azure_functions_with_metadata_async,
+    get_azure_function_details_async,
+)
+from methods.azure.storage import (
+    get_azure_storage_accounts_with_metadata,
+    get_azure_storage_accounts_with_metadata_async,
+    get_azure_storage_details_async,
+)
+
+# PLAIN ASYNC FUNCTIONS - NO @app.route()
+async def list_azure_functions(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_azure_functions (async) START")
+    subscription_id = req.params.get("subscription_id")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "azure_functions", subscription_id)
+    if not subscription_id:
+        return http_json_response(
+            data=None,
+            error_message="subscription_id required",
+            status_code=400
+        )
+    try:
+        query = list_query(req, "azure_functions")
+        if is_multi_subscription(subscription_id):
+            loader = lambda: scan_subscriptions_async("azure-functions", subscription_id, get_azure_functions_with_metadata)
+        else:
+            loader = lambda: get_azure_functions_with_metadata_async(subscription_id)
+        data = await cached_inventory_async(
+            "azure", "functions", cache_scope(subscription_id), "*", loader,
+            force_refresh=wants_refresh(req),
+        )
+        if query:
+            data = await run_blocking(apply_list_query, "azure_functions", data, query)
+        return http_list_response(data, req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 Azure Functions list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def azure_function_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 azure_function_details (async) START")
+    subscription_id = req.params.get("subscription_id")
+    resource_group = req.params.get("resource_group")
+    function_app_name = req.params.get("name")
+    if not all([subscription_id, resource_group, function_app_name]):
+        return http_json_response(
+            data=None,
+            error_message="Missing: subscription_id, resource_group, name",
+            status_code=400
+        )
+    try:
+        data = await get_azure_function_details_async(subscription_id, resource_group, function_app_name)
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 Azure Function details failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def list_azure_storage_accounts(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 list_azure_storage_accounts (async) START")
+    subscription_id = req.params.get("subscription_id")
+    if wants_snapshot(req):
+        return await run_blocking(snapshot_list_response, req, "azure_storage", subscription_id)
+    if not subscription_id:
+        return http_json_response(
+            data=None,
+            error_message="subscription_id required",
+            status_code=400
+        )
+    try:
+        query = list_query(req, "azure_storage")
+        if is_multi_subscription(subscription_id):
+            loader = lambda: scan_subscriptions_async("azure-storage", subscription_id, get_azure_storage_accounts_with_metadata)
+        else:
+            loader = lambda: get_azure_storage_accounts_with_metadata_async(subscription_id)
+        data = await cached_inventory_async(
+            "azure", "storage", cache_scope(subscription_id), "*", loader,
+            force_refresh=wants_refresh(req),
+        )
+        if query:
+            data = await run_blocking(apply_list_query, "azure_storage", data, query)
+        return http_list_response(data, req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 Azure Storage list failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+async def azure_storage_details(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 azure_storage_details (async) START")
+    subscription_id = req.params.get("subscription_id")
+    resource_group = req.params.get("resource_group")
+    account_name = req.params.get("name")
+    if not all([subscription_id, resource_group, account_name]):
+        return http_json_response(
+            data=None,
+            error_message="Missing: subscription_id, resource_group, account_name",
+            status_code=400
+        )
+    try:
+        data = await get_azure_storage_details_async(subscription_id, resource_group, account_name)
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 Azure Storage details failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
@@ -2,26 +2,16 @@
 
 import azure.functions as func
 import logging
-from datetime import datetime
-import json
 
 logger = logging.getLogger(__name__)
 
-def http_json_response(data, status_code=200, error_message=None):
-    if error_message:
-        body = {
-            "error": error_message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    else:
-        body = data
-    return func.HttpResponse(
-        json.dumps(body, default=str),
-        mimetype="application/json",
-        status_code=status_code
-    )
+from routes.snapshot_helpers import snapshot_list_response, wants_snapshot
+from routes.http_helpers import http_json_response, http_list_response, cache_scope, list_query, wants_refresh
 
 # Import Azure methods
+from methods.query import apply_list_query
+from methods.cache import cached_inventory
+from methods.azure.subscriptions import is_multi_subscription, scan_subscriptions
 from methods.azure.functions import (
     get_azure_functions_with_metadata,
     get_azure_function_details,
@@ -35,6 +25,8 @@ from methods.azure.storage import (
 def list_azure_functions(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_azure_functions START")
     subscription_id = req.params.get("subscription_id")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "azure_functions", subscription_id)
     if not subscription_id:
         return http_json_response(
             data=None,
@@ -42,8 +34,18 @@ def list_azure_functions(req: func.HttpRequest) -> func.HttpResponse:
             status_code=400
         )
     try:
-        data = get_azure_functions_with_metadata(subscription_id)
-        return http_json_response(data, 200)
+        query = list_query(req, "azure_functions")
+        if is_multi_subscription(subscription_id):
+            loader = lambda: scan_subscriptions("azure-functions", subscription_id, get_azure_functions_with_metadata)
+        else:
+            loader = lambda: get_azure_functions_with_metadata(subscription_id)
+        data = cached_inventory(
+            "azure", "functions", cache_scope(subscription_id), "*", loader,
+            force_refresh=wants_refresh(req),
+        )
+        return http_list_response(apply_list_query("azure_functions", data, query), req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 Azure Functions list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -65,7 +67,7 @@ def azure_function_details(req: func.HttpRequest) -> func.HttpResponse:
         )
     try:
         data = get_azure_function_details(subscription_id, resource_group, function_app_name)
-        return http_json_response(data, 200)
+        return http_json_response(data, 200, req=req)
     except Exception as e:
         logger.error(f"💥 Azure Function details failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -77,6 +79,8 @@ def azure_function_details(req: func.HttpRequest) -> func.HttpResponse:
 def list_azure_storage_accounts(req: func.HttpRequest) -> func.HttpResponse:
     logger.info("🚀 list_azure_storage_accounts START")
     subscription_id = req.params.get("subscription_id")
+    if wants_snapshot(req):
+        return snapshot_list_response(req, "azure_storage", subscription_id)
     if not subscription_id:
         return http_json_response(
             data=None,
@@ -84,8 +88,18 @@ def list_azure_storage_accounts(req: func.HttpRequest) -> func.HttpResponse:
             status_code=400
         )
     try:
-        data = get_azure_storage_accounts_with_metadata(subscription_id)
-        return http_json_response(data, 200)
+        query = list_query(req, "azure_storage")
+        if is_multi_subscription(subscription_id):
+            loader = lambda: scan_subscriptions("azure-storage", subscription_id, get_azure_storage_accounts_with_metadata)
+        else:
+            loader = lambda: get_azure_storage_accounts_with_metadata(subscription_id)
+        data = cached_inventory(
+            "azure", "storage", cache_scope(subscription_id), "*", loader,
+            force_refresh=wants_refresh(req),
+        )
+        return http_list_response(apply_list_query("azure_storage", data, query), req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"💥 Azure Storage list failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -107,7 +121,7 @@ def azure_storage_details(req: func.HttpRequest) -> func.HttpResponse:
         )
     try:
         data = get_azure_storage_details(subscription_id, resource_group, account_name)
-        return http_json_response(data, 200)
+        return http_json_response(data, 200, req=req)
     except Exception as e:
         logger.error(f"💥 Azure Storage details failed: {str(e)}", exc_info=True)
         return http_json_response(
@@ -0,0 +1,278 @@
+# routes/http_helpers.py
+
+import os
+import gzip
+import time
+import hashlib
+import inspect
+import functools
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+
+import azure.functions as func
+
+from methods import serialization
+from methods.columnar import columnar_envelope
+from methods.metrics import server_timing, start_request_timing
+from methods.query import ListQuery, parse_list_query
+
+# Brotli is optional; without it we only negotiate gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+COMPRESSION_MIN_BYTES = int(os.environ.get("HTTP_COMPRESSION_MIN_BYTES", "1024"))
+
+# Envelope keys that change on every request or cache refresh without the
+# content changing; they are left out of the ETag so lists still revalidate to 304.
+VOLATILE_KEYS = ("age_seconds", "cache", "generated_at")
+
+
+MSGPACK_MIMETYPE = "application/msgpack"
+COLUMNAR_JSON_MIMETYPE = "application/vnd.inventory.columnar+json"
+COLUMNAR_MSGPACK_MIMETYPE = "application/vnd.inventory.columnar+msgpack"
+
+
+def _etag(stable: bytes) -> str:
+    return f'"{hashlib.blake2b(stable, digest_size=16).hexdigest()}"'
+
+
+def _split_volatile(body: Any) -> Tuple[Any, Dict[str, Any]]:
+    if isinstance(body, dict) and any(k in body for k in VOLATILE_KEYS):
+        stable = {k: v for k, v in body.items() if k not in VOLATILE_KEYS}
+        return stable, {k: body[k] for k in VOLATILE_KEYS if k in body}
+    return body, {}
+
+
+def _encode_body(body: Any) -> Tuple[bytes, str]:
+    """Serialize `body` and return (JSON bytes, ETag over its stable part)."""
+    stable, volatile = _split_volatile(body)
+    stable_json = payload = serialization.dumps(stable)
+    if volatile:
+        # Splice the volatile keys into the stable object instead of re-encoding it
+        payload = stable_json[:-1] + (b"," if stable else b"") + serialization.dumps(volatile)[1:]
+    return payload, _etag(stable_json)
+
+
+def _encode_msgpack_body(body: Any) -> Tuple[bytes, str]:
+    """MessagePack counterpart of _encode_body (same ETag rule)."""
+    stable, volatile = _split_volatile(body)
+    stable_packed = payload = serialization.msgpack_dumps(stable)
+    if volatile:
+        # A map is a count header followed by its pairs: swap the header, append the pairs
+        stable_pairs = stable_packed[len(serialization.msgpack_map_header(len(stable))):]
+        volatile_packed = serialization.msgpack_dumps(volatile)
+        volatile_pairs = volatile_packed[len(serialization.msgpack_map_header(len(volatile))):]
+        payload = serialization.msgpack_map_header(len(stable) + len(volatile)) + stable_pairs + volatile_pairs
+    return payload, _etag(stable_packed)
+
+
+def _accepted_encodings(req: func.HttpRequest) -> Dict[str, float]:
+    accepted = {}
+    for part in (req.headers.get("Accept-Encoding") or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _compress(payload: bytes, req: func.HttpRequest) -> Tuple[bytes, Optional[str]]:
+    if len(payload) < COMPRESSION_MIN_BYTES:
+        return payload, None
+    accepted = _accepted_encodings(req)
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return brotli.compress(payload, quality=5), "br"
+    if accepted.get("gzip", 0) > 0:
+        return gzip.compress(payload, compresslevel=6), "gzip"
+    return payload, None
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Compare weakly: a W/ prefix added by a proxy still matches
+    return "*" in candidates or etag in [c[2:] if c.startswith("W/") else c for c in candidates]
+
+
+def _respond(payload: bytes, etag: str, mimetype: str, status_code: int,
+             req: Optional[func.HttpRequest], vary: str = "Accept-Encoding") -> func.HttpResponse:
+    headers = {"ETag": etag, "Vary": vary}
+
+    if req is None:
+        return func.HttpResponse(payload, mimetype=mimetype, status_code=status_code, headers=headers)
+
+    if status_code == 200 and _etag_matches(etag, req.headers.get("If-None-Match")):
+        return func.HttpResponse(status_code=304, headers=headers)
+
+    payload, encoding = _compress(payload, req)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return func.HttpResponse(payload, mimetype=mimetype, status_code=status_code, headers=headers)
+
+
+def http_json_response(data, status_code=200, error_message=None,
+                       req: Optional[func.HttpRequest] = None) -> func.HttpResponse:
+    """Shared JSON response: content-hash ETag, 304 revalidation and compression.
+
+    Pass the incoming `req` to enable If-None-Match and Accept-Encoding handling.
+    """
+    if error_message:
+        body = {
+            "error": error_message,
+            "timestamp": datetime.utcnow()
+        }
+    else:
+        body = data
+
+    payload, etag = _encode_body(body)
+    return _respond(payload, etag, "application/json", status_code, req)
+
+
+def negotiate_list_format(req: func.HttpRequest) -> Tuple[bool, bool]:
+    """(columnar, msgpack) from ?format=columnar,msgpack or the Accept header.
+
+    MessagePack is only chosen when the msgpack package is installed;
+    otherwise the same shape is sent as JSON.
+    """
+    requested = {f.strip() for f in (req.params.get("format") or "").lower().split(",") if f.strip()}
+    accept = (req.headers.get("Accept") or "").lower()
+    columnar = "columnar" in requested or "columnar+" in accept
+    msgpack = "msgpack" in requested or "msgpack" in accept
+    return columnar, msgpack and serialization.msgpack is not None
+
+
+def http_list_response(data: Dict[str, Any], req: func.HttpRequest) -> func.HttpResponse:
+    """http_json_response for list envelopes, plus the columnar shape and MessagePack."""
+    columnar, msgpack = negotiate_list_format(req)
+    if columnar and isinstance(data, dict) and "items" in data:
+        data = columnar_envelope(data)
+    if msgpack:
+        payload, etag = _encode_msgpack_body(data)
+        mimetype = COLUMNAR_MSGPACK_MIMETYPE if columnar else MSGPACK_MIMETYPE
+    else:
+        payload, etag = _encode_body(data)
+        mimetype = COLUMNAR_JSON_MIMETYPE if columnar else "application/json"
+    # The representation depends on Accept, so caches must key on it too
+    return _respond(payload, etag, mimetype, 200, req, vary="Accept, Accept-Encoding")
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson(req: func.HttpRequest) -> bool:
+    """?format=ndjson (or Accept: application/x-ndjson) selects per-region NDJSON output (buffered)."""
+    if (req.params.get("format") or "").lower() == "ndjson":
+        return True
+    return NDJSON_MIMETYPE in (req.headers.get("Accept") or "")
+
+
+def ndjson_lines(events: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """One JSON document per line, emitted as soon as each event is produced."""
+    for event in events:
+        yield serialization.dumps(event) + b"\n"
+
+
+async def ndjson_lines_async(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield serialization.dumps(event) + b"\n"
+
+
+def _ndjson_http_response(payload: bytes, req: func.HttpRequest) -> func.HttpResponse:
+    headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+    payload, encoding = _compress(payload, req)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return func.HttpResponse(payload, mimetype=NDJSON_MIMETYPE, status_code=200, headers=headers)
+
+
+def buffered_ndjson_response(events: Iterable[Dict[str, Any]], req: func.HttpRequest) -> func.HttpResponse:
+    """NDJSON body for the classic worker, which needs the whole body up front.
+
+    Nothing reaches the client until every region has finished; the
+    /stream routes (HTTP_STREAMING_ENABLED) deliver the same lines as
+    regions complete.
+    """
+    return _ndjson_http_response(b"".join(ndjson_lines(events)), req)
+
+
+async def buffered_ndjson_response_async(events: AsyncIterator[Dict[str, Any]],
+                                         req: func.HttpRequest) -> func.HttpResponse:
+    """asyncio variant of buffered_ndjson_response."""
+    return _ndjson_http_response(b"".join([line async for line in ndjson_lines_async(events)]), req)
+
+
+def wants_refresh(req: func.HttpRequest) -> bool:
+    """True when the caller asked to bypass cached inventory (?refresh=1 or Cache-Control: no-cache)."""
+    if req.params.get("refresh", "").lower() in ("1", "true", "yes"):
+        return True
+    cache_control = req.headers.get("Cache-Control", "") or ""
+    return "no-cache" in cache_control.lower()
+
+
+def cache_scope(*values) -> str:
+    """Normalize filter parameters (e.g. regions=) into a cache-key component."""
+    parts = []
+    for value in values:
+        items = sorted(v.strip() for v in (value or "").split(",") if v.strip())
+        parts.append(",".join(items) or "*")
+    return "|".join(parts)
+
+
+def list_query(req: func.HttpRequest, collection: str, pageable: bool = False) -> Optional[ListQuery]:
+    """The ?filter=, ?sort= and ?fields= list parameters (raises ValueError when malformed).
+
+    Routes that also serve pages or NDJSON pass `pageable`: those responses
+    cover only part of the list, so a query combined with them is rejected.
+    """
+    query = parse_list_query(
+        collection, req.params.get("filter"), req.params.get("sort"), req.params.get("fields")
+    )
+    if query is not None and pageable and (
+        req.params.get("limit") or req.params.get("next_token") or wants_ndjson(req)
+    ):
+        raise ValueError("filter, sort and fields cannot be combined with limit, next_token or format=ndjson")
+    return query
+
+
+def with_server_timing(handler):
+    """Wrap a route handler so its response carries a Server-Timing header.
+
+    The header lists the time spent in cloud SDK calls per cloud/service
+    made while handling the request, plus the handler's total time.
+    """
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def timed_async(req: func.HttpRequest) -> func.HttpResponse:
+            started, token = time.perf_counter(), start_request_timing()
+            try:
+                response = await handler(req)
+            finally:
+                timing = server_timing(token, started)
+            response.headers["Server-Timing"] = timing
+            return response
+        return timed_async
+
+    @functools.wraps(handler)
+    def timed(req: func.HttpRequest) -> func.HttpResponse:
+        started, token = time.perf_counter(), start_request_timing()
+        try:
+            response = handler(req)
+        finally:
+            timing = server_timing(token, started)
+        response.headers["Server-Timing"] = timing
+        return response
+    return timed
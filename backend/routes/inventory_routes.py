@@ -0,0 +1,65 @@
+# routes/inventory_routes.py - cross-cloud inventory (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from routes.http_helpers import http_json_response, cache_scope, wants_refresh
+
+from methods.aws.auth import get_aws_account_key
+from methods.cache import cached_inventory, cached_inventory_async
+from methods.inventory import DEFAULT_SUBSCRIPTION_ID, collect_inventory, collect_inventory_async, parse_sections
+
+
+def _inventory_params(req: func.HttpRequest):
+    regions = req.params.get("regions")
+    subscription_id = req.params.get("subscription_id") or DEFAULT_SUBSCRIPTION_ID
+    types = req.params.get("types")
+    parse_sections(types)  # 400 on unknown types before touching the cache
+    return regions, subscription_id, types
+
+
+# PLAIN FUNCTIONS - NO @app.route()
+def inventory(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 inventory START")
+    try:
+        regions, subscription_id, types = _inventory_params(req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        data = cached_inventory(
+            "multi", "inventory", get_aws_account_key(), cache_scope(regions, subscription_id, types),
+            lambda: collect_inventory(regions=regions, subscription_id=subscription_id, types=types),
+            force_refresh=wants_refresh(req),
+        )
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 Inventory failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+
+async def inventory_async(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 inventory (async) START")
+    try:
+        regions, subscription_id, types = _inventory_params(req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        data = await cached_inventory_async(
+            "multi", "inventory", get_aws_account_key(), cache_scope(regions, subscription_id, types),
+            lambda: collect_inventory_async(regions=regions, subscription_id=subscription_id, types=types),
+            force_refresh=wants_refresh(req),
+        )
+        return http_json_response(data, 200, req=req)
+    except Exception as e:
+        logger.error(f"💥 Inventory failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
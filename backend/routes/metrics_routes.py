@@ -0,0 +1,20 @@
+# routes/metrics_routes.py - Prometheus scrape endpoint (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from methods.metrics import cloud_api_metrics
+
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# PLAIN FUNCTIONS - NO @app.route()
+def metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """Per-call cloud API latency histograms, error and throttle counters."""
+    return func.HttpResponse(
+        cloud_api_metrics.render(),
+        status_code=200,
+        headers={"Content-Type": PROMETHEUS_MIMETYPE, "Cache-Control": "no-store"},
+    )
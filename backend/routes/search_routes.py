@@ -0,0 +1,54 @@
+# routes/search_routes.py - cross-resource search (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from routes.http_helpers import http_json_response
+
+from methods.async_support import run_blocking
+from methods.search import SEARCH_DEFAULT_LIMIT, search_inventory
+
+
+def _search_params(req: func.HttpRequest):
+    limit = req.params.get("limit")
+    try:
+        limit = int(limit) if limit else SEARCH_DEFAULT_LIMIT
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    return req.params.get("q"), req.params.get("types"), limit
+
+
+# PLAIN FUNCTIONS - NO @app.route()
+def search(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 search START")
+    try:
+        data = search_inventory(*_search_params(req))
+        return http_json_response(data, 200, req=req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 Search failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
+
+
+async def search_async(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info("🚀 search (async) START")
+    try:
+        # The index lock and snapshot reads block, so stay off the event loop
+        data = await run_blocking(search_inventory, *_search_params(req))
+        return http_json_response(data, 200, req=req)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 Search failed: {str(e)}", exc_info=True)
+        return http_json_response(
+            data=None,
+            error_message=str(e),
+            status_code=500
+        )
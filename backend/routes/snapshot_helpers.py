@@ -0,0 +1,68 @@
+# routes/snapshot_helpers.py
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from routes.http_helpers import http_json_response, http_list_response
+
+from methods.delta import SnapshotVersionGone, compute_delta
+from methods.query import ListQuery, apply_list_query, parse_list_query
+from methods.refresher import read_snapshot_envelope
+
+
+def wants_snapshot(req: func.HttpRequest) -> bool:
+    """?source=snapshot or ?since=<version> serve a list from background snapshots."""
+    return (req.params.get("source") or "").lower() == "snapshot" or bool(req.params.get("since"))
+
+
+def _delta_response(req: func.HttpRequest, collection: str, since: str,
+                    query: ListQuery = None) -> func.HttpResponse:
+    try:
+        delta = compute_delta(collection, since, query=query)
+    except SnapshotVersionGone as e:
+        # 410 tells the client to drop its copy and reload the full list
+        return http_json_response(data=None, error_message=str(e), status_code=410)
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    except Exception as e:
+        logger.error(f"💥 {collection} delta failed: {str(e)}", exc_info=True)
+        return http_json_response(data=None, error_message=str(e), status_code=500)
+    return http_json_response(delta, 200, req=req)
+
+
+def snapshot_list_response(req: func.HttpRequest, collection: str,
+                           subscription_id: str = None) -> func.HttpResponse:
+    """List response built from the latest snapshot of `collection`, without touching cloud APIs.
+
+    With `since=<version>` only the records added, modified or removed
+    after that snapshot version are returned, narrowed by the same filters.
+    """
+    # regions= becomes one more indexed clause, so it composes with filter/sort/fields
+    regions = "|".join(r.strip() for r in (req.params.get("regions") or "").split(",") if r.strip())
+    filter_expr = ",".join(f for f in (req.params.get("filter"), regions and f"region={regions}") if f)
+    try:
+        query = parse_list_query(collection, filter_expr, req.params.get("sort"), req.params.get("fields"))
+    except ValueError as e:
+        return http_json_response(data=None, error_message=str(e), status_code=400)
+    try:
+        envelope = read_snapshot_envelope(collection)
+    except Exception as e:
+        logger.error(f"💥 Reading {collection} snapshot failed: {str(e)}", exc_info=True)
+        return http_json_response(data=None, error_message=str(e), status_code=500)
+    if envelope is None:
+        return http_json_response(
+            data=None, error_message=f"No {collection} snapshot yet", status_code=404
+        )
+    if subscription_id and envelope.get("subscription_id") != subscription_id:
+        return http_json_response(
+            data=None,
+            error_message=f"{collection} snapshot covers subscription {envelope.get('subscription_id')}",
+            status_code=404,
+        )
+
+    since = req.params.get("since")
+    if since:
+        return _delta_response(req, collection, since, query)
+    return http_list_response(apply_list_query(collection, envelope, query), req)
@@ -0,0 +1,53 @@
+# routes/stream_routes.py - NDJSON STREAMING (NO DECORATORS)
+#
+# Chunked per-region output needs the Azure Functions HTTP streams extension
+# (azurefunctions-extensions-http-fastapi in requirements.txt); function_app.py
+# only imports this module when HTTP_STREAMING_ENABLED=true. These are the
+# routes that deliver NDJSON progressively; ?format=ndjson on the list routes
+# returns the same lines buffered into one body.
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+from azurefunctions.extensions.http.fastapi import Request, Response, StreamingResponse
+
+from routes.http_helpers import NDJSON_MIMETYPE, ndjson_lines_async
+
+from methods import serialization
+from methods.aws.eks import parse_include, stream_all_eks_clusters_async
+from methods.aws.rds import stream_all_rds_instances_async
+from methods.aws.ec2 import stream_all_ec2_instances_async
+
+
+def _streaming_response(events) -> StreamingResponse:
+    # no-store: a partially delivered stream must never be replayed from a cache
+    return StreamingResponse(
+        ndjson_lines_async(events), media_type=NDJSON_MIMETYPE, headers={"Cache-Control": "no-store"}
+    )
+
+
+def _error_response(message: str, status_code: int) -> Response:
+    return Response(
+        content=serialization.dumps({"error": message}), status_code=status_code, media_type="application/json"
+    )
+
+
+# PLAIN ASYNC FUNCTIONS - NO @app.route()
+async def stream_eks(req: Request):
+    logger.info("🚀 stream_eks START")
+    try:
+        include = parse_include(req.query_params.get("include"))
+    except ValueError as e:
+        return _error_response(str(e), 400)
+    return _streaming_response(stream_all_eks_clusters_async(regions=req.query_params.get("regions"), include=include))
+
+
+async def stream_rds(req: Request):
+    logger.info("🚀 stream_rds START")
+    return _streaming_response(stream_all_rds_instances_async(regions=req.query_params.get("regions")))
+
+
+async def stream_ec2(req: Request):
+    logger.info("🚀 stream_ec2 START")
+    return _streaming_response(stream_all_ec2_instances_async(regions=req.query_params.get("regions")))
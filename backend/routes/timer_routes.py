@@ -0,0 +1,25 @@
+# routes/timer_routes.py - background triggers (NO DECORATORS)
+
+import azure.functions as func
+import logging
+
+logger = logging.getLogger(__name__)
+
+from methods.refresher import refresh_snapshots
+
+
+# PLAIN FUNCTIONS - NO @app.timer_trigger()
+def refresh_inventory(timer: func.TimerRequest) -> None:
+    logger.info("⏲️ refresh_inventory START")
+    if timer.past_due:
+        logger.warning("⚠️ Inventory refresh timer is past due")
+    try:
+        report = refresh_snapshots()
+    except Exception as e:
+        logger.error(f"💥 Inventory refresh failed: {str(e)}", exc_info=True)
+        return
+    for collector, status in report["collectors"].items():
+        logger.info(
+            f"📊 {collector}: {status['items']} items in {status['duration_seconds']:.2f}s, "
+            f"errors={len(status['errors'])}, version={status.get('version')}"
+        )
@@ -0,0 +1,9 @@
+# tests/conftest.py
+#
+# Run from backend/:  python -m pytest -q
+
+import os
+import sys
+
+# Modules import each other as top-level packages (methods.*, routes.*), as in function_app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,103 @@
+# tests/test_async_parity.py
+#
+# The asyncio collectors and routes must return what their sync twins do.
+# Both run against the simulated clouds from benchmarks/fake_clouds.py.
+
+import asyncio
+import json
+
+import azure.functions as func
+import pytest
+
+from benchmarks.fake_clouds import SimConfig, reset_process_state, simulated_clouds
+from methods.aws.ec2 import list_all_ec2_instances, list_all_ec2_instances_async
+from methods.aws.eks import list_all_eks_clusters, list_all_eks_clusters_async
+from methods.aws.rds import list_all_rds_instances, list_all_rds_instances_async
+from methods.azure.functions import get_azure_functions_with_metadata, get_azure_functions_with_metadata_async
+from methods.azure.storage import get_azure_storage_accounts_with_metadata, get_azure_storage_accounts_with_metadata_async
+from routes import aws_routes, aws_async_routes, azure_routes, azure_async_routes
+
+# Timing and cache bookkeeping differ run to run; everything else must match
+VOLATILE_KEYS = {"generated_at", "age_seconds", "cache", "duration_seconds", "region_timings",
+                 "subscription_timings"}
+EKS_INCLUDE = frozenset({"status", "version"})
+
+
+@pytest.fixture
+def sim():
+    config = SimConfig(regions=3, resources=30, subscriptions=2, page_size=10, latency_ms=1, jitter_ms=0)
+    with simulated_clouds(config) as sim:
+        yield sim
+
+
+def _normalized(value):
+    """Drop volatile keys and sort lists, since regions complete in a different order per run."""
+    if isinstance(value, dict):
+        return {k: _normalized(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return sorted((_normalized(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+
+def _both(run_sync, run_async):
+    """(sync result, async result), each from a cold process state."""
+    reset_process_state()
+    expected = run_sync()
+    reset_process_state()
+    actual = asyncio.run(run_async())
+    return expected, actual
+
+
+@pytest.mark.parametrize("list_all, list_all_async, kwargs", [
+    (list_all_ec2_instances, list_all_ec2_instances_async, {}),
+    (list_all_rds_instances, list_all_rds_instances_async, {}),
+    (list_all_eks_clusters, list_all_eks_clusters_async, {}),
+    (list_all_eks_clusters, list_all_eks_clusters_async, {"include": EKS_INCLUDE}),
+], ids=["ec2", "rds", "eks", "eks-include"])
+def test_aws_collectors_match(sim, list_all, list_all_async, kwargs):
+    expected, actual = _both(lambda: list_all(**kwargs), lambda: list_all_async(**kwargs))
+
+    assert expected["items"]
+    assert not expected["failed_regions"] and not expected["timed_out_regions"]
+    assert _normalized(actual) == _normalized(expected)
+
+
+@pytest.mark.parametrize("collect, collect_async", [
+    (get_azure_functions_with_metadata, get_azure_functions_with_metadata_async),
+    (get_azure_storage_accounts_with_metadata, get_azure_storage_accounts_with_metadata_async),
+], ids=["functions", "storage"])
+def test_azure_collectors_match(sim, collect, collect_async):
+    subscription = sim.subscriptions[0]
+    expected, actual = _both(lambda: collect(subscription), lambda: collect_async(subscription))
+
+    assert expected
+    assert _normalized(actual) == _normalized(expected)
+
+
+def _request(**params) -> func.HttpRequest:
+    # refresh=1 so both handlers reach the collectors instead of the inventory cache
+    return func.HttpRequest(method="GET", url="/", headers={}, params={"refresh": "1", **params}, body=b"")
+
+
+def _body(response: func.HttpResponse):
+    assert response.status_code == 200, response.get_body()
+    return json.loads(response.get_body())
+
+
+@pytest.mark.parametrize("handler, handler_async, params", [
+    (aws_routes.list_ec2, aws_async_routes.list_ec2, {}),
+    (aws_routes.list_ec2, aws_async_routes.list_ec2, {"filter": "state=running", "sort": "type"}),
+    (aws_routes.list_rds, aws_async_routes.list_rds, {}),
+    (aws_routes.list_eks, aws_async_routes.list_eks, {"include": "status,version"}),
+    (aws_routes.list_s3, aws_async_routes.list_s3, {}),
+    (azure_routes.list_azure_functions, azure_async_routes.list_azure_functions, {"subscription_id": "*"}),
+    (azure_routes.list_azure_storage_accounts, azure_async_routes.list_azure_storage_accounts,
+     {"subscription_id": "*"}),
+], ids=["ec2", "ec2-query", "rds", "eks", "s3", "azure-functions", "azure-storage"])
+def test_list_routes_match(sim, handler, handler_async, params):
+    async def call_async():
+        return await handler_async(_request(**params))
+
+    expected, actual = _both(lambda: handler(_request(**params)), call_async)
+
+    assert _normalized(_body(actual)) == _normalized(_body(expected))
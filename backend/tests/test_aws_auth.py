@@ -0,0 +1,80 @@
+# tests/test_aws_auth.py
+
+import pytest
+
+from methods.aws import auth
+
+
+class _Timer:
+    """threading.Timer stand-in that records the schedule instead of running."""
+
+    started = []
+
+    def __init__(self, delay, fn, args=()):
+        self.delay, self.fn, self.args = delay, fn, args
+        self.daemon = False
+
+    def start(self):
+        _Timer.started.append(self)
+
+    def cancel(self):
+        pass
+
+
+class _Credentials:
+    def __init__(self, provider, outcomes):
+        self._provider = provider
+        self._outcomes = list(outcomes)
+
+    def get_frozen_credentials(self):
+        outcome = self._outcomes.pop(0)
+        if outcome == "raise":
+            raise RuntimeError("sts unavailable")
+        if outcome == "refresh":
+            # What botocore's refresh does through refresh_using=_assume_role
+            self._provider._assumed += 1
+            self._provider._start_timer(600, attempt=0)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    _Timer.started = []
+    monkeypatch.setattr(auth.threading, "Timer", _Timer)
+    monkeypatch.setattr(auth, "CREDENTIAL_REFRESH_RETRY_SECONDS", 10)
+    monkeypatch.setattr(auth, "CREDENTIAL_REFRESH_RETRY_MAX_SECONDS", 30)
+    return auth.OidcCredentialProvider()
+
+
+def _fire_last(provider):
+    timer = _Timer.started[-1]
+    timer.fn(*timer.args)
+
+
+def test_failed_background_refresh_is_retried_with_backoff(provider):
+    # botocore either raises or swallows an advisory failure and keeps the old credentials
+    provider._credentials = _Credentials(provider, ["raise", "stale", "raise", "refresh"])
+    provider._start_timer(100, attempt=0)
+
+    for _ in range(4):
+        _fire_last(provider)
+
+    assert [t.delay for t in _Timer.started] == [100, 10, 20, 30, 600]
+    assert _Timer.started[-1].args == (0,)
+
+
+def test_successful_background_refresh_is_not_retried(provider):
+    provider._credentials = _Credentials(provider, ["refresh"])
+    provider._start_timer(100, attempt=0)
+
+    _fire_last(provider)
+
+    assert [t.delay for t in _Timer.started] == [100, 600]
+
+
+def test_oidc_source_serves_the_shared_credentials(monkeypatch):
+    credentials = object()
+    monkeypatch.setattr(auth, "_get_aws_credentials_via_oidc", lambda: credentials)
+
+    resolver = auth.CredentialResolver(providers=[auth._OidcCredentialSource()])
+
+    assert resolver.load_credentials() is credentials
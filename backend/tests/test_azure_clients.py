@@ -0,0 +1,64 @@
+# tests/test_azure_clients.py
+
+import asyncio
+
+import pytest
+
+from methods.azure import clients
+
+
+class _Session:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(clients, "_async_clients", {})
+    monkeypatch.setattr(clients, "_aiohttp_sessions", {})
+    monkeypatch.setattr(clients, "get_async_credential", lambda: None)
+
+
+def test_async_clients_are_cached_per_subscription_and_loop(monkeypatch):
+    created = []
+
+    def factory(credential, subscription_id, **kwargs):
+        created.append(subscription_id)
+        return object()
+
+    monkeypatch.setattr(clients.azure.mgmt.web.aio, "WebSiteManagementClient", factory)
+    monkeypatch.setattr(clients, "get_async_transport", lambda: None)
+
+    async def lookup():
+        return (clients.get_async_web_client("sub-a"), clients.get_async_web_client("sub-a"),
+                clients.get_async_web_client("sub-b"))
+
+    first_a, again_a, first_b = asyncio.run(lookup())
+    assert first_a is again_a and first_a is not first_b
+    assert created == ["sub-a", "sub-b"]
+
+    # A new event loop gets its own clients; those of the finished loop are dropped
+    second_a, _, _ = asyncio.run(lookup())
+    assert second_a is not first_a
+    assert len(clients._async_clients) == 2
+
+
+def test_sessions_of_finished_loops_are_closed(monkeypatch):
+    monkeypatch.setattr(clients.aiohttp, "ClientSession", _Session)
+    monkeypatch.setattr(clients, "AioHttpTransport", lambda session, session_owner: session)
+
+    async def transports():
+        first = clients.get_async_transport()
+        assert clients.get_async_transport() is first
+        await asyncio.sleep(0)
+        return first
+
+    old = asyncio.run(transports())
+    new = asyncio.run(transports())
+
+    assert new is not old
+    assert old.closed and not new.closed
+    assert list(clients._aiohttp_sessions.values()) == [new]
@@ -0,0 +1,60 @@
+# tests/test_batch_routes.py
+
+import asyncio
+import json
+
+import azure.functions as func
+import pytest
+
+from routes import aws_routes, aws_async_routes
+
+
+def _request(**params) -> func.HttpRequest:
+    return func.HttpRequest(method="GET", url="/", headers={}, params=params, body=b"")
+
+
+def _call(module, handler_name, req):
+    response = getattr(module, handler_name)(req)
+    if asyncio.iscoroutine(response):
+        response = asyncio.run(response)
+    return response.status_code, json.loads(response.get_body())
+
+
+def _fail(*args):
+    raise RuntimeError("sts unavailable")
+
+
+@pytest.fixture(params=[aws_routes, aws_async_routes], ids=["sync", "async"])
+def routes(request, monkeypatch):
+    monkeypatch.setattr(request.param, "get_account_regions", lambda: ["us-east-1"])
+    return request.param
+
+
+@pytest.mark.parametrize("handler", ["ec2_details", "rds_details"])
+def test_malformed_ids_are_rejected(routes, handler):
+    for ids in ("i-123", "eu-west-9:i-123"):
+        status, body = _call(routes, handler, _request(ids=ids))
+        assert status == 400, body
+
+
+@pytest.mark.parametrize("handler, batch", [
+    ("ec2_details", "get_ec2_instance_details_batch"),
+    ("rds_details", "get_rds_instance_details_batch"),
+])
+def test_aws_failures_are_json_500s(routes, monkeypatch, handler, batch):
+    monkeypatch.setattr(routes, batch, _fail)
+    status, body = _call(routes, handler, _request(ids="us-east-1:i-123"))
+    assert status == 500
+    assert "sts unavailable" in json.dumps(body)
+
+    monkeypatch.setattr(routes, "get_account_regions", _fail)
+    status, body = _call(routes, handler, _request(ids="us-east-1:i-123"))
+    assert status == 500
+    assert "sts unavailable" in json.dumps(body)
+
+
+def test_batch_results_are_returned(routes, monkeypatch):
+    monkeypatch.setattr(routes, "get_ec2_instance_details_batch", lambda ids: {"results": {"n": len(ids)}})
+    status, body = _call(routes, "ec2_details", _request(ids="us-east-1:i-1,us-east-1:i-2"))
+    assert status == 200
+    assert body == {"results": {"n": 2}}
@@ -0,0 +1,59 @@
+# tests/test_detail_sections.py
+
+import asyncio
+import time
+
+import pytest
+
+from methods.azure.functions import _Once
+from methods.detail_sections import gather_sections, gather_sections_async
+
+
+def _slow(value, seconds):
+    def run():
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_required_section_gets_its_own_timeout():
+    sections, degraded = gather_sections("test", {
+        "app": _slow("app", 0.2),
+        "plan": _slow("plan", 0.5),
+    }, required=("app",), timeout=0.05, required_timeout=1)
+
+    assert sections == {"app": "app", "plan": None}
+    assert degraded == {"plan": "timeout"}
+
+
+def test_required_section_times_out_after_required_timeout():
+    with pytest.raises(TimeoutError):
+        gather_sections("test", {"app": _slow("app", 0.5)}, required=("app",), timeout=0.05, required_timeout=0.1)
+
+
+def test_required_section_gets_its_own_timeout_async():
+    async def slow(value, seconds):
+        await asyncio.sleep(seconds)
+        return value
+
+    sections, degraded = asyncio.run(gather_sections_async("test", {
+        "app": lambda: slow("app", 0.2),
+        "plan": lambda: slow("plan", 0.5),
+    }, required=("app",), timeout=0.05, required_timeout=1))
+
+    assert sections == {"app": "app", "plan": None}
+    assert degraded == {"plan": "timeout"}
+
+
+def test_once_shares_a_failure_instead_of_retrying():
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    once = _Once(fail)
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="boom"):
+            once()
+    assert calls == [1]
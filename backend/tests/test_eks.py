@@ -0,0 +1,62 @@
+# tests/test_eks.py
+
+import concurrent.futures
+
+import pytest
+
+from methods.aws import eks
+
+
+def _failed_future():
+    future = concurrent.futures.Future()
+    future.set_exception(RuntimeError("AccessDenied"))
+    return future
+
+
+@pytest.mark.parametrize("include, status", [
+    (frozenset(), "Fetching..."),
+    (frozenset({"version"}), "Fetching..."),
+    (frozenset({"status"}), "Unknown"),
+])
+def test_failed_describe_only_touches_requested_fields(include, status):
+    cluster = {"name": "prod", "region": "us-east-1", "status": "Fetching..."}
+
+    eks._apply_describes([(cluster, _failed_future())], include)
+
+    assert cluster["status"] == status
+    assert cluster["describe_error"] == "AccessDenied"
+    assert "version" not in cluster
+
+
+class _FakeEKSClient:
+    def describe_cluster(self, name):
+        return {"cluster": {"arn": f"arn:{name}", "status": "ACTIVE", "version": "1.30"}}
+
+
+@pytest.fixture
+def describe_cache(monkeypatch):
+    monkeypatch.setattr(eks, "get_aws_eks_client", lambda region: _FakeEKSClient())
+    monkeypatch.setattr(eks, "get_aws_account_key", lambda: "123456789012")
+    monkeypatch.setattr(eks, "_describe_cache", eks.OrderedDict())
+    return eks._describe_cache
+
+
+def test_describe_cache_is_capped(describe_cache, monkeypatch):
+    monkeypatch.setattr(eks, "EKS_DESCRIBE_CACHE_MAX_ENTRIES", 3)
+
+    for i in range(5):
+        eks._describe_cluster_summary("us-east-1", f"c{i}")
+
+    assert [arn.rsplit("/", 1)[-1] for arn in describe_cache] == ["c2", "c3", "c4"]
+
+
+def test_describe_cache_prunes_expired_entries_on_insert(describe_cache, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(eks.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(eks, "EKS_DESCRIBE_CACHE_TTL_SECONDS", 30)
+
+    eks._describe_cluster_summary("us-east-1", "old")
+    clock[0] += 31
+    eks._describe_cluster_summary("us-east-1", "new")
+
+    assert [arn.rsplit("/", 1)[-1] for arn in describe_cache] == ["new"]
@@ -0,0 +1,52 @@
+# tests/test_inventory_cache.py
+
+import asyncio
+
+from methods.cache import InventoryCache
+
+KEY = ("aws", "ec2", "123456789012", "*")
+
+
+def _loader(results, delay):
+    """Coroutine loader returning 1, 2, ... in call order after `delay` seconds."""
+    async def load():
+        results.append(len(results) + 1)
+        value = results[-1]
+        await asyncio.sleep(delay)
+        return [value]
+    return load
+
+
+def test_concurrent_misses_share_one_load():
+    cache = InventoryCache()
+    results = []
+
+    async def run():
+        load = _loader(results, 0.05)
+        return await asyncio.gather(cache.get_async(KEY, load), cache.get_async(KEY, load))
+
+    first, second = asyncio.run(run())
+
+    assert results == [1]
+    assert first["data"] == second["data"] == [1]
+
+
+def test_refresh_does_not_join_a_load_that_started_before_it():
+    cache = InventoryCache()
+    results = []
+
+    async def run():
+        miss = asyncio.ensure_future(cache.get_async(KEY, _loader(results, 0.1)))
+        await asyncio.sleep(0.02)
+        refresh = await cache.get_async(KEY, _loader(results, 0.01), force_refresh=True)
+        return await miss, refresh
+
+    miss, refresh = asyncio.run(run())
+
+    assert results == [1, 2]
+    assert refresh["cache"] == "bypass"
+    assert refresh["data"] == [2]
+    # The older load finished last but must not replace the newer snapshot
+    assert miss["data"] == [2]
+    assert cache.get(KEY, lambda: [0])["data"] == [2]
+
@@ -0,0 +1,64 @@
+# tests/test_ndjson_stream.py
+#
+# NDJSON lines must leave as regions complete, not after the whole fan-out.
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from benchmarks.fake_clouds import SimConfig, simulated_clouds
+from methods.aws.ec2 import stream_all_ec2_instances, stream_all_ec2_instances_async
+from routes.http_helpers import ndjson_lines, ndjson_lines_async
+
+# One region answers SLOW_REGION_FACTOR (5x) slower than the rest
+CONFIG = SimConfig(regions=4, resources=10, slow_regions=1, latency_ms=30, jitter_ms=0)
+
+
+@pytest.fixture
+def sim():
+    with simulated_clouds(CONFIG) as sim:
+        yield sim
+
+
+def _assert_progressive(sim, timed_lines):
+    """timed_lines: [(seconds since start, line bytes)] in arrival order."""
+    events = [json.loads(line) for _, line in timed_lines]
+    slow_region = sim.regions[0]
+
+    assert [e["type"] for e in events] == ["region"] * len(sim.regions) + ["trailer"]
+    assert events[0]["region"] != slow_region
+    assert events[-2]["region"] == slow_region
+    # The first region's line was out while the slow region was still running
+    first_at, last_at = timed_lines[0][0], timed_lines[-1][0]
+    assert last_at - first_at > 2 * CONFIG.latency_ms / 1000
+
+
+def test_ndjson_lines_follow_region_completion(sim):
+    started = time.monotonic()
+    timed_lines = [(time.monotonic() - started, line) for line in ndjson_lines(stream_all_ec2_instances())]
+
+    _assert_progressive(sim, timed_lines)
+
+
+def test_ndjson_lines_async_follow_region_completion(sim):
+    async def collect():
+        started = time.monotonic()
+        return [(time.monotonic() - started, line)
+                async for line in ndjson_lines_async(stream_all_ec2_instances_async())]
+
+    _assert_progressive(sim, asyncio.run(collect()))
+
+
+def test_stream_route_body_is_progressive(sim):
+    pytest.importorskip("azurefunctions.extensions.http.fastapi")
+    from starlette.requests import Request
+    from routes.stream_routes import stream_ec2
+
+    async def collect():
+        response = await stream_ec2(Request({"type": "http", "method": "GET", "query_string": b"", "headers": []}))
+        started = time.monotonic()
+        return [(time.monotonic() - started, line) async for line in response.body_iterator]
+
+    _assert_progressive(sim, asyncio.run(collect()))
@@ -0,0 +1,118 @@
+# tests/test_pagination.py
+#
+# collect_region_page against an in-memory pager that resumes from raw
+# service tokens (the benchmark fakes always start from the first page).
+
+import json
+
+import azure.functions as func
+import pytest
+
+from methods.aws.pagination import InvalidCursorError, collect_region_page, decode_cursor, encode_cursor
+
+PAGE_SIZE = 3
+REGIONS = ["eu-west-1", "us-east-1", "us-west-2"]
+RECORDS = {
+    "eu-west-1": [f"eu-{i}" for i in range(7)],
+    "us-east-1": [f"use-{i}" for i in range(2)],
+    "us-west-2": [f"usw-{i}" for i in range(4)],
+}
+
+
+def _pager(failing=(), calls=None):
+    """Pages of PAGE_SIZE records; the raw token is the next page's offset as a string."""
+    def pager(region, token):
+        if calls is not None:
+            calls.append((region, token))
+        if region in failing:
+            raise RuntimeError(f"{region} unavailable")
+        records = RECORDS[region]
+        offset = int(token or 0)
+        while offset < len(records):
+            next_offset = offset + PAGE_SIZE
+            yield records[offset:next_offset], str(next_offset) if next_offset < len(records) else None
+            offset = next_offset
+    return pager
+
+
+def _walk(limit, pager=None, regions=REGIONS):
+    pager = pager or _pager()
+    pages, token = [], None
+    while True:
+        page = collect_region_page("ec2", regions, pager, limit, token)
+        pages.append(page)
+        token = page["next_token"]
+        if not token:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 5, 13, 100])
+def test_pages_cover_every_record_once(limit):
+    pages = _walk(limit)
+
+    items = [item for page in pages for item in page["items"]]
+    assert items == RECORDS["eu-west-1"] + RECORDS["us-east-1"] + RECORDS["us-west-2"]
+    assert all(len(page["items"]) <= limit for page in pages)
+    assert all(page["failed_regions"] == [] for page in pages)
+
+
+def test_resume_skips_records_already_returned_from_a_page():
+    calls = []
+    first = collect_region_page("ec2", REGIONS, _pager(calls=calls), 2, None)
+    state = decode_cursor(first["next_token"], "ec2")
+    assert (state["region"], state["token"], state["skip"]) == ("eu-west-1", None, 2)
+
+    second = collect_region_page("ec2", REGIONS, _pager(calls=calls), 2, first["next_token"])
+    assert second["items"] == ["eu-2", "eu-3"]
+    # Resuming re-requests the page at its raw token, then the next one
+    assert calls[-1] == ("eu-west-1", None)
+    assert decode_cursor(second["next_token"])["token"] == "3"
+
+
+def test_failed_region_is_reported_and_skipped():
+    pages = _walk(100, pager=_pager(failing={"us-east-1"}))
+
+    assert len(pages) == 1
+    assert pages[0]["items"] == RECORDS["eu-west-1"] + RECORDS["us-west-2"]
+    assert pages[0]["failed_regions"] == [{"region": "us-east-1", "error": "us-east-1 unavailable"}]
+
+
+def test_cursor_from_another_list_is_rejected():
+    token = collect_region_page("ec2", REGIONS, _pager(), 2, None)["next_token"]
+
+    with pytest.raises(InvalidCursorError):
+        collect_region_page("rds", REGIONS, _pager(), 2, token)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, "rds")
+
+
+@pytest.mark.parametrize("regions", [["eu-west-1", "us-west-2"], REGIONS + ["ap-south-1"]])
+def test_cursor_for_other_regions_is_rejected(regions):
+    token = collect_region_page("ec2", REGIONS, _pager(), 2, None)["next_token"]
+
+    with pytest.raises(InvalidCursorError):
+        collect_region_page("ec2", regions, _pager(), 2, token)
+    # Order does not matter, only the set
+    assert collect_region_page("ec2", list(reversed(REGIONS)), _pager(), 2, token)["items"] == ["eu-2", "eu-3"]
+
+
+@pytest.mark.parametrize("token", ["not base64!", encode_cursor({"token": "x"}), encode_cursor(["eu-west-1"])])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        collect_region_page("ec2", REGIONS, _pager(), 2, token)
+
+
+def test_list_route_rejects_a_cursor_from_another_list():
+    from benchmarks.fake_clouds import SimConfig, simulated_clouds
+    from routes import aws_routes
+
+    def call(handler, **params):
+        response = handler(func.HttpRequest(method="GET", url="/", headers={}, params=params, body=b""))
+        return response.status_code, json.loads(response.get_body())
+
+    with simulated_clouds(SimConfig(regions=2, resources=10, latency_ms=1, jitter_ms=0)):
+        status, page = call(aws_routes.list_ec2, limit="5")
+        assert status == 200 and page["next_token"]
+
+        assert call(aws_routes.list_rds, next_token=page["next_token"])[0] == 400
+        assert call(aws_routes.list_ec2, next_token=page["next_token"], regions="us-east-1")[0] == 400
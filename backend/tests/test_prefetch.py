@@ -0,0 +1,64 @@
+# tests/test_prefetch.py
+
+import pytest
+
+from methods import prefetch
+from methods.prefetch import DetailCache, cached_details
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = DetailCache(ttl=60, max_entries=3)
+    monkeypatch.setattr(prefetch, "detail_cache", cache)
+    return cache
+
+
+def _loader(calls):
+    def load():
+        calls.append(1)
+        return {"instance_id": "i-1", "state": "running"}
+    return load
+
+
+def test_details_are_live_while_prefetch_is_disabled(cache, monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", False)
+    calls = []
+
+    first = cached_details("ec2", "us-east-1", "i-1", _loader(calls))
+    second = cached_details("ec2", "us-east-1", "i-1", _loader(calls))
+
+    assert len(calls) == 2
+    assert first["cache"] == second["cache"] == "bypass"
+    assert first["age_seconds"] == 0.0
+    assert cache.get(("ec2", "us-east-1", "i-1")) is None
+
+
+def test_details_are_cached_while_prefetch_is_enabled(cache, monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", True)
+    calls = []
+
+    first = cached_details("ec2", "us-east-1", "i-1", _loader(calls))
+    second = cached_details("ec2", "us-east-1", "i-1", _loader(calls))
+    forced = cached_details("ec2", "us-east-1", "i-1", _loader(calls), force_refresh=True)
+
+    assert len(calls) == 2
+    assert (first["cache"], second["cache"], forced["cache"]) == ("miss", "hit", "bypass")
+    assert second["age_seconds"] >= 0
+    assert second["state"] == "running"
+
+
+def test_failed_details_are_not_cached(cache, monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", True)
+
+    cached_details("ec2", "us-east-1", "i-1", lambda: {"error": "boom"})
+
+    assert cache.get(("ec2", "us-east-1", "i-1")) is None
+
+
+def test_detail_cache_is_bounded(cache):
+    for i in range(5):
+        cache.put(("ec2", "us-east-1", f"i-{i}"), {"instance_id": f"i-{i}"})
+
+    assert cache.get(("ec2", "us-east-1", "i-0")) is None
+    assert cache.get(("ec2", "us-east-1", "i-4"))[1] == {"instance_id": "i-4"}
+    assert len(cache._entries) == 3
@@ -0,0 +1,131 @@
+# tests/test_snapshots.py
+
+import pytest
+
+from methods import refresher
+from methods.inventory import SECTIONS
+from methods.snapshots import FileSnapshotStore, is_version
+
+
+def _document(items):
+    return {"generated_at": "2026-01-01T00:00:00Z", "data": {"items": items}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileSnapshotStore(str(tmp_path), retention=3)
+
+
+def test_write_and_read(store):
+    version = store.write("ec2", _document([{"instance_id": "i-1"}]), version="000000000000001")
+
+    assert version == "000000000000001"
+    assert store.latest_version("ec2") == version
+    document = store.read("ec2", version)
+    assert document["version"] == version
+    assert document["data"]["items"] == [{"instance_id": "i-1"}]
+    # A fresh store over the same directory reads the file, not the memo
+    assert FileSnapshotStore(store._root).read("ec2") == document
+
+
+def test_read_missing(store):
+    assert store.read("ec2") is None
+    assert store.latest_version("ec2") is None
+    store.write("ec2", _document([]), version="000000000000001")
+    assert store.read("ec2", "000000000000002") is None
+
+
+def test_latest_follows_newest_write(store):
+    store.write("ec2", _document([{"instance_id": "old"}]), version="000000000000001")
+    store.write("ec2", _document([{"instance_id": "new"}]), version="000000000000002")
+
+    assert store.latest_version("ec2") == "000000000000002"
+    assert store.read("ec2")["data"]["items"] == [{"instance_id": "new"}]
+    assert store.versions("ec2") == ["000000000000001", "000000000000002"]
+
+
+def test_default_versions_sort_in_write_order(store):
+    first = store.write("ec2", _document([]))
+    second = store.write("ec2", _document([]))
+
+    assert is_version(first) and is_version(second)
+    assert store.versions("ec2")[-1] == store.latest_version("ec2") == max(first, second)
+
+
+def test_prune_keeps_retention(store):
+    for n in range(1, 6):
+        store.write("ec2", _document([{"n": n}]), version=f"{n:015d}")
+
+    assert store.versions("ec2") == [f"{n:015d}" for n in (3, 4, 5)]
+    assert store.read("ec2", f"{1:015d}") is None
+    assert store.read("ec2")["data"]["items"] == [{"n": 5}]
+
+
+def test_collections_are_independent(store):
+    store.write("ec2", _document([{"instance_id": "i-1"}]), version="000000000000001")
+    store.write("rds", _document([]), version="000000000000002")
+
+    assert store.versions("ec2") == ["000000000000001"]
+    assert store.latest_version("rds") == "000000000000002"
+
+
+@pytest.mark.parametrize("name", ["../outside", "ec2/../../outside.json", "/etc/passwd", "ec2//x", "ec2/./x"])
+def test_path_stays_under_root(store, name):
+    with pytest.raises(ValueError):
+        store._path(name)
+
+
+def _inventory(ec2_envelope):
+    document = {
+        section: {"items": [], "completed_regions": [], "failed_regions": [],
+                  "timed_out_regions": [], "region_timings": {}, "skipped": "not collected"}
+        for section in SECTIONS
+    }
+    document["ec2"] = ec2_envelope
+    return document
+
+
+def test_refresh_keeps_previous_snapshot_when_every_scope_fails(store, monkeypatch):
+    monkeypatch.setattr(refresher, "sync_snapshot", lambda *args: None)
+    ok = {
+        "items": [{"instance_id": "i-1", "region": "us-east-1"}],
+        "completed_regions": ["us-east-1"], "failed_regions": [], "timed_out_regions": [],
+        "region_timings": {"us-east-1": 0.1},
+    }
+    monkeypatch.setattr(refresher, "collect_inventory", lambda **kwargs: _inventory(ok))
+    first = refresher.refresh_snapshots(store=store)["collectors"]["ec2"]
+    assert first["version"] == store.latest_version("ec2")
+
+    failed = {
+        "items": [], "completed_regions": [],
+        "failed_regions": [{"region": "us-east-1", "error": "AccessDenied"}],
+        "timed_out_regions": ["eu-west-1"],
+        "region_timings": {"us-east-1": 0.1, "eu-west-1": 30.0},
+    }
+    monkeypatch.setattr(refresher, "collect_inventory", lambda **kwargs: _inventory(failed))
+    report = refresher.refresh_snapshots(store=store)
+    status = report["collectors"]["ec2"]
+
+    assert "version" not in status
+    assert status["errors"] == ["us-east-1: AccessDenied", "eu-west-1: timed out"]
+    assert store.versions("ec2") == [first["version"]]
+    assert store.read("ec2")["data"]["items"] == ok["items"]
+    # The report itself is still written
+    assert store.read(refresher.REFRESH_STATUS)["collectors"]["ec2"]["errors"] == status["errors"]
+
+
+def test_refresh_writes_partial_results(store, monkeypatch):
+    monkeypatch.setattr(refresher, "sync_snapshot", lambda *args: None)
+    partial = {
+        "items": [{"instance_id": "i-1", "region": "us-east-1"}],
+        "completed_regions": ["us-east-1"],
+        "failed_regions": [{"region": "eu-west-1", "error": "AccessDenied"}],
+        "timed_out_regions": [], "region_timings": {"us-east-1": 0.1, "eu-west-1": 0.2},
+    }
+    monkeypatch.setattr(refresher, "collect_inventory", lambda **kwargs: _inventory(partial))
+
+    status = refresher.refresh_snapshots(store=store)["collectors"]["ec2"]
+
+    assert status["version"] == store.latest_version("ec2")
+    assert status["errors"] == ["eu-west-1: AccessDenied"]
+    assert "i-1" in store.read("ec2")["hashes"]
@@ -57,7 +57,7 @@ const AzureFunctionsList = () => {
       const subscriptionId = import.meta.env.VITE_AZURE_SUBSCRIPTION_ID;
       const res = await secureFetch(`${import.meta.env.VITE_API_URL}/azure/functions/list?subscription_id=${subscriptionId}`);
       if (!res.ok) throw new Error(`Failed to fetch functions: ${res.statusText}`);
-      const data = await res.json();
+      const { items: data } = await res.json();
       saveToCache(data);
       return data;
     },
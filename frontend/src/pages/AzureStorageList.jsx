@@ -61,7 +61,7 @@ const AzureStorageList = () => {
                 `${import.meta.env.VITE_API_URL}/azure/storage/list?subscription_id=${subscriptionId}`
             );
             if (!res.ok) throw new Error(`Failed to fetch Azure Storage accounts: ${res.statusText}`);
-            const data = await res.json();
+            const { items: data } = await res.json();
             saveToCache(data);
             return data;
         },
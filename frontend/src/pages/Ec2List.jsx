@@ -56,7 +56,7 @@ const EC2List = () => {
     queryFn: async () => {
       const res = await secureFetch(`${import.meta.env.VITE_API_URL}/aws/ec2/list`);
       if (!res.ok) throw new Error(`Failed to fetch EC2 instances: ${res.statusText}`);
-      const data = await res.json();
+      const { items: data } = await res.json();
       saveToCache(data);
       return data;
     },
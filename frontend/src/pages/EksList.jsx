@@ -48,9 +48,9 @@ const EksList = () => {
   const { data: clusters = [], refetch, isFetching, error, isError } = useQuery({
     queryKey: ['eksClusters'],
     queryFn: async () => {
-      const res = await secureFetch(`${import.meta.env.VITE_API_URL}/aws/eks/list`);
+      const res = await secureFetch(`${import.meta.env.VITE_API_URL}/aws/eks/list?include=status,version`);
       if (!res.ok) throw new Error(`Failed to fetch EKS clusters: ${res.statusText}`);
-      const data = await res.json();
+      const { items: data } = await res.json();
       saveToCache(data);
       return data;
     },
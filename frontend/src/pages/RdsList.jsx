@@ -57,7 +57,7 @@ const RDSList = () => {
     queryFn: async () => {
       const res = await secureFetch(`${import.meta.env.VITE_API_URL}/aws/rds/list`);
       if (!res.ok) throw new Error(`Failed to fetch RDS instances: ${res.statusText}`);
-      const data = await res.json();
+      const { items: data } = await res.json();
       saveToCache(data);
       return data;
     },
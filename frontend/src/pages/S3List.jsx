@@ -56,7 +56,7 @@ const S3List = () => {
     queryFn: async () => {
       const res = await secureFetch(`${import.meta.env.VITE_API_URL}/aws/s3/list`);
       if (!res.ok) throw new Error(`Failed to fetch S3 buckets: ${res.statusText}`);
-      const data = await res.json();
+      const { items: data } = await res.json();
       saveToCache(data);
       return data;
     },